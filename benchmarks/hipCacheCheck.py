@@ -0,0 +1,205 @@
+"""
+Checks and times quickProject's local hip cache (quickProject/hipCache.py) with two
+folders standing in for the NAS and the local SSD.
+
+    hit / miss      a cached version is served locally, a saved over one is not
+    eviction        the cache stays under its byte budget, least recently used go first
+    restart         a new session over the same folder keeps entries and their LRU order
+    openHipFile     loads read the local copy while the scene keeps the NAS path, nothing
+                    cooks while $HIP is the cache folder, hips with otls skip the cache
+    read times      reading every hip from the "NAS" vs from the cache
+
+Runs with plain python, no Houdini needed (uses the stand-in hou in benchmarks/stubs):
+
+    python benchmarks/hipCacheCheck.py --files 20 --mb 8
+    python benchmarks/hipCacheCheck.py --nas //server/share/cacheTest --ssd D:/hipCache
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT / "stubs"))
+sys.path.insert(0, str(ROOT.parent / "python"))
+
+from quickProject.hipCache import hipCache
+
+
+def writeHip(path, megabytes, seed=0):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    block = bytes((seed + i) % 251 for i in range(1024 * 1024))
+    with open(path, "wb") as file:
+        for _ in range(max(1, int(megabytes))):
+            file.write(block)
+
+
+def readAll(path):
+    start = time.perf_counter()
+    with open(path, "rb") as file:
+        while file.read(8 * 1024 * 1024):
+            pass
+    return (time.perf_counter() - start) * 1000
+
+
+def check(failures, condition, message):
+    if not condition:
+        failures.append(message)
+
+
+def checkHitMiss(failures, nas, ssd, megabytes):
+    cache = hipCache(ssd / "hitMiss", 64 * 1024 ** 3)
+    source = nas / "proj" / "proj_fx_v001.hip"
+    writeHip(source, megabytes)
+
+    check(failures, cache.lookup(source) is None, "empty cache reported a hit")
+    cache.put(source)
+    cache.wait()
+    local = cache.lookup(source)
+    check(failures, local is not None, "no hit after put")
+    if local is not None:
+        check(failures, Path(local).read_bytes() == source.read_bytes(), "cached copy differs from the source")
+        check(failures, Path(local).name == source.name, "cached copy lost its file name")
+
+    # saved over: same path, new mtime / size
+    time.sleep(0.01)
+    writeHip(source, megabytes + 1, seed=1)
+    check(failures, cache.lookup(source) is None, "stale copy served after the source changed")
+    cache.put(source)
+    cache.wait()
+    local = cache.lookup(source)
+    check(failures, local is not None and Path(local).read_bytes() == source.read_bytes(), "no hit after re-caching")
+    folders = [entry for entry in os.listdir(cache.cacheDir) if not entry.startswith(".")]
+    check(failures, len(folders) == 1, f"old version left behind: {folders}")
+
+
+def checkEviction(failures, nas, ssd, megabytes):
+    budget = int(3.5 * megabytes * 1024 ** 2)
+    cache = hipCache(ssd / "eviction", budget)
+    sources = [nas / "evict" / f"evict_fx_v{i:03}.hip" for i in range(1, 6)]
+    for source in sources:
+        writeHip(source, megabytes)
+
+    for source in sources[:3]:
+        cache.put(source)
+    cache.wait()
+    cache.lookup(sources[0]) # most recently used now, must survive the next two
+    for source in sources[3:]:
+        cache.put(source)
+    cache.wait()
+
+    check(failures, cache.totalBytes() <= budget, f"cache over budget: {cache.totalBytes()} > {budget}")
+    check(failures, cache.lookup(sources[0]) is not None, "recently used entry was evicted")
+    check(failures, cache.lookup(sources[1]) is None, "least recently used entry survived")
+    check(failures, cache.lookup(sources[-1]) is not None, "newest entry was evicted")
+
+    # a new session over the same folder
+    restarted = hipCache(cache.cacheDir, budget)
+    check(failures, restarted.totalBytes() == cache.totalBytes(), "restart lost track of the cache size")
+    check(failures, restarted.lookup(sources[0]) is not None, "restart lost an entry")
+
+
+def checkOpenHipFile(failures, nas, ssd, megabytes):
+    prefDir = Path(tempfile.mkdtemp(prefix="qpHipCachePrefs_"))
+    (prefDir / "ALTools").mkdir()
+    settings = {"settings": {"author": "check", "homeDir": str(nas), "watchMode": "off",
+                             "hipCacheDir": str(ssd / "session"), "hipCacheMB": 1024}}
+    (prefDir / "ALTools" / "Projects.json").write_text(json.dumps(settings))
+    os.environ["HOUDINI_USER_PREF_DIR"] = str(prefDir)
+
+    import hou
+    from quickProject.logic import quickProjectLogic
+    logic = quickProjectLogic()
+    source = nas / "open" / "open_fx_v001.hip"
+    writeHip(source, megabytes)
+
+    logic.openHipFile(source)
+    check(failures, hou.calls[-1] == ("hipFile.load", str(source)), "first open didn't read the source")
+    logic.hipCache().wait()
+    logic.openHipFile(source)
+    loaded = hou.calls[-1][1]
+    check(failures, loaded != str(source) and loaded.startswith(str(ssd)), f"second open read {loaded}")
+    check(failures, hou.hipFile.path() == str(source), f"scene points at {hou.hipFile.path()}, not the source")
+    realHip = source.parent.as_posix()
+    load = hou.loads[-1]
+    check(failures, load["HIP"] == realHip or load["updateMode"] == hou.updateMode.Manual,
+          f"cooks could run with $HIP={load['HIP']} during the cached load")
+    check(failures, hou.getenv("HIP") == realHip, f"$HIP is {hou.getenv('HIP')} after the cached load")
+    check(failures, hou.updateModeSetting() == hou.updateMode.AutoUpdate, "update mode not restored after the cached load")
+
+    # HDAs in $HIP/otls are found through $HIP while the file loads, so those never come from the cache
+    withAssets = nas / "assets" / "assets_fx_v001.hip"
+    writeHip(withAssets, megabytes)
+    (withAssets.parent / "otls").mkdir()
+    logic.hipCache().put(withAssets)
+    logic.hipCache().wait()
+    logic.openHipFile(withAssets)
+    load = hou.loads[-1]
+    check(failures, load["HIP"] == withAssets.parent.as_posix(), f"$HIP was {load['HIP']} while a hip with otls loaded")
+
+
+def timeReads(nas, ssd, files, megabytes, runs):
+    cache = hipCache(ssd / "timing", 64 * 1024 ** 3)
+    sources = [nas / "timing" / f"timing_fx_v{i:03}.hip" for i in range(1, files + 1)]
+    for source in sources:
+        writeHip(source, megabytes)
+        cache.put(source)
+    cache.wait()
+
+    fromNas, fromCache = [], []
+    for _ in range(runs):
+        fromNas.append(sum(readAll(source) for source in sources))
+        fromCache.append(sum(readAll(cache.lookup(source)) for source in sources))
+    start = time.perf_counter()
+    for _ in range(runs):
+        for source in sources:
+            cache.lookup(source)
+    lookupMs = (time.perf_counter() - start) * 1000 / (runs * files)
+
+    total = files * megabytes
+    print(f"read {files} x {megabytes} MB from nas    median {statistics.median(fromNas):9.1f} ms")
+    print(f"read {files} x {megabytes} MB from cache  median {statistics.median(fromCache):9.1f} ms")
+    print(f"lookup per file                mean   {lookupMs:9.3f} ms  ({total} MB cached)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nas", help="folder standing in for the network share (default: temp dir)")
+    parser.add_argument("--ssd", help="folder for the cache (default: temp dir)")
+    parser.add_argument("--files", type=int, default=10)
+    parser.add_argument("--mb", type=int, default=4, help="size of each hip")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    tempDirs = []
+    folders = []
+    for folder in (args.nas, args.ssd):
+        if folder is None:
+            tempDirs.append(tempfile.TemporaryDirectory(prefix="qpHipCache_"))
+            folder = tempDirs[-1].name
+        folders.append(Path(folder))
+    nas, ssd = folders
+
+    failures = []
+    checkHitMiss(failures, nas, ssd, args.mb)
+    checkEviction(failures, nas, ssd, args.mb)
+    checkOpenHipFile(failures, nas, ssd, args.mb)
+    timeReads(nas, ssd, args.files, args.mb, args.runs)
+
+    for tempDir in tempDirs:
+        tempDir.cleanup()
+    if failures:
+        print("FAILED")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Import time benchmark for the ALTools python folder.
+
+Every entry point Houdini or a shelf tool uses is imported in a fresh interpreter with
+-X importtime, against a stand-in hou module that records every call made on it. It
+reports the wall time of each import, the self time of ALTools' own modules and how
+many modules it drags in, and flags any that calls into hou, loads Qt or sqlite3, or
+goes over the budget. Adding ALTools to PYTHONPATH should cost next to
+nothing until a tool is actually used.
+
+    python benchmarks/importTime.py [--runs 5] [--budget-ms 5]
+
+Exits non-zero when an entry point breaks one of the rules.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+PYTHON_DIR = ROOT / "python"
+
+# (statement, must stay light) - light ones are what PYTHONPATH / a shelf click pays for
+ENTRY_POINTS = [
+    ("import python", True), # the ALTools folder as a package
+    ("import quickProject", True),
+    ("import PrincipleToMTLX", True),
+    ("import syncFields", True),
+    ("import StyleLoader", True),
+    ("import CustomNodeColour", True),
+    ("import ALToolsProfiler", True),
+    ("from quickProject import logic", False),
+    ("from quickProject import core", False),
+    ("from PrincipleToMTLX import converter", False),
+    ("from syncFields import sync_Fields", False),
+]
+
+HEAVY_MODULES = ["PySide2", "PySide6", "sqlite3", "shiboken2", "shiboken6"]
+OWN_MODULES = ("python", "quickProject", "PrincipleToMTLX", "syncFields", "StyleLoader", "CustomNodeColour",
+               "ALToolsProfiler")
+
+# stands in for Houdini's hou, any attribute works and every call is recorded
+STUB_HOU = '''
+calls = []
+
+class _Anything:
+    def __init__(self, name):
+        self._name = name
+    def __getattr__(self, attr):
+        return _Anything(self._name + "." + attr)
+    def __call__(self, *args, **kwargs):
+        calls.append(self._name)
+        return _Anything(self._name + "()")
+    def __getitem__(self, key):
+        return _Anything(self._name + "[]")
+    def __iter__(self):
+        return iter(())
+    def __bool__(self):
+        return False
+
+def __getattr__(name):
+    return _Anything("hou." + name)
+'''
+
+PROBE = '''
+import json, sys, time
+import hou
+before = set(sys.modules)
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"elapsed": elapsed, "houCalls": hou.calls, "heavy": heavy,
+                  "newModules": len(set(sys.modules) - before)}}))
+'''
+
+
+def ownImportTime(stderr):
+    """
+    Sums the self time -X importtime reports for ALTools' own modules, ie the work our
+    module bodies do at import, leaving out the stdlib they pull in.
+    """
+    total = 0
+    for line in stderr.splitlines():
+        parts = line[len("import time:"):].split("|") if line.startswith("import time:") else ()
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].strip()
+        if name.split(".")[0] in OWN_MODULES:
+            total += int(parts[0])
+    return total / 1000.0
+
+
+def measure(statement, stubDir, runs):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([stubDir, str(PYTHON_DIR), str(ROOT)])
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    code = PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+
+    # one warm up run so .pyc files exist, like on any launch after the first
+    subprocess.run([sys.executable, "-c", code], env=env, capture_output=True)
+
+    times, ownTimes = [], []
+    result = None
+    for _ in range(runs):
+        process = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                                 env=env, capture_output=True, text=True)
+        if process.returncode != 0:
+            return {"error": process.stderr.strip().splitlines()[-1] if process.stderr.strip() else "failed"}
+        result = json.loads(process.stdout.strip().splitlines()[-1])
+        times.append(result["elapsed"] * 1000)
+        ownTimes.append(ownImportTime(process.stderr))
+    result["ms"] = statistics.median(times)
+    result["ownMs"] = statistics.median(ownTimes)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=5.0, help="budget for the light entry points")
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as stubDir:
+        Path(stubDir, "hou.py").write_text(STUB_HOU)
+        print(f"{'entry point':<42} {'wall ms':>8} {'own ms':>7} {'modules':>8}  notes")
+        for statement, light in ENTRY_POINTS:
+            result = measure(statement, stubDir, args.runs)
+            if "error" in result:
+                # the tools themselves may need Qt etc, but the light imports never should
+                print(f"{statement:<42} {'-':>8} {'-':>7} {'-':>8}  failed: {result['error']}")
+                if light:
+                    failures.append(statement)
+                continue
+
+            notes = []
+            if result["houCalls"]:
+                notes.append(f"calls hou at import: {', '.join(sorted(set(result['houCalls'])))}")
+                failures.append(statement)
+            if result["heavy"]:
+                notes.append(f"loads {', '.join(result['heavy'])}")
+                if light:
+                    failures.append(statement)
+            if light and result["ms"] > args.budget_ms:
+                notes.append(f"over the {args.budget_ms:g} ms budget")
+                failures.append(statement)
+            print(f"{statement:<42} {result['ms']:>8.2f} {result['ownMs']:>7.2f} {result['newModules']:>8}  "
+                  f"{'; '.join(notes)}")
+
+    if failures:
+        print(f"\nFAILED: {', '.join(sorted(set(failures)))}")
+        return 1
+    print("\nOK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Concurrent save stress test for quickProject's journaled project storage.
+
+Spawns several processes that all save versions of the same files into one project
+folder while compaction runs alongside, then checks that no version was handed out
+twice and that the final document agrees with the number of saves.
+
+Runs with plain python, no Houdini needed:
+
+    python benchmarks/journalStress.py --workers 8 --saves 50
+"""
+import argparse
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "python"))
+
+from quickProject.projectJournal import projectJournal, readProject
+
+
+PROJECT = "stress"
+
+
+def saver(folder, worker, saves, files, compactAfter, results):
+    journal = projectJournal(folder, PROJECT, compactAfter=compactAfter)
+    handedOut = []
+    for i in range(saves):
+        filename = files[(worker + i) % len(files)]
+        version = journal.commitVersion(filename, f"worker{worker}", time.strftime("%d-%m-%Y %H:%M:%S"))
+        handedOut.append((filename, version))
+    results.put(handedOut)
+
+
+def compactor(folder, stop):
+    journal = projectJournal(folder, PROJECT)
+    while not stop.is_set():
+        journal.compact()
+        time.sleep(0.005)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--saves", type=int, default=50, help="saves per worker")
+    parser.add_argument("--files", type=int, default=3)
+    parser.add_argument("--compact-after", type=int, default=16)
+    parser.add_argument("--folder", help="project folder to use, eg on a network share (default: temp dir)")
+    args = parser.parse_args()
+
+    tempDir = None
+    if args.folder:
+        folder = Path(args.folder) / PROJECT
+    else:
+        tempDir = tempfile.TemporaryDirectory()
+        folder = Path(tempDir.name) / PROJECT
+    folder.mkdir(parents=True, exist_ok=True)
+    files = [f"file{i}" for i in range(args.files)]
+
+    results = multiprocessing.Queue()
+    stop = multiprocessing.Event()
+    background = multiprocessing.Process(target=compactor, args=(folder, stop))
+    background.start()
+
+    start = time.perf_counter()
+    workers = [multiprocessing.Process(target=saver, args=(folder, w, args.saves, files, args.compact_after, results))
+               for w in range(args.workers)]
+    for worker in workers:
+        worker.start()
+    handedOut = [item for _ in workers for item in results.get()]
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    background.join()
+
+    failures = []
+    for worker in workers:
+        if worker.exitcode != 0:
+            failures.append(f"worker {worker.pid} exited with {worker.exitcode}")
+
+    data = readProject(folder, PROJECT) or {}
+    for filename in files:
+        versions = sorted(int(v.lstrip("v")) for f, v in handedOut if f == filename)
+        expected = list(range(1, len(versions) + 1))
+        if versions != expected:
+            duplicates = len(versions) - len(set(versions))
+            failures.append(f"{filename}: {duplicates} duplicate versions, gaps or reordering in {len(versions)} saves")
+        final = data.get("Files", {}).get(filename, {}).get("version")
+        if final != f"v{len(versions):03}":
+            failures.append(f"{filename}: final version {final}, expected v{len(versions):03}")
+
+    total = args.workers * args.saves
+    print(f"{total} saves from {args.workers} processes in {elapsed:.2f}s ({total / elapsed:.0f} saves/s)")
+    if tempDir is not None:
+        tempDir.cleanup()
+
+    if failures:
+        print("FAILED")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
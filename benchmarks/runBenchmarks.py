@@ -0,0 +1,286 @@
+"""
+quickProject benchmark suite.
+
+Builds synthetic home directories (see synthTree.py), points a throwaway Houdini prefs
+folder at them and times the hot paths against the stand-in hou in benchmarks/stubs:
+
+    settings.get / settings.cold    reading Projects.json through the settings store
+    loadProjectJson.<size>          one value from a small / large project JSON
+    populate.cold / populate.warm   populateFileTree, without / with the scan snapshot
+    save                            the save path through saveClicked
+
+With PySide2/6 installed the tree and save are driven through quickProjectUi on an
+offscreen Qt platform, otherwise the same logic calls are timed without the widgets
+(reported as populate.scan.* / save.logic).
+
+    python benchmarks/runBenchmarks.py --sizes small,medium -o results.json
+    python benchmarks/runBenchmarks.py --sizes medium --compare results.json
+
+Results are JSON so runs can be compared over time.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT / "stubs"))
+sys.path.insert(0, str(ROOT.parent / "python"))
+sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import synthTree
+
+
+def summarize(name, size, samples, unit="ms", **extra):
+    ordered = sorted(samples)
+    result = {
+        "name": name,
+        "size": size,
+        "unit": unit,
+        "runs": len(samples),
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "p95": ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        "mean": statistics.fmean(ordered),
+    }
+    result.update(extra)
+    return result
+
+
+def timeIt(function, runs, perOp=1):
+    """
+    Runs function runs times, returns the time per op in ms for each run.
+    """
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000 / perOp)
+    return samples
+
+
+def loadQt():
+    try:
+        from PySide2 import QtWidgets, QtCore
+    except Exception:
+        try:
+            from PySide6 import QtWidgets, QtCore
+        except Exception:
+            return None
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    return app, QtCore
+
+
+def waitFor(app, QtCore, predicate, timeout=600):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise TimeoutError("benchmark timed out waiting for the scan")
+        app.processEvents(QtCore.QEventLoop.AllEvents, 20)
+
+
+# -----------------------------------------------------------------
+# Benchmarks
+# -----------------------------------------------------------------
+
+def benchSettings(logic, size, runs):
+    from quickProject.settingsStore import settingsStore
+    results = []
+    reads = 10000
+    samples = timeIt(lambda: [logic.settings.get("homeDir") for _ in range(reads)], runs, reads)
+    results.append(summarize("settings.get", size, [s * 1000 for s in samples], unit="us"))
+    samples = timeIt(lambda: settingsStore(logic.jsonPath).data(), runs)
+    results.append(summarize("settings.cold", size, samples))
+    return results
+
+
+def benchLoadProjectJson(logic, size, runs):
+    homeDir = Path(logic.projectDir())
+    projects = sorted(homeDir.glob("*/*_Project.json"), key=lambda path: path.stat().st_size)
+    if not projects:
+        return []
+    results = []
+    for label, path in (("small", projects[0]), ("large", projects[-1])):
+        data = json.loads(path.read_text())
+        fileName = sorted(data["Files"])[0]
+        samples = timeIt(lambda: logic.loadProjectJson(path, ("Files", fileName, "version")), runs)
+        results.append(summarize(f"loadProjectJson.{label}", size, samples, jsonBytes=path.stat().st_size))
+    return results
+
+
+def benchPopulateLogic(logic, size, runs):
+    results = []
+
+    def cold():
+        logic.snapshot.path.unlink(missing_ok=True)
+        for _ in logic.iterProjects(None, {}):
+            pass
+
+    def warm():
+        for _ in logic.iterProjects(None, logic.loadSnapshot()):
+            pass
+
+    results.append(summarize("populate.scan.cold", size, timeIt(cold, runs)))
+    results.append(summarize("populate.scan.warm", size, timeIt(warm, runs)))
+    return results
+
+
+def benchPopulateUi(qt, size, runs):
+    from quickProject.Ui import quickProjectUi
+    app, QtCore = qt
+    results = []
+    for label in ("cold", "warm"):
+        firstPaint, complete = [], []
+        for _ in range(runs):
+            if label == "cold":
+                ui = None
+                from quickProject.core import projectCore
+                projectCore().snapshot.path.unlink(missing_ok=True)
+            start = time.perf_counter()
+            ui = quickProjectUi() # populateFileTree runs in the constructor
+            firstPaint.append((time.perf_counter() - start) * 1000)
+            waitFor(app, QtCore, lambda: ui.scanWorker is None)
+            complete.append((time.perf_counter() - start) * 1000)
+            ui.cancelScan()
+            ui.stopWatcher()
+            ui.close()
+            ui.deleteLater()
+            app.processEvents()
+        results.append(summarize(f"populate.{label}.firstPaint", size, firstPaint))
+        results.append(summarize(f"populate.{label}", size, complete))
+    return results
+
+
+def benchSaveLogic(logic, size, runs):
+    def save():
+        version = logic.commitVersion("benchSave", "fx")
+        logic.saveHipFile("benchSave", "fx", version)
+    samples = timeIt(save, runs)
+    shutil.rmtree(Path(logic.projectDir()) / "benchSave", ignore_errors=True) # keep the cached tree as generated
+    return [summarize("save.logic", size, samples)]
+
+
+def benchSaveUi(qt, size, runs):
+    from quickProject.Ui import quickProjectUi
+    app, QtCore = qt
+    ui = quickProjectUi()
+    waitFor(app, QtCore, lambda: ui.scanWorker is None)
+    ui.projectName.setText("benchSave")
+    ui.fileName.setText("fx")
+    samples = timeIt(ui.saveClicked, runs)
+    ui.cancelScan()
+    ui.stopWatcher()
+    ui.close()
+    shutil.rmtree(Path(ui.logic.projectDir()) / "benchSave", ignore_errors=True)
+    return [summarize("save", size, samples)]
+
+
+# -----------------------------------------------------------------
+# Running
+# -----------------------------------------------------------------
+
+def runSize(size, params, workDir, runs, backend):
+    homeDir = Path(workDir) / f"home_{size}"
+    prefDir = Path(tempfile.mkdtemp(prefix=f"qpBenchPrefs_{size}_"))
+    start = time.perf_counter()
+    treeStats = synthTree.ensureTree(homeDir, params["projects"], params["versions"])
+    print(f"[{size}] tree ready in {time.perf_counter() - start:.1f}s: {treeStats}", flush=True)
+
+    (prefDir / "ALTools").mkdir()
+    settings = {"settings": {"author": "bench", "homeDir": str(homeDir), "Style": "Default",
+                             "indexBackend": backend, "watchMode": "off"}}
+    (prefDir / "ALTools" / "Projects.json").write_text(json.dumps(settings))
+    os.environ["HOUDINI_USER_PREF_DIR"] = str(prefDir)
+
+    from quickProject.logic import quickProjectLogic
+    logic = quickProjectLogic()
+
+    qt = loadQt()
+    results = []
+    results += benchSettings(logic, size, max(runs, 5))
+    results += benchLoadProjectJson(logic, size, max(runs, 20))
+    if qt is not None:
+        results += benchPopulateUi(qt, size, runs)
+        results += benchSaveUi(qt, size, max(runs, 20))
+    else:
+        results += benchPopulateLogic(logic, size, runs)
+        results += benchSaveLogic(logic, size, max(runs, 20))
+
+    for result in results:
+        result["tree"] = treeStats
+        print(f"[{size}] {result['name']:<28} median {result['median']:9.3f} {result['unit']}"
+              f"  p95 {result['p95']:9.3f}", flush=True)
+    return results
+
+
+def gitCommit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(results, baselinePath):
+    baseline = json.loads(Path(baselinePath).read_text())
+    old = {(r["name"], r["size"]): r for r in baseline.get("results", [])}
+    print(f"\n{'benchmark':<36} {'size':<8} {'before':>10} {'after':>10} {'change':>8}")
+    for result in results:
+        before = old.get((result["name"], result["size"]))
+        if before is None:
+            continue
+        change = (result["median"] / before["median"] - 1) * 100 if before["median"] else 0.0
+        print(f"{result['name']:<36} {result['size']:<8} {before['median']:>10.3f} {result['median']:>10.3f} "
+              f"{change:>+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="small,medium", help=f"comma separated, from {', '.join(synthTree.PRESETS)}")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json", help="settings indexBackend")
+    parser.add_argument("--work-dir", help="where synthetic trees are kept between runs (default: temp dir)")
+    parser.add_argument("-o", "--output", help="write the results JSON here")
+    parser.add_argument("--compare", help="results JSON of an earlier run to compare against")
+    args = parser.parse_args()
+
+    workDir = args.work_dir or os.path.join(tempfile.gettempdir(), "qpBenchTrees")
+    results = []
+    for size in args.sizes.split(","):
+        size = size.strip()
+        if size not in synthTree.PRESETS:
+            parser.error(f"unknown size {size!r}")
+        results += runSize(size, synthTree.PRESETS[size], workDir, args.runs, args.backend)
+
+    report = {
+        "meta": {
+            "commit": gitCommit(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "qt": loadQt() is not None,
+            "backend": args.backend,
+            "runs": args.runs,
+        },
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=4))
+        print(f"\nwrote {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
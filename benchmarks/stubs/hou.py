@@ -0,0 +1,203 @@
+"""
+Stand-in for Houdini's hou module with just enough of it for quickProject to run outside
+Houdini in the benchmarks. Dialogs don't block, they are recorded in calls, and
+hipFile.save writes a placeholder hip of HIP_BYTES bytes. Loading, saving and naming the
+hip set $HIP / $HIPFILE / $HIPNAME like Houdini does, and every load is recorded in loads
+with the $HIP and update mode a cook at the end of the load would see.
+
+Only ever put this folder on sys.path from a benchmark, never next to a real Houdini.
+"""
+import os
+
+
+HIP_BYTES = int(os.environ.get("STUB_HOU_HIP_BYTES", 64 * 1024))
+
+calls = [] # (function, first argument) of every dialog / ui call
+loads = [] # {"file", "HIP", "updateMode"} of every hipFile.load
+
+
+def _qt():
+    try:
+        from PySide2 import QtWidgets, QtGui
+    except Exception:
+        from PySide6 import QtWidgets, QtGui
+    return QtWidgets, QtGui
+
+
+def getenv(name, default=None):
+    return os.environ.get(name, default)
+
+
+def putenv(name, value):
+    os.environ[name] = value
+
+
+class Error(Exception):
+    pass
+
+
+class OperationFailed(Error):
+    pass
+
+
+class severityType:
+    Message = "Message"
+    ImportantMessage = "ImportantMessage"
+    Warning = "Warning"
+    Error = "Error"
+    Fatal = "Fatal"
+
+
+class fileType:
+    Any = "Any"
+    Directory = "Directory"
+    Hip = "Hip"
+
+
+class fileChooserMode:
+    Read = "Read"
+    Write = "Write"
+    ReadAndWrite = "ReadAndWrite"
+
+
+class paneTabType:
+    SceneViewer = "SceneViewer"
+    NetworkEditor = "NetworkEditor"
+
+
+class updateMode:
+    AutoUpdate = "AutoUpdate"
+    OnMouseUp = "OnMouseUp"
+    Manual = "Manual"
+
+
+_updateMode = [updateMode.AutoUpdate]
+
+
+def updateModeSetting():
+    return _updateMode[0]
+
+
+def setUpdateMode(mode):
+    _updateMode[0] = mode
+
+
+class _ui:
+    def setStatusMessage(self, text, severity=None):
+        calls.append(("setStatusMessage", text))
+
+    def paneTabOfType(self, paneTabType, index=0):
+        return None
+
+    def displayMessage(self, text, buttons=("OK",), severity=None, **kwargs):
+        calls.append(("displayMessage", text))
+        return 0
+
+    def selectFile(self, *args, **kwargs):
+        calls.append(("selectFile", kwargs.get("title", "")))
+        return ""
+
+    def selectColor(self, *args, **kwargs):
+        calls.append(("selectColor", None))
+        return None
+
+    def selectNode(self, *args, **kwargs):
+        calls.append(("selectNode", None))
+        return None
+
+    def createQtIcon(self, name, width=None, height=None):
+        QtWidgets, QtGui = _qt()
+        return QtGui.QIcon()
+
+
+class _qtModule:
+    def mainWindow(self):
+        return None
+
+    def Separator(self):
+        QtWidgets, QtGui = _qt()
+        line = QtWidgets.QFrame()
+        line.setFrameShape(QtWidgets.QFrame.HLine)
+        return line
+
+
+class _hipFile:
+    def __init__(self):
+        self._path = "untitled.hip"
+
+    def _setPath(self, file_name):
+        self._path = file_name
+        putenv("HIP", os.path.dirname(os.path.abspath(file_name)).replace(os.sep, "/"))
+        putenv("HIPFILE", os.path.abspath(file_name).replace(os.sep, "/"))
+        putenv("HIPNAME", os.path.splitext(os.path.basename(file_name))[0])
+
+    def save(self, file_name=None, save_to_recent_files=True):
+        file_name = file_name or self._path
+        with open(file_name, "wb") as file:
+            file.write(b"\0" * HIP_BYTES)
+        self._setPath(file_name)
+
+    def load(self, file_name, suppress_save_prompt=False, ignore_load_warnings=False):
+        calls.append(("hipFile.load", file_name))
+        self._setPath(file_name)
+        loads.append({"file": file_name, "HIP": getenv("HIP"), "updateMode": updateModeSetting()})
+
+    def merge(self, file_name, node_pattern="*", overwrite_on_conflict=False, ignore_load_warnings=False):
+        calls.append(("hipFile.merge", file_name))
+
+    def setName(self, file_name):
+        self._setPath(file_name)
+
+    def path(self):
+        return self._path
+
+    def name(self):
+        return os.path.basename(self._path)
+
+
+ui = _ui()
+qt = _qtModule()
+hipFile = _hipFile()
+
+
+def selectedNodes():
+    return ()
+
+
+class _network:
+    def __init__(self, path):
+        self._path = path
+
+    def children(self):
+        return ()
+
+    def allSubChildren(self):
+        return ()
+
+
+class _playbar:
+    def frameRange(self):
+        return (1.0, 240.0)
+
+
+playbar = _playbar()
+
+
+def node(path):
+    return _network(path) if path == "/" else None
+
+
+def fileReferences():
+    return ()
+
+
+def fps():
+    return 24.0
+
+
+def frame():
+    return 1.0
+
+
+def applicationVersionString():
+    return "0.0.0-stub"
@@ -0,0 +1,158 @@
+"""
+Generates synthetic quick project home directories for the benchmarks.
+
+Every project gets a <project>_Project.json and empty <project>_<file>_vNNN.hip files.
+Project sizes are mixed: most have a handful of files, some a few dozen and a few
+hundreds, so JSON documents range from a few hundred bytes to tens of KB.
+
+    python benchmarks/synthTree.py /tmp/qpHome --preset medium
+    python benchmarks/synthTree.py /tmp/qpHome --projects 500 --versions 20000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+
+PRESETS = {
+    "small": {"projects": 10, "versions": 250},
+    "medium": {"projects": 1000, "versions": 20000},
+    "large": {"projects": 10000, "versions": 100000},
+}
+
+# (share of projects, file count range)
+FILE_MIX = [
+    (0.75, (1, 4)),
+    (0.20, (10, 30)),
+    (0.05, (80, 200)),
+]
+
+FILE_NAMES = ["fx", "lgt", "cmp", "anim", "layout", "sim", "cfx", "env", "lookdev", "rnd"]
+AUTHORS = ["jack", "sam", "alex", "kim", "robin", "lee"]
+MARKER = ".synthTree.json"
+GENERATOR_VERSION = 3 # bump when the layout changes so cached trees are rebuilt
+
+
+def fileCount(rng):
+    roll = rng.random()
+    for share, (low, high) in FILE_MIX:
+        if roll < share:
+            return rng.randint(low, high)
+        roll -= share
+    return FILE_MIX[-1][1][0]
+
+
+def stamp(epoch):
+    return time.strftime("%d-%m-%Y %H:%M:%S", time.localtime(epoch))
+
+
+def generate(homeDir, projects, versions, seed=1, hipBytes=0):
+    """
+    Writes a synthetic home directory with about versions hip files spread over projects.
+
+    Returns:
+        dict: what was generated (projects, files, versions, jsonBytes)
+    """
+    rng = random.Random(seed)
+    homeDir = Path(homeDir)
+    homeDir.mkdir(parents=True, exist_ok=True)
+    now = time.time()
+
+    layout = [fileCount(rng) for _ in range(projects)]
+    if sum(layout) > versions:
+        # fewer versions than the mix has files, shrink every project to fit
+        scale = versions / sum(layout)
+        layout = [max(1, round(count * scale)) for count in layout]
+    totalFiles = sum(layout)
+    perFile = max(1.0, versions / totalFiles)
+    payload = b"\0" * hipBytes
+
+    stats = {"projects": projects, "files": totalFiles, "versions": 0, "jsonBytes": 0}
+    for p, count in enumerate(layout):
+        project = f"proj{p:05}"
+        folder = homeDir / project
+        folder.mkdir(exist_ok=True)
+        created = now - rng.uniform(30, 365) * 86400
+
+        files = {}
+        names = [f"{FILE_NAMES[i % len(FILE_NAMES)]}{i // len(FILE_NAMES) or ''}" for i in range(count)]
+        for name in names:
+            # random rounding keeps the total close to versions for small perFile values
+            fileVersions = max(1, int(rng.uniform(0.5, 1.5) * perFile + rng.random())) if perFile > 1 else 1
+            modified = now - rng.uniform(0, 90) * 86400
+            files[name] = {
+                "version": f"v{fileVersions:03}",
+                "author": rng.choice(AUTHORS),
+                "created": stamp(created),
+                "modified": stamp(modified),
+            }
+            for v in range(1, fileVersions + 1):
+                hip = folder / f"{project}_{name}_v{v:03}.hip"
+                with open(hip, "wb") as file:
+                    file.write(payload)
+                mtime = created + (modified - created) * v / fileVersions
+                os.utime(hip, (mtime, mtime))
+            stats["versions"] += fileVersions
+
+        data = {"ProjectData": {"project": project, "author": rng.choice(AUTHORS), "created": stamp(created)},
+                "Files": files}
+        text = json.dumps(data, indent=4)
+        (folder / f"{project}_Project.json").write_text(text)
+        stats["jsonBytes"] += len(text)
+    return stats
+
+
+def ensureTree(homeDir, projects, versions, seed=1, hipBytes=0):
+    """
+    Generates the tree unless homeDir already holds one made with the same parameters,
+    so repeated benchmark runs don't pay for creating 100k files every time.
+    """
+    homeDir = Path(homeDir)
+    params = {"projects": projects, "versions": versions, "seed": seed, "hipBytes": hipBytes,
+              "generator": GENERATOR_VERSION}
+    marker = homeDir / MARKER
+    try:
+        existing = json.loads(marker.read_text())
+        if existing.get("params") == params:
+            return existing["stats"]
+    except (OSError, ValueError):
+        pass
+
+    if homeDir.exists() and any(homeDir.iterdir()):
+        if not marker.exists():
+            raise RuntimeError(f"{homeDir} isn't empty and wasn't made by synthTree, refusing to touch it")
+        import shutil
+        shutil.rmtree(homeDir)
+
+    stats = generate(homeDir, projects, versions, seed, hipBytes)
+    marker.write_text(json.dumps({"params": params, "stats": stats}))
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("homeDir")
+    parser.add_argument("--preset", choices=sorted(PRESETS))
+    parser.add_argument("--projects", type=int)
+    parser.add_argument("--versions", type=int)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--hip-bytes", type=int, default=0)
+    args = parser.parse_args()
+
+    params = dict(PRESETS[args.preset or "small"])
+    if args.projects:
+        params["projects"] = args.projects
+    if args.versions:
+        params["versions"] = args.versions
+
+    start = time.perf_counter()
+    stats = ensureTree(args.homeDir, params["projects"], params["versions"], args.seed, args.hip_bytes)
+    print(json.dumps(stats), f"({time.perf_counter() - start:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
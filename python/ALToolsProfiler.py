@@ -0,0 +1,270 @@
+"""
+Opt-in timing spans for the ALTools tools.
+
+Switched on with the ALTOOLS_PROFILE environment variable (set it in packages/ALTools.json):
+
+    "0" / unset   off, span() hands back a shared no-op and costs next to nothing
+    "1"           every span is appended to a rotating JSON-lines log
+    "cprofile"    as "1", and tool entry points also dump a cProfile .prof file
+
+Logs go to $ALTOOLS_PROFILE_DIR, by default $HOUDINI_USER_PREF_DIR/ALTools/profiling.
+
+    with span("quickProject.scan", projects=12):
+        ...
+
+    @traced("CustomNodeColour.setNodeColour", entry=True)
+    def setNodeColour(): ...
+
+Summarize the log (p50 / p95 per phase) with:
+
+    python -m ALToolsProfiler [logDir] [--since 1d] [--name quickProject]
+"""
+import os
+import threading
+import time
+from functools import wraps
+
+
+LOG_NAME = "spans.jsonl"
+MAX_BYTES = 5 * 1024 * 1024
+BACKUPS = 3
+
+_mode = os.environ.get("ALTOOLS_PROFILE", "0").strip().lower()
+_enabled = _mode not in ("", "0", "off", "false", "no")
+_local = threading.local()
+_writeLock = threading.Lock()
+_logFile = None
+
+
+def enabled():
+    return _enabled
+
+
+def logDir():
+    configured = os.environ.get("ALTOOLS_PROFILE_DIR")
+    if configured:
+        return configured
+    prefDir = os.environ.get("HOUDINI_USER_PREF_DIR") or os.path.expanduser("~")
+    return os.path.join(prefDir, "ALTools", "profiling")
+
+
+class _nullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **fields):
+        pass
+
+
+_NULL_SPAN = _nullSpan()
+
+
+class _span:
+    def __init__(self, name, entry, fields):
+        self.name = name
+        self.entry = entry
+        self.fields = fields
+        self.profiler = None
+
+    def set(self, **fields):
+        """
+        Adds fields to the record, eg counts only known once the work is done.
+        """
+        self.fields.update(fields)
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        if self.entry and _mode == "cprofile" and not getattr(_local, "profiling", False):
+            import cProfile
+            self.profiler = cProfile.Profile()
+            _local.profiling = True # cProfile can't nest, only the outermost entry point profiles
+            self.profiler.enable()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, excType, exc, tb):
+        elapsed = (time.perf_counter() - self.start) * 1000
+        if self.profiler is not None:
+            self.profiler.disable()
+            _local.profiling = False
+        _local.stack.pop()
+
+        record = {
+            "ts": round(time.time(), 3),
+            "name": self.name,
+            "ms": round(elapsed, 3),
+            "parent": self.parent,
+            "thread": threading.current_thread().name,
+            "pid": os.getpid(),
+            "ok": excType is None,
+        }
+        if excType is not None:
+            record["error"] = f"{excType.__name__}: {exc}"
+        if self.fields:
+            record["fields"] = self.fields
+        if self.profiler is not None:
+            record["profile"] = dumpProfile(self.profiler, self.name)
+        writeRecord(record)
+        return False
+
+
+def span(name, entry=False, **fields):
+    """
+    Times the with block as one span. entry marks a tool entry point (a shelf click,
+    opening a panel), those are the ones cProfile mode profiles.
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _span(name, entry, fields)
+
+
+def traced(name=None, entry=False):
+    """
+    Decorator version of span, the span is named after the function unless name is given.
+    """
+    def decorate(function):
+        spanName = name or f"{function.__module__}.{function.__qualname__}"
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            with _span(spanName, entry, {}):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# -----------------------------------------------------------------
+# Writing
+# -----------------------------------------------------------------
+
+def writeRecord(record):
+    import json
+    global _logFile
+    line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
+    with _writeLock:
+        try:
+            if _logFile is None:
+                os.makedirs(logDir(), exist_ok=True)
+                _logFile = open(os.path.join(logDir(), LOG_NAME), "a", buffering=1)
+            _logFile.write(line)
+            if _logFile.tell() > MAX_BYTES:
+                rotate()
+        except OSError as e:
+            print(f"ALTools profiling couldn't write its log: {e}")
+
+
+def rotate():
+    """
+    spans.jsonl -> spans.1.jsonl -> ... -> spans.<BACKUPS>.jsonl (dropped). Call with _writeLock held.
+    """
+    global _logFile
+    _logFile.close()
+    _logFile = None
+    base = os.path.join(logDir(), LOG_NAME)
+    stem = base[:-len(".jsonl")]
+    for i in range(BACKUPS - 1, 0, -1):
+        if os.path.exists(f"{stem}.{i}.jsonl"):
+            os.replace(f"{stem}.{i}.jsonl", f"{stem}.{i + 1}.jsonl")
+    os.replace(base, f"{stem}.1.jsonl")
+
+
+def dumpProfile(profiler, name):
+    path = os.path.join(logDir(), f"{name}_{time.strftime('%Y%m%d-%H%M%S')}_{os.getpid()}.prof")
+    try:
+        os.makedirs(logDir(), exist_ok=True)
+        profiler.dump_stats(path)
+        return path
+    except OSError as e:
+        print(f"ALTools profiling couldn't write {path}: {e}")
+        return None
+
+
+# -----------------------------------------------------------------
+# Summarizing
+# -----------------------------------------------------------------
+
+def readRecords(directory=None):
+    import glob
+    import json
+    directory = directory or logDir()
+    def age(path):
+        # spans.jsonl is the newest, spans.<n>.jsonl get older with n
+        number = os.path.basename(path)[len("spans."):-len(".jsonl")]
+        return int(number) if number.isdigit() else 0
+
+    paths = sorted(glob.glob(os.path.join(directory, "spans*.jsonl")), key=age, reverse=True) # oldest backups first
+    for path in paths:
+        with open(path) as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue # torn line from a crashed session
+
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def summarize(records, since=None, prefix=None):
+    """
+    Returns [(name, count, p50, p95, max, total, errors)] sorted by total time, slowest first.
+    """
+    phases = {}
+    for record in records:
+        if since is not None and record.get("ts", 0) < since:
+            continue
+        if prefix and not record.get("name", "").startswith(prefix):
+            continue
+        phase = phases.setdefault(record.get("name", "?"), {"ms": [], "errors": 0})
+        phase["ms"].append(record.get("ms", 0.0))
+        if not record.get("ok", True):
+            phase["errors"] += 1
+
+    rows = []
+    for name, phase in phases.items():
+        ordered = sorted(phase["ms"])
+        rows.append((name, len(ordered), percentile(ordered, 0.5), percentile(ordered, 0.95),
+                     ordered[-1], sum(ordered), phase["errors"]))
+    return sorted(rows, key=lambda row: row[5], reverse=True)
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog="ALToolsProfiler", description="p50 / p95 per phase from the ALTools span log.")
+    parser.add_argument("logDir", nargs="?", help=f"default: {logDir()}")
+    parser.add_argument("--since", help="only spans newer than this, eg 2h, 1d, 7d")
+    parser.add_argument("--name", help="only spans whose name starts with this")
+    args = parser.parse_args(argv)
+
+    since = None
+    if args.since:
+        units = {"m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+        try:
+            since = time.time() - float(args.since[:-1]) * units[args.since[-1]]
+        except (ValueError, KeyError):
+            parser.error(f"--since {args.since}: expected a number followed by m, h, d or w, eg 2h")
+
+    rows = summarize(readRecords(args.logDir), since, args.name)
+    if not rows:
+        print("No spans logged, is ALTOOLS_PROFILE set?")
+        return 1
+    print(f"{'phase':<44} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'total s':>8} {'errors':>6}")
+    for name, count, p50, p95, longest, total, errors in rows:
+        print(f"{name:<44} {count:>6} {p50:>9.2f} {p95:>9.2f} {longest:>9.2f} {total / 1000:>8.2f} {errors:>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,5 +1,7 @@
 import hou
+from ALToolsProfiler import traced
 
+@traced("CustomNodeColour.setNodeColour", entry=True)
 def setNodeColour():
     nodes = hou.selectedNodes()
 
@@ -1,3 +1,14 @@
-from .converter import materialconverterMTLX
+import importlib
 
-__all__ = ["materialconverterMTLX"]
\ No newline at end of file
+
+__all__ = ["converter", "materialconverterMTLX"]
+
+
+def __getattr__(name):
+    # the converter needs hou, it is loaded the first time the shelf tool asks for it
+    if name == "converter":
+        return importlib.import_module(f"{__name__}.converter")
+    if name == "materialconverterMTLX":
+        from .converter import materialconverterMTLX
+        return materialconverterMTLX
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,73 +6,150 @@
 
 import hou
 import os
+from ALToolsProfiler import traced
+
+
+PRINCIPLED_TYPE = "principledshader::2.0"
+
+
+def materialLibraries():
+    """
+    Every material library LOP in the scene. Read from the node type's instance list,
+    which Houdini keeps up to date, instead of walking everything under /stage.
+    """
+    nodeType = hou.nodeType(hou.lopNodeTypeCategory(), "materiallibrary")
+    return list(nodeType.instances()) if nodeType is not None else []
+
+
+def principledShaders(network=None):
+    """
+    Principled shaders in the scene, or only those inside network, from the type's instance list.
+    """
+    nodeType = hou.nodeType(hou.vopNodeTypeCategory(), PRINCIPLED_TYPE)
+    if nodeType is None:
+        return []
+    shaders = nodeType.instances()
+    if network is not None:
+        prefix = network.path().rstrip("/") + "/"
+        shaders = [shader for shader in shaders if shader.path().startswith(prefix)]
+    return sorted(shaders, key=lambda shader: shader.path())
+
 
 class materialconverterMTLX():
 
+    @traced("PrincipleToMTLX.materialconverterMTLX", entry=True)
     def __init__(self):
-        global mysel
-        mysel = hou.selectedNodes()
+        self.selection = hou.selectedNodes()
         self.safetycheck()
         
     ###### SAFETY TO CHECK THE CURRENT SELECTION, IF NOTHING OR IF NOT A PRINCIPLE SHADER THEN SHOW A MESSAGE
+    ###### SEVERAL SELECTED SHADERS, OR A NETWORK HOLDING SOME, ARE CONVERTED IN ONE BATCH
     def safetycheck(self):
-        if mysel==():
-            hou.ui.displayMessage("Please select a principleShader to convert")
-        else :
-            type = mysel[0].type()
-            if type.name() == "principledshader::2.0":
-                self.filtermaterial()
-                
-            else:
-                hou.ui.displayMessage("Current selected node is a : " + type.description() + """
+        if self.selection == ():
+            choice = hou.ui.displayMessage("Please select a principleShader to convert, or pick a network to convert every principleShader inside it",
+                                           buttons=["Pick Network...", "Cancel"], default_choice=1, close_choice=1)
+            if choice == 0:
+                network = hou.ui.selectNode(title="Convert every principleShader inside")
+                if network is not None:
+                    self.convertNetwork(hou.node(network))
+            return
+
+        shaders = [node for node in self.selection if node.type().name() == PRINCIPLED_TYPE]
+        if shaders:
+            self.batchConvert(shaders)
+            return
+
+        # a network (eg a matnet) was selected, convert what is inside it
+        shaders = [shader for node in self.selection for shader in principledShaders(node)]
+        if shaders:
+            names = ", ".join(node.name() for node in self.selection)
+            if hou.ui.displayMessage(f"Convert the {len(shaders)} principleShaders inside {names} ?", buttons=["YES", "NO"]) == 0:
+                self.batchConvert(shaders)
+            return
+
+        type = self.selection[0].type()
+        hou.ui.displayMessage("Current selected node is a : " + type.description() + """
                 
                 You need to select a node of type PrincipledShader""")
+
+    def convertNetwork(self, network):
+        shaders = principledShaders(network)
+        if not shaders:
+            hou.ui.displayMessage(f"No principleShader found inside {network.path()}")
+            return
+        self.batchConvert(shaders)
                 
-    ###### CREATE A UI TO SEND CONVERTED RESULT INTO  A MATERIAL LIBRARY           
+    ###### CREATE A UI TO SEND CONVERTED RESULT INTO  A MATERIAL LIBRARY, ASKED ONCE PER BATCH
     def filtermaterial(self):
-        
+        """
+        Asks for the material library the converted materials go to.
+
+        Returns:
+            str: path of the chosen library, None when the scene has no material library
+                (every material is made next to its shader) or False when cancelled
+        """
         #function to find materiallibrary in prompt dialog
         def ismatlibrary(node):
             # Only show nodes which are material library
-            if node.type().name() == "materiallibrary":
-                return True
-            else:
-                # Don't show nodes that arent material library
-                return False
-        
-        findlib=[]
-        stage= hou.node("/stage")
-        nodes = stage.allSubChildren()
-        for n in nodes:
-            if n.type().name() == "materiallibrary":
-                findlib.append(n)
-                #if no material library then convert in current network
+            return node.type().name() == "materiallibrary"
 
-        if findlib == []:
-            path = hou.selectedNodes()[0].parent()
-            self.mtlxConvert(path.path())
-        
+        #if no material library then convert in current network
+        if not materialLibraries():
+            return None
 
         # if material library in scene Prompt the user to select node data.
-        else:
-            
-            selected_data = hou.ui.selectNode(custom_node_filter_callback=ismatlibrary)
-            
-            # Output the selected data.
-            if selected_data != None:
-                #Executing materialX conversion and sending the path of the selected materialLibrary into it
-                self.mtlxConvert(selected_data)
-    
-                previewUI = hou.ui.displayMessage("Do you wish to create a USD preview ?", buttons=["YES", "NO"])
-                if previewUI == 0:
-                    self.usdpreview(selected_data)
-                else:
-                    pass
+        selected_data = hou.ui.selectNode(custom_node_filter_callback=ismatlibrary)
+        return selected_data if selected_data is not None else False
+
+    @traced("PrincipleToMTLX.batchConvert")
+    def batchConvert(self, shaders):
+        """
+        Converts shaders with one library choice, one USD preview question and one undo
+        group, so the whole batch undoes in one step. Shows a progress bar, cancelling
+        keeps the materials converted so far.
+        """
+        library = self.filtermaterial()
+        if library is False:
+            return []
+
+        preview = False
+        if library is not None:
+            previewUI = hou.ui.displayMessage("Do you wish to create a USD preview ?", buttons=["YES", "NO"])
+            preview = previewUI == 0
+
+        converted = []
+        cancelled = False
+        with hou.undos.group(f"Convert {len(shaders)} PrincipledShader to MaterialX"):
+            try:
+                with hou.InterruptableOperation("Converting to MaterialX",
+                                                long_operation_name=f"Converting {len(shaders)} principleShaders",
+                                                open_interrupt_dialog=True) as operation:
+                    for number, shader in enumerate(shaders):
+                        operation.updateLongProgress(number / len(shaders), f"{shader.name()} ({number + 1}/{len(shaders)})")
+                        #Executing materialX conversion and sending the path of the selected materialLibrary into it
+                        matsubnet = self.mtlxConvert(library or shader.parent().path(), shader, select=False)
+                        if preview:
+                            # a component material can only be bound to one material, only wire it up for a single shader
+                            self.usdpreview(library, shader, matsubnet, layout=False, assign=len(shaders) == 1)
+                        converted.append(matsubnet)
+            except hou.OperationInterrupted:
+                cancelled = True
+
+            if preview and converted:
+                hou.node(library).layoutChildren() # once for the batch, not per material
+            for number, matsubnet in enumerate(converted):
+                matsubnet.setSelected(True, clear_all_selected=number == 0)
+
+        if len(shaders) > 1 or cancelled:
+            message = f"Converted {len(converted)} of {len(shaders)} principleShaders to MaterialX"
+            hou.ui.setStatusMessage(message + (", cancelled" if cancelled else ""))
+        return converted
     
-    def usdpreview(self, path):
+    @traced("PrincipleToMTLX.usdpreview")
+    def usdpreview(self, path, mysel=None, matsubnet=None, layout=True, assign=True):
 
         matcontext = hou.node(path)
-        #mysel = hou.selectedNodes()[0]
+        mysel = mysel or hou.selectedNodes()[0]
         usdmat = matcontext.createNode("usdpreviewsurface", mysel.name() + "_previewUSD")
         
         albedo = matcontext.createNode("usduvtexture::2.0", "USD_albedo")
@@ -109,9 +186,10 @@ class materialconverterMTLX():
         #set USDpreview settings
         usdmat.parm("opacityThreshold").set(0.2)
         usdmat.parm("useSpecularWorkflow").set(1)
-        matcontext.layoutChildren()
+        if layout:
+            matcontext.layoutChildren()
             
-        test = matcontext.outputs()
+        test = matcontext.outputs() if assign else ()
         if len(test)>0:
             if (test[0].type().description()) == "Component Material":
                 #setting component material - materialpath with mtlX
@@ -135,12 +213,11 @@ class materialconverterMTLX():
 
         
     ###### CREATION MATERIAL X SUBNET CONTENT BASED ON THE SELECTED MATERIAL LIBRARY
-    def mtlxConvert(self, path):
+    @traced("PrincipleToMTLX.mtlxConvert")
+    def mtlxConvert(self, path, mysel=None, select=True):
         matcontext = hou.node(path)
-        global mysel
-        mysel = hou.selectedNodes()[0]
+        mysel = mysel or hou.selectedNodes()[0]
         
-        global matsubnet
         matsubnet = matcontext.createNode("subnet", mysel.name() + "_materialX")
         hou.VopNode.setMaterialFlag(matsubnet, True)
         
@@ -241,7 +318,6 @@ class materialconverterMTLX():
         
         
         matsubnet.layoutChildren()
-        matsubnet.setSelected(True, True)
-        
-materialconverterMTLX()
-
+        if select:
+            matsubnet.setSelected(True, True)
+        return matsubnet
@@ -1,19 +1,177 @@
-from pathlib import Path
-import hou 
+"""
+Theme engine for the ALTools widgets.
+
+A theme is a folder of .qss files. "Default" is the Styles folder itself, any sub folder
+of Styles (eg Styles/Light) is another theme and only needs the sheets it changes, the
+rest fall back to Default. A theme can also bring its own images folder.
+
+Stylesheets are read and preprocessed (image paths made absolute) once and then served
+from memory, a sheet is only re-read when its file changes on disk. Icons from
+hou.ui.createQtIcon are cached the same way.
+
+    StyleLoader.applyStyle(widget, "buttonStyle.qss") # styles it and restyles it on setTheme
+    StyleLoader.setTheme("Light")                # every applied widget follows, no rebuild
+"""
+import os
+import threading
+
+
+DEFAULT_THEME = "Default"
+STYLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Styles")
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images")
+
+_theme = DEFAULT_THEME
+_sheets = {} # (theme, name) -> (stamp, preprocessed text)
+_icons = {}
+_widgets = None # WeakKeyDictionary widget -> sheet name, made on first apply
+_missing = set()
+_lock = threading.Lock()
+
+
+def themeDir(theme):
+    if theme == DEFAULT_THEME:
+        return STYLES_DIR
+    return os.path.join(STYLES_DIR, theme)
+
+
+def themes():
+    """
+    Returns the names of the installed themes, Default first.
+    """
+    try:
+        folders = sorted(entry.name for entry in os.scandir(STYLES_DIR) if entry.is_dir())
+    except OSError:
+        folders = []
+    return [DEFAULT_THEME] + [folder for folder in folders if folder != DEFAULT_THEME]
+
+
+def currentTheme():
+    return _theme
+
+
+def resolve(name, theme=None):
+    """
+    Path of a sheet in the given theme, falling back to Default when the theme doesn't have it.
+    """
+    theme = theme or _theme
+    path = os.path.join(themeDir(theme), name)
+    if theme != DEFAULT_THEME and not os.path.exists(path):
+        path = os.path.join(STYLES_DIR, name)
+    return path
+
+
+def preprocess(text, theme):
+    """
+    Makes url(images/...) absolute so Qt finds the images wherever ALTools is installed.
+    """
+    imagesDir = os.path.join(themeDir(theme), "images")
+    if not os.path.isdir(imagesDir):
+        imagesDir = IMAGES_DIR
+    imagesDir = imagesDir.replace(os.sep, "/")
+    for quote in ("", '"', "'"):
+        text = text.replace(f"url({quote}images/", f"url({quote}{imagesDir}/")
+    return text
+
 
 def style(name, baseDir=None):
-    if baseDir is None:
-        baseDir = Path(__file__).parent
-    
-    stylePath = Path(baseDir/"Styles"/name)
-
-    if stylePath.exists():
-        with open(stylePath) as file:
-            data = file.read()
-            file.close()
-        return data
-    
-    else:
-        hou.ui.displayMessage(f"Style not found at {stylePath}")
-        #return ""
-    
+    """
+    Returns the stylesheet name from the current theme, ready for setStyleSheet.
+
+    Args:
+        name (str): file name of the sheet, eg "buttonStyle.qss".
+        baseDir (str | Path): read Styles/name from this folder instead, uncached.
+
+    Returns:
+        str: the stylesheet, "" if it doesn't exist.
+    """
+    if baseDir is not None:
+        path = os.path.join(str(baseDir), "Styles", name)
+        if not os.path.exists(path):
+            return notFound(path)
+        with open(path) as file:
+            return preprocess(file.read(), DEFAULT_THEME)
+
+    theme = _theme
+    path = resolve(name, theme)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return notFound(path)
+    stamp = (path, stat.st_mtime_ns, stat.st_size)
+
+    cached = _sheets.get((theme, name))
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    with open(path) as file:
+        text = preprocess(file.read(), theme)
+    with _lock:
+        _sheets[(theme, name)] = (stamp, text)
+    return text
+
+
+def notFound(path):
+    # only tell the user once per missing sheet, a dialog opens plenty of widgets
+    if path not in _missing:
+        _missing.add(path)
+        import hou
+        hou.ui.displayMessage(f"Style not found at {path}")
+    return ""
+
+
+def qtIcon(name):
+    """
+    Cached hou.ui.createQtIcon, every dialog asks for the same handful of icons.
+    """
+    cached = _icons.get(name)
+    if cached is None:
+        import hou
+        cached = _icons[name] = hou.ui.createQtIcon(name)
+    return cached
+
+
+def applyStyle(widget, name):
+    """
+    Sets the sheet name on widget and remembers it, so setTheme can restyle the widget
+    later. The widget is only weakly referenced and drops out once Qt deletes it.
+    """
+    global _widgets
+    if _widgets is None:
+        import weakref
+        _widgets = weakref.WeakKeyDictionary()
+    widget.setStyleSheet(style(name))
+    with _lock:
+        _widgets[widget] = name
+    return widget
+
+
+def setTheme(theme):
+    """
+    Switches the theme and restyles every widget styled through applyStyle().
+
+    Returns:
+        bool: False if the theme isn't installed, the current one stays.
+    """
+    global _theme
+    if theme not in themes():
+        return False
+    if theme == _theme:
+        return True
+    _theme = theme
+    with _lock:
+        styled = list(_widgets.items()) if _widgets is not None else []
+    for widget, name in styled:
+        try:
+            widget.setStyleSheet(style(name))
+        except RuntimeError:
+            # the C++ widget is gone but python still held the wrapper
+            with _lock:
+                _widgets.pop(widget, None)
+    return True
+
+
+def clearCache():
+    with _lock:
+        _sheets.clear()
+        _icons.clear()
+        _missing.clear()
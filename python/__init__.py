@@ -1,10 +1,16 @@
-from . import quickProject
-from . import StyleLoader
-from . import PrincipleToMTLX
-from . import syncFields
+import importlib
 
 
 __version__ = "1.0.0"
 __author__ = "Jack Gelok"
 
-__all__ = ["quickProject", "StyleLoader", "PrincipleToMTLX", syncFields]    
\ No newline at end of file
+__all__ = ["quickProject", "StyleLoader", "PrincipleToMTLX", "syncFields", "CustomNodeColour"]
+
+
+def __getattr__(name):
+    # submodules are only imported when first used, importing ALTools itself does nothing
+    if name in __all__:
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
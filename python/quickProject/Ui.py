@@ -3,12 +3,17 @@ try:
     from PySide2 import QtWidgets, QtCore, QtGui
 except Exception:
     from PySide6 import QtWidgets, QtCore, QtGui
-from pathlib import Path
-from StyleLoader import style
+from StyleLoader import applyStyle, qtIcon, setTheme
+from ALToolsProfiler import traced
 from .settingsPannel import settingsPannel
 from .logic import quickProjectLogic
-import json
+from .fileTreeModel import fileTreeModel, fileTreeFilter
+from .searchIndex import searchIndex
+from .scanWorker import projectScanWorker
+from .thumbnailLoader import thumbnailLoader
+from .projectWatcher import projectWatcher
 import os
+import time
 
 
 
@@ -18,14 +23,23 @@ class quickProjectUi(QtWidgets.QDialog):
     fileNameChanged = QtCore.Signal(str)
 
 
+    @traced("quickProject.quickProjectUi", entry=True)
     def __init__(self):
         super().__init__(hou.qt.mainWindow())
     #non ui logic and globals
         self.logic = quickProjectLogic()
-        self.jsonPath = Path(f"{hou.getenv('HOUDINI_USER_PREF_DIR')}/ALTools/Projects.json")
-        with open(self.jsonPath, "r") as settFile:
-            self.userdata = json.load(settFile)
-            self.homeDir = Path(self.userdata["settings"]["homeDir"])
+        self.jsonPath = self.logic.jsonPath
+        self.threadPool = QtCore.QThreadPool()
+        self.scanWorker = None # the full scan driving the "Scanning…" label
+        self.scanWorkers = []
+        self.jobWorkers = [] # moves / reconciles, a tree refresh never cancels these
+        self.watcher = None
+        self.searchIndex = searchIndex() # kept in sync with every project the model sees
+        self.pendingIndex = {} # projectName -> filesDict, indexed a slice at a time off the paint
+        self.projectFilter = "" # what the user typed, not what a tree click filled in
+        self.fileFilter = ""
+        self.fillingFromTree = False
+        setTheme(self.logic.settings.get("Style", "Default"))
     
     #settings/title
         self.menuBar()
@@ -42,6 +56,7 @@ class quickProjectUi(QtWidgets.QDialog):
         self.mainLayout()
 
     #ui dependent logic and glbals
+        self.startWatcher()
         self.populateFileTree()
         self.connector()
         self.show()
@@ -54,34 +69,30 @@ class quickProjectUi(QtWidgets.QDialog):
 
 
     def menuBar(self):
-        #styles
-        settingsStyle = style("settingsIconStyle.qss")
-        titleStyle = style("titleStyle.qss")
-
         #widgets
         self.settingsCog = QtWidgets.QPushButton()
-        icon = hou.ui.createQtIcon("MISC_generic")
+        icon = qtIcon("MISC_generic")
         self.settingsCog.setIcon(icon)
         #self.settingsCog.setMaximumWidth(35)
         self.settingsCog.setMinimumHeight(35)
-        self.settingsCog.setStyleSheet(settingsStyle)
+        applyStyle(self.settingsCog, "settingsIconStyle.qss")
         title = QtWidgets.QLabel("Quick Project")
-        title.setStyleSheet(titleStyle)
+        applyStyle(title, "titleStyle.qss")
+
+        #scan status, only visible while the background scan runs
+        self.scanStatus = QtWidgets.QLabel("Scanning…")
+        self.scanStatus.setVisible(False)
 
         #Layout
         self.menuBarLayout = QtWidgets.QHBoxLayout()
         self.menuBarLayout.addWidget(title)
+        self.menuBarLayout.addWidget(self.scanStatus)
         self.menuBarLayout.addWidget(hou.qt.Separator())
         self.menuBarLayout.addWidget(self.settingsCog)
 
 
     def saveWidgets(self):
 
-        #StyleSheets
-        buttonsStyle = style("buttonStyle.qss")
-        textLineStyle = style("textLineStyle.qss")  
-        versionStyle = style("versionStyle.qss")
-
         #seperator 
         self.setperator = hou.qt.Separator()
 
@@ -89,55 +100,120 @@ class quickProjectUi(QtWidgets.QDialog):
         self.save = QtWidgets.QPushButton("Save")
         self.save.setMinimumWidth(70)
         self.save.setMaximumWidth(70)
-        self.save.setStyleSheet(buttonsStyle)
+        applyStyle(self.save, "buttonStyle.qss")
 
         #Save as Button
         self.load = QtWidgets.QPushButton("Load")
         self.load.setMinimumWidth(70)
         self.load.setMaximumWidth(70)
-        self.load.setStyleSheet(buttonsStyle)
+        applyStyle(self.load, "buttonStyle.qss")
+
+        #Load options, fast open / merge for heavy scenes
+        self.loadOptions = QtWidgets.QPushButton("▾")
+        self.loadOptions.setMaximumWidth(24)
+        applyStyle(self.loadOptions, "buttonStyle.qss")
+        loadMenu = QtWidgets.QMenu(self.loadOptions)
+        loadMenu.addAction("Load", lambda: self.loadFile())
+        loadMenu.addAction("Fast Open (Manual Update)", lambda: self.loadFile(fast=True))
+        loadMenu.addAction("Fast Open, Skip Warnings", lambda: self.loadFile(fast=True, skipWarnings=True))
+        loadMenu.addAction("Merge Networks…", lambda: self.loadFile(fast=True, merge=True))
+        loadMenu.addSeparator()
+        loadMenu.addAction("Restore Update Mode", self.logic.restoreUpdateMode)
+        self.loadOptions.setMenu(loadMenu)
 
         #Project name
         self.projectName = QtWidgets.QLineEdit()
-        self.projectName.setStyleSheet(textLineStyle)
+        applyStyle(self.projectName, "textLineStyle.qss")
         self.projectName.setMaximumWidth(150)
         self.projectName.setPlaceholderText("Project")
         self.projectName.textChanged.connect(self.projectNameChanged.emit)
 
         #File Name
         self.fileName = QtWidgets.QLineEdit()
-        self.fileName.setStyleSheet(textLineStyle)
+        applyStyle(self.fileName, "textLineStyle.qss")
         self.fileName.setPlaceholderText("Hip File Name")
         self.fileName.textChanged.connect(self.fileNameChanged.emit)
 
         #Version Counter
         self.version = QtWidgets.QLabel(f"v{0:03}")
-        self.version.setStyleSheet(versionStyle)
+        applyStyle(self.version, "versionStyle.qss")
+
+        #Root a new project is saved into, only shown with more than one root
+        self.rootChoice = QtWidgets.QComboBox()
+        self.rootChoice.setToolTip("Project root new projects are saved into")
+        self.fillRoots()
+
+    def fillRoots(self):
+        current = self.rootChoice.currentText()
+        roots = [root["name"] for root in self.logic.roots()]
+        self.rootChoice.clear()
+        self.rootChoice.addItems(roots)
+        if current in roots:
+            self.rootChoice.setCurrentText(current)
+        self.rootChoice.setVisible(len(roots) > 1)
 
     def saveBarLayout(self):
         self.saveBar = QtWidgets.QHBoxLayout()
+        self.saveBar.addWidget(self.rootChoice)
         self.saveBar.addWidget(self.projectName)
         self.saveBar.addWidget(self.fileName)
         self.saveBar.addWidget(self.version)
         self.saveBar.addWidget(self.save)
         self.saveBar.addWidget(self.load)
+        self.saveBar.addWidget(self.loadOptions)
 
 
     def fileTreeWidgets(self):
 
-        #style Sheet
-        fileTreeStyle = style("fileTreeStyle.qss")
-        fileTreeStyle = self.qssPathCorrector("images", fileTreeStyle)
-        
-
-
-        self.files = QtWidgets.QTreeWidget()
-        self.files.setColumnCount(3)
+        # Icons
+        icons = {
+            "group": qtIcon("NETWORKS_subnet"),
+            "project": qtIcon("NETWORKS_scene"),
+            "file": qtIcon("BUTTONS_folder"),
+            "version": qtIcon("MISC_logo"),
+        }
+
+        # lazy model, files / versions are only read when their row is expanded
+        self.model = fileTreeModel(self.logic, icons, self, self.logic.settings.get("versionPageSize", 10))
+        self.model.projectUpdated.connect(self.indexProject)
+        self.filter = fileTreeFilter(self)
+        self.filter.setSourceModel(self.model)
+
+        # search, filters live as you type
+        self.search = QtWidgets.QLineEdit()
+        applyStyle(self.search, "textLineStyle.qss")
+        self.search.setPlaceholderText("Search   fx_v012   author:name   since:7d   before:2025-01-31")
+        self.search.setClearButtonEnabled(True)
+
+        self.filterTimer = QtCore.QTimer(self)
+        self.filterTimer.setSingleShot(True)
+        self.filterTimer.setInterval(50)
+        self.filterTimer.timeout.connect(self.applyFilter)
+
+        # project updates are indexed once the event loop is idle, so painting a snapshot
+        # of a thousand projects doesn't wait on the search index
+        self.indexTimer = QtCore.QTimer(self)
+        self.indexTimer.setSingleShot(True)
+        self.indexTimer.setInterval(0)
+        self.indexTimer.timeout.connect(self.indexPending)
+
+        self.files = QtWidgets.QTreeView()
+        self.files.setModel(self.filter)
+        self.files.setUniformRowHeights(True)
         self.header = self.files.header()
         self.header.setSectionResizeMode(1, QtWidgets.QHeaderView.ResizeToContents)
         self.files.setColumnWidth(0,230)
-        self.files.setHeaderLabels(["Project","Version","Modified"])
-        self.files.setStyleSheet(fileTreeStyle)
+        self.files.setColumnWidth(3,70)
+        self.files.setColumnWidth(4,80)
+        self.files.setColumnWidth(5,60)
+        applyStyle(self.files, "fileTreeStyle.qss") # image urls are made absolute by StyleLoader
+
+        # thumbnail of the selected version, read off the gui thread from the thumbnail cache
+        self.preview = QtWidgets.QLabel()
+        self.preview.setAlignment(QtCore.Qt.AlignCenter)
+        self.preview.setFixedHeight(150)
+        self.preview.setVisible(False)
+        self.previewKey = None
 
 
 
@@ -148,7 +224,9 @@ class quickProjectUi(QtWidgets.QDialog):
     def mainLayout(self):
         self.layout = QtWidgets.QVBoxLayout()
         self.layout.addLayout(self.menuBarLayout)
+        self.layout.addWidget(self.search)
         self.layout.addWidget(self.files)   
+        self.layout.addWidget(self.preview)
         self.layout.addLayout(self.saveBar)
         self.setLayout(self.layout)
 
@@ -157,206 +235,471 @@ class quickProjectUi(QtWidgets.QDialog):
     # Logic
     # -----------------------------------------------------------------
 
+    @traced("quickProject.populateFileTree")
     def populateFileTree(self):
         """
-        Incrementally populate the QTreeWidget with projects, their files, and versions.
-        Keeps existing expanded/collapsed state intact.
+        Incrementally populate the tree with projects. The project roots are scanned on
+        worker threads and projects are streamed into the model in batches, versions are
+        loaded by the model when a file is expanded. Keeps existing expanded/collapsed state intact.
         """
-        # Icons
-        houdiniLogo = hou.ui.createQtIcon("MISC_logo")
-        sceneLogo = hou.ui.createQtIcon("NETWORKS_scene")
-        folderIcon = hou.ui.createQtIcon("BUTTONS_folder")
-
-        # Load homeDir
-        homeDir = self.homeDir
-        if not homeDir.exists():
-            print(f"Home directory does not exist: {homeDir}")
+        roots = self.logic.roots()
+        for root in roots:
+            if not os.path.isdir(root["path"]):
+                print(f"Project root {root['name']} does not exist: {root['path']}")
+        if not any(os.path.isdir(root["path"]) for root in roots):
             return
 
-        existingProjects = {self.files.topLevelItem(i).text(0): self.files.topLevelItem(i)
-                            for i in range(self.files.topLevelItemCount())}
-
-        # Iterate project folders
-        for projectFolder in sorted(homeDir.iterdir()):
-            if not projectFolder.is_dir():
-                continue
-
-            projectName = projectFolder.name
-            projectJson = projectFolder / f"{projectName}_Project.json"
-            if not projectJson.exists():
-                continue
-
-            # Load project JSON
-            with open(projectJson, "r") as file:
-                data = json.load(file)
-
-            # Check if project item already exists
-            projectItem = existingProjects.get(projectName)
-            if not projectItem:
-                projectItem = QtWidgets.QTreeWidgetItem(self.files)
-                projectItem.setText(0, projectName)
-                projectItem.setIcon(0, sceneLogo)
-                projectItem.setExpanded(False)
-
-            # Existing file items in project
-            existingFiles = {projectItem.child(i).text(0): projectItem.child(i)
-                            for i in range(projectItem.childCount())}
-
-            # Add/update files
-            filesDict = data.get("Files", {})
-            for fileName, fileData in sorted(filesDict.items()):
-                fileItem = existingFiles.get(fileName)
-                if not fileItem:
-                    fileItem = QtWidgets.QTreeWidgetItem(projectItem)
-                    fileItem.setText(0, fileName)
-                    fileItem.setIcon(0, folderIcon)
-                    fileItem.setExpanded(False)
-
-                # Existing versions
-                existingVersions = {fileItem.child(i).text(1): fileItem.child(i)
-                                    for i in range(fileItem.childCount())}
-
-                versionCount = int(fileData.get("version", "v000").lstrip("v"))
-                for v in range(1, versionCount + 1):
-                    versionText = f"v{v:03}"
-                    if versionText in existingVersions:
-                        continue  # version already exists
-
-                    versionName = f"{projectName}_{fileName}_v{v:03}.hip"
-                    hipFilePath = Path(projectFolder / versionName)
-
-                    versionItem = QtWidgets.QTreeWidgetItem(fileItem)
-                    versionItem.setText(0, fileName)
-                    versionItem.setText(1, versionText)
-
-                    if hipFilePath.exists():
-                        modifiedDate = QtCore.QDateTime.fromSecsSinceEpoch(int(hipFilePath.stat().st_mtime))
-                        versionItem.setText(2, modifiedDate.toString("HH:mm:ss dd/MM/yyyy"))
-                    else:
-                        versionItem.setText(2, "N/A")
-
-                    versionItem.setIcon(0, houdiniLogo)
+        self.cancelScan()
+
+        # paint the last scan straight away, the worker then only re-reads changed folders
+        snapshot = self.logic.loadSnapshot()
+        if snapshot:
+            self.projectsFound([(name, project.get("Files", {})) for name, project in snapshot.items()])
+
+        self.scanWorker = self.startScan(lambda isCancelled: self.logic.iterProjects(isCancelled, snapshot))
+        self.updateScanStatus()
+
+
+    def startScan(self, scan):
+        worker = projectScanWorker(scan)
+        worker.signals.projectsFound.connect(self.projectsFound)
+        worker.signals.finished.connect(lambda: self.scanFinished(worker))
+        worker.signals.failed.connect(self.scanFailed)
+        self.scanWorkers.append(worker) # keep a python reference while it runs
+        self.threadPool.start(worker)
+        return worker
+
+
+    def startJob(self, scan, status):
+        """
+        Runs a job that changes projects (a move, a reconcile) on the thread pool. Unlike the
+        tree scans a refresh doesn't cancel it, so its finished / failed handlers always run.
+        status is shown in the scan label while it runs.
+        """
+        worker = projectScanWorker(scan)
+        worker.status = status
+        worker.signals.projectsFound.connect(self.projectsFound)
+        worker.signals.finished.connect(lambda: self.jobFinished(worker))
+        self.jobWorkers.append(worker) # keep a python reference while it runs
+        self.threadPool.start(worker)
+        self.updateScanStatus()
+        return worker
+
+
+    def jobFinished(self, worker):
+        if worker in self.jobWorkers:
+            self.jobWorkers.remove(worker)
+        self.updateScanStatus()
+
+
+    def updateScanStatus(self):
+        # the newest running job, otherwise the full scan
+        if self.jobWorkers:
+            self.scanStatus.setText(self.jobWorkers[-1].status)
+        else:
+            self.scanStatus.setText("Scanning…")
+        self.scanStatus.setVisible(bool(self.jobWorkers) or self.scanWorker is not None)
+
+
+    def projectsFound(self, projects):
+        self.model.mergeProjects(projects)
+        if self.watcher is not None:
+            self.watcher.watchProjects([name for name, files in projects if files is not None])
+            self.watcher.unwatchProjects([name for name, files in projects if files is None])
+
+
+    def cancelScan(self, jobs=False):
+        """
+        Stops the tree scans, with jobs also the moves / reconciles (when the panel closes).
+        """
+        workers = self.scanWorkers + (self.jobWorkers if jobs else [])
+        for worker in workers:
+            worker.cancel()
+            # drop batches that are already queued for the gui thread
+            for signal in (worker.signals.projectsFound, worker.signals.finished, worker.signals.failed):
+                try:
+                    signal.disconnect()
+                except (RuntimeError, TypeError):
+                    pass
+        self.scanWorkers = []
+        if jobs:
+            self.jobWorkers = []
+        self.scanWorker = None
+        self.updateScanStatus()
+
+
+    def scanFinished(self, worker):
+        if worker in self.scanWorkers:
+            self.scanWorkers.remove(worker)
+        if worker is self.scanWorker:
+            self.scanWorker = None
+            self.updateScanStatus()
+
+
+    def scanFailed(self, error):
+        print(f"Quick Project scan failed:\n{error}")
+
+
+    def indexProject(self, projectName, filesDict):
+        self.pendingIndex[projectName] = filesDict
+        if not self.indexTimer.isActive():
+            self.indexTimer.start()
+
+
+    def indexPending(self, budget=0.02):
+        """
+        Moves queued project updates into the searchIndex, about budget seconds of them per
+        event loop pass (everything with budget None) so the panel stays responsive.
+        """
+        start = time.perf_counter()
+        while self.pendingIndex and (budget is None or time.perf_counter() - start < budget):
+            projectName = next(iter(self.pendingIndex))
+            self.searchIndex.updateProject(projectName, self.pendingIndex.pop(projectName))
+        if self.pendingIndex:
+            self.indexTimer.start()
+            return
+        self.indexTimer.stop()
+        if self.filter.result is not None:
+            self.filterTimer.start() # refilter once per burst of updates
+
+
+    def projectFilterChanged(self, text):
+        if not self.fillingFromTree:
+            self.projectFilter = text
+            self.applyFilter()
+
+
+    def fileFilterChanged(self, text):
+        if not self.fillingFromTree:
+            self.fileFilter = text
+            self.applyFilter()
+
+
+    def applyFilter(self):
+        """
+        Filters the tree with the search box plus whatever was typed into the project and
+        file name fields. Everything is answered from the in memory searchIndex.
+        """
+        if self.pendingIndex:
+            self.indexPending(budget=None) # a search has to see every project
+            self.filterTimer.stop() # filtering right here anyway
+        result = self.searchIndex.search(self.search.text(), self.projectFilter, self.fileFilter)
+        self.filter.setResult(result)
+        if result is not None and len(result.projects) <= 20:
+            self.files.expandToDepth(0)
+
+
+    def startWatcher(self):
+        """
+        Watches the project roots and project folders so versions saved by other artists show
+        up live. Only the changed projects are re-read. "watchMode" in the settings can be
+        "auto" (default), "poll" (for network shares that send no events) or "off".
+        """
+        self.stopWatcher()
+        mode = self.logic.settings.get("watchMode", "auto")
+        homeDirs = [root["path"] for root in self.logic.roots() if os.path.isdir(root["path"])]
+        if mode == "off" or not homeDirs:
+            return
+
+        pollSeconds = self.logic.settings.get("watchPollSeconds", 10)
+        self.watcher = projectWatcher(homeDirs, mode, pollSeconds=pollSeconds, parent=self,
+                                      folderOf=self.logic.projectFolder)
+        self.watcher.homeChanged.connect(self.homeDirChanged)
+        self.watcher.projectsChanged.connect(self.projectFoldersChanged)
+        self.watcher.watchProjects(self.model.projectNames())
+
+
+    def stopWatcher(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher.deleteLater()
+            self.watcher = None
+
+
+    def homeDirChanged(self):
+        # a project folder was added, removed or moved between roots
+        known = self.model.knownProjects()
+        self.startScan(lambda isCancelled: self.logic.iterProjectUpdates((), known, isCancelled))
+
+
+    def projectFoldersChanged(self, projectNames):
+        self.startScan(lambda isCancelled: self.logic.iterProjectUpdates(projectNames, None, isCancelled))
+
+
+    def closeEvent(self, event):
+        self.stopWatcher()
+        self.cancelScan(jobs=True)
+        super().closeEvent(event)
+
+
+    def reject(self):
+        self.stopWatcher()
+        self.cancelScan(jobs=True)
+        super().reject()
 
 
     def connector(self):
         self.save.clicked.connect(self.saveClicked)
-        self.load.clicked.connect(self.loadFile)
+        self.load.clicked.connect(lambda: self.loadFile())
         self.settingsCog.clicked.connect(self.settingsDiag)
-        self.files.itemClicked.connect(self.onTreeItemClicked)
-        self.files.itemDoubleClicked.connect(self.loadFile)
+        self.search.textChanged.connect(self.applyFilter)
+        self.projectNameChanged.connect(self.projectFilterChanged)
+        self.fileNameChanged.connect(self.fileFilterChanged)
+        self.files.clicked.connect(self.onTreeItemClicked)
+        self.files.doubleClicked.connect(self.onTreeItemDoubleClicked)
+        self.files.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
+        self.files.customContextMenuRequested.connect(self.treeContextMenu)
 
 
-    def onTreeItemClicked(self, item, column):
+    def onTreeItemClicked(self, index):
         """
         When a tree item is clicked, fill in the Project, File, and Version fields.
         Handles clicks on project, file, or version items correctly.
         """
-        parent = item.parent()
-        grandparent = parent.parent() if parent else None
+        node = self.filter.nodeFromIndex(index)
+        if node.kind == "more":
+            self.model.loadOlder(node)
+            return
+        self.syncRootChoice(node)
+        if node.kind == "group":
+            return
+        self.fillingFromTree = True # don't filter the tree down to what was clicked
+
+        self.showThumbnail(node)
 
         # Version item
-        if grandparent:
-            projectName = grandparent.text(0)
-            fileName = parent.text(0)
-            version = item.text(1)
-            self.projectName.setText(projectName)
-            self.fileName.setText(fileName)
-            self.version.setText(version)
+        if node.kind == "version":
+            self.projectName.setText(node.parent.parent.name)
+            self.fileName.setText(node.parent.name)
+            self.version.setText(node.name)
 
         # File item
-        elif parent:
-            projectName = parent.text(0)
-            fileName = item.text(0)
-            self.projectName.setText(projectName)
-            self.fileName.setText(fileName)
+        elif node.kind == "file":
+            self.projectName.setText(node.parent.name)
+            self.fileName.setText(node.name)
 
-            # Optional: clear version if a file is clicked
-            self.version.setText("N/A")
+            # the file row stands for its latest version
+            self.version.setText(self.model.latestText(node, 1) or "N/A")
 
         # Project item
-        else:
-            projectName = item.text(0)
-            self.projectName.setText(projectName)
+        elif node.kind == "project":
+            self.projectName.setText(node.name)
             self.fileName.setText("")
             self.version.setText("N/A")
 
+        self.fillingFromTree = False
+
+
+    def syncRootChoice(self, node):
+        # saving next to what was clicked, the root picker follows the tree
+        while node is not None and node.kind != "group":
+            node = node.parent
+        if node is not None:
+            self.rootChoice.setCurrentText(node.name)
+
+
+    def treeContextMenu(self, position):
+        index = self.files.indexAt(position)
+        node = self.filter.nodeFromIndex(index) if index.isValid() else None
+        while node is not None and node.kind != "project":
+            node = node.parent
+
+        menu = QtWidgets.QMenu(self)
+        if node is not None:
+            menu.addAction(f"Reconcile {node.name}", lambda: self.reconcile([node.name]))
+            if node.parent.kind == "group":
+                moveMenu = menu.addMenu(f"Move {node.name} To")
+                for root in self.logic.roots():
+                    if root["name"] != node.parent.name:
+                        moveMenu.addAction(root["name"], lambda rootName=root["name"]: self.moveProject(node.name, rootName))
+        menu.addAction("Reconcile All Projects", lambda: self.reconcile(None))
+        menu.exec_(self.files.viewport().mapToGlobal(position))
+
 
-    def loadFile(self):
+    def moveProject(self, project, rootName):
         """
-        Loads the currently selected .hip file in Houdini.
-        Only works if a version item is selected.
+        Moves a project to another root on the thread pool, a copy between volumes can take
+        a while. The tree moves the project's row once it is in its new root.
         """
-        selectedItems = self.files.selectedItems()
-        if not selectedItems:
-            hou.ui.displayMessage("No item selected.")
+        def scan(isCancelled):
+            self.logic.moveProject(project, rootName)
+            return self.logic.iterProjectUpdates([project], None, isCancelled)
+
+        worker = self.startJob(scan, f"Moving {project}…")
+        worker.signals.failed.connect(lambda error: hou.ui.displayMessage(
+            f"Couldn't move {project} to {rootName}.", severity=hou.severityType.Error, details=error))
+
+
+    def reconcile(self, projects):
+        """
+        Repairs project jsons from the hips on disk on the thread pool, then re-reads the
+        repaired projects into the tree and shows what changed.
+        """
+        report = {}
+
+        def scan(isCancelled):
+            for project, changes, data in self.logic.iterReconcile(projects, isCancelled=isCancelled):
+                if changes:
+                    report[project] = changes
+            return ()
+
+        worker = self.startJob(scan, "Reconciling…")
+        worker.signals.failed.connect(self.scanFailed)
+        worker.signals.finished.connect(lambda: self.reconcileFinished(report))
+
+
+    def reconcileFinished(self, report):
+        if not report:
+            hou.ui.displayMessage("Every project matches the files on disk.")
             return
 
-        item = selectedItems[0]
-        parent = item.parent()
-        grandparent = parent.parent() if parent else None
+        self.projectFoldersChanged(sorted(report))
+        lines = []
+        for project in sorted(report):
+            for change in report[project]:
+                lines.append(f"{project}/{change['file']}: {change['change']} "
+                             f"{change['before'] or '-'} -> {change['after'] or '-'}")
+        total = sum(len(changes) for changes in report.values())
+        hou.ui.displayMessage(f"Repaired {total} file(s) in {len(report)} project(s).", details="\n".join(lines))
+
 
-        if not grandparent:
+    def showThumbnail(self, node):
+        """
+        Shows the selected version's (or a file's latest) thumbnail if one was captured.
+        """
+        key = self.model.thumbnailKey(node)
+        path = self.model.thumbnails.get(key) if key else None
+        self.previewKey = key if path else None
+        if path is None:
+            self.preview.setVisible(False)
             return
+        loader = thumbnailLoader(key, path)
+        loader.signals.loaded.connect(self.thumbnailLoaded)
+        self.threadPool.start(loader)
+
 
-        # Extract hierarchy
-        projectName = grandparent.text(0)
-        fileName = parent.text(0)
-        version = item.text(1)
+    def thumbnailLoaded(self, key, image):
+        if key != self.previewKey or image.isNull():
+            return # the selection moved on while it loaded
+        pixmap = QtGui.QPixmap.fromImage(image)
+        self.preview.setPixmap(pixmap.scaledToHeight(self.preview.height(), QtCore.Qt.SmoothTransformation))
+        self.preview.setVisible(True)
+
+
+    def onTreeItemDoubleClicked(self, index):
+        # double clicking a file only expands it, the Load button opens its latest version
+        if self.filter.nodeFromIndex(index).kind == "version":
+            self.loadFile()
+
+
+    @traced("quickProject.loadFile", entry=True)
+    def loadFile(self, fast=False, skipWarnings=False, merge=False):
+        """
+        Loads the currently selected .hip file in Houdini. A file row loads its latest
+        version, so opening the latest needs no expanding.
+
+        Args:
+            fast (bool): open with the update mode on manual so the scene doesn't cook
+            skipWarnings (bool): don't stop on load warnings
+            merge (bool): only merge top level nodes picked from the version's metadata
+        """
+        index = self.files.currentIndex()
+        if not index.isValid():
+            hou.ui.displayMessage("No item selected.")
+            return
+
+        node = self.filter.nodeFromIndex(index)
+        if node.kind == "version":
+            projectName = node.parent.parent.name
+            fileName = node.parent.name
+            version = node.name
+        elif node.kind == "file":
+            projectName = node.parent.name
+            fileName = node.name
+            version = self.model.latestText(node, 1)
+        else:
+            return
 
         # Build file path
         hipFileName = f"{projectName}_{fileName}_{version}.hip"
-        hipFilePath = self.homeDir / projectName / hipFileName
+        hipFilePath = self.logic.projectFolder(projectName) / hipFileName
 
         # Check file existence
         if not hipFilePath.exists():
             hou.ui.displayMessage(f"Hip file not found:\n{hipFilePath}")
             return
 
+        mergePattern = None
+        if merge:
+            mergePattern = self.chooseMergeNodes(node)
+            if not mergePattern:
+                return
+
         # Load file
         try:
-            hou.hipFile.load(str(hipFilePath))
-            hou.ui.displayMessage(f"Loaded: {hipFilePath}")
+            seconds = self.logic.openHipFile(hipFilePath, fast, skipWarnings, mergePattern)
         except Exception as e:
             hou.ui.displayMessage(f"Failed to load file:\n{e}")
+            return
 
+        mode = "merge" if merge else "fast" if fast else "full"
+        try:
+            self.logic.recordLoadTime(projectName, fileName, version, mode, seconds)
+        except Exception as e:
+            print(f"Couldn't record load time for {hipFileName}: {e}")
+        message = f"{'Merged' if merge else 'Loaded'} {hipFileName} in {seconds:.1f}s"
+        if fast:
+            message += ", update mode is Manual (Load ▾ > Restore Update Mode)"
+        hou.ui.setStatusMessage(message) # no dialog, the artist wants to get working
 
+
+    def chooseMergeNodes(self, node):
+        """
+        Asks which top level nodes to merge, listed from the version's metadata when it was
+        collected, otherwise as a node pattern. Returns a hou.hipFile.merge pattern or None.
+        """
+        meta = self.model.versionMetadata(node) or {}
+        paths = [f"/{network}/{name}" for network, names in sorted(meta.get("networks", {}).items())
+                 for name in names]
+        if paths:
+            chosen = hou.ui.selectFromList(paths, message="Merge which nodes?", title="Merge Networks",
+                                           column_header="Node")
+            return " ".join(paths[i] for i in chosen) or None
+        button, pattern = hou.ui.readInput("Top level nodes to merge", buttons=("Merge", "Cancel"),
+                                           initial_contents="/obj/*", title="Merge Networks")
+        return pattern.strip() if button == 0 else None
+
+
+    @traced("quickProject.saveClicked", entry=True)
     def saveClicked(self):
         project = self.projectName.text()
         file = self.fileName.text()
+        if not self.logic.checkSaveInputs(project, file):
+            return
 
-        self.logic.initProjectJson(project)
-        self.logic.addFileToJson(project, file)
-        self.logic.incProjectVersion(project, file)
-
-        jsonDir = self.homeDir / project / f"{project}_Project.json"
+        # a new project goes into the picked root, an existing one stays where it is
+        root = self.rootChoice.currentText() if self.rootChoice.isVisible() else None
 
-        V = self.logic.loadProjectJson(jsonDir,("Files",f"{file}","version"))
+        # one read + one atomic write of the project json, returns the new version
+        V = self.logic.commitVersion(project, file, root)
         self.version.setText(V)
-        self.logic.saveHipFile(project, file, V)
+        self.logic.saveHipFile(project, file, V, root)
 
-        self.populateFileTree()
+        self.model.refreshProject(project)
 
 
     def settingsDiag(self):
-        settings = settingsPannel()
-        self.authorUser = "" # this var stores the output of the author feild in the settings pannel
-        self.filePathUser = "" #this var stores the output of the projects path of the settings pannel
-
-        def storeAuthor(authorText):
-            self.authorUser = authorText
-
-        def storeFilePath(filePathText):
-            self.filePathUser = filePathText
-
-        settings.authorChanged.connect(storeAuthor)
-        settings.filePathChanged.connect(storeFilePath)
-        settings.saveButton.clicked.connect(lambda: self.logic.updateJsonSettings("author",self.authorUser))
-        settings.saveButton.clicked.connect(lambda: self.logic.updateJsonSettings("homeDir", self.filePathUser))
+        # the pannel writes author/homeDir/roots through the shared settings store itself
+        settings = settingsPannel(self.logic.settings)
+
+        def rootsChanged():
+            self.fillRoots()
+            self.model.clear()
+            self.pendingIndex = {}
+            self.searchIndex.clear()
+            self.startWatcher()
+            self.populateFileTree()
+
+        settings.rootsChanged.connect(rootsChanged)
         settings.show()
-
-
-    def qssPathCorrector(self, key, stylesheet):
-        qssPath = Path(f"{hou.getenv('HOUDINI_USER_PREF_DIR')}/ALTools/python/{key}")
-        qssPathStr = qssPath.as_posix()
-        stylesheet = stylesheet.replace(f'{key}/', f'{qssPathStr}/')
-        return stylesheet 
\ No newline at end of file
+ 
\ No newline at end of file
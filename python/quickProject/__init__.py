@@ -1,3 +1,10 @@
-from .Ui import quickProjectUi
+# quickProjectUi needs hou and Qt, it is only imported when asked for so the storage
+# modules (logic helpers, projectJournal, projectIndex, ...) can be used from plain python
+__all__ = ["quickProjectUi"]
 
-__all__ = ["quickProjectUi"] 
\ No newline at end of file
+
+def __getattr__(name):
+    if name == "quickProjectUi":
+        from .Ui import quickProjectUi
+        return quickProjectUi
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,260 @@
+"""
+Command line access to quick projects, runs in plain python without Houdini or Qt.
+
+    python -m quickProject list [--files] [--roots] [--json]
+    python -m quickProject latest <project> <file> [--path]
+    python -m quickProject reindex [--full]
+    python -m quickProject verify [project ...]
+    python -m quickProject prune [project ...] [--dry-run]
+    python -m quickProject reconcile [project ...] [--dry-run] [--workers N] [--json]
+    python -m quickProject export [project ...] [-o out.json]
+    python -m quickProject metadata <project> [file] [--json]
+    python -m quickProject extract [project ...] [--workers N] [--hython path]
+    python -m quickProject move <project> <root>
+
+Run it with the ALTools python folder on PYTHONPATH. Settings come from
+$HOUDINI_USER_PREF_DIR/ALTools/Projects.json unless --prefs is given.
+"""
+import argparse
+import json
+import sys
+
+from .core import projectCore
+
+
+def printJson(data, stream=None):
+    json.dump(data, stream or sys.stdout, indent=4)
+    (stream or sys.stdout).write("\n")
+
+
+def cmdList(core, args):
+    if args.roots:
+        projectRoots = core.listProjectRoots()
+        if args.json:
+            printJson(projectRoots)
+        else:
+            for project in sorted(projectRoots):
+                print(f"{project:<32} {projectRoots[project]}")
+        return 0
+
+    if not args.files:
+        projects = core.listProjects()
+        if args.json:
+            printJson(projects)
+        else:
+            print("\n".join(projects))
+        return 0
+
+    listing = {project: core.projectFiles(project) for project in core.listProjects()}
+    if args.json:
+        printJson(listing)
+        return 0
+    for project, files in listing.items():
+        print(project)
+        for filename, fileData in sorted(files.items()):
+            print(f"    {filename:<24} {fileData.get('version', ''):<6} {fileData.get('modified', '')}")
+    return 0
+
+
+def cmdLatest(core, args):
+    latest = core.latestVersion(args.project, args.file)
+    if latest is None:
+        print(f"No versions of {args.file} in {args.project}", file=sys.stderr)
+        return 1
+    if args.path:
+        print(latest["path"])
+    elif args.json:
+        printJson(latest)
+    else:
+        print(f"v{latest['version']:03}")
+    return 0
+
+
+def cmdReindex(core, args):
+    from .projectIndex import getIndex
+    index = getIndex(core.indexPath)
+    imported = index.importFromJson(core.rootPaths(), onlyChanged=not args.full)
+    print(f"Indexed {len(imported)} project(s) into {core.indexPath}")
+    return 0
+
+
+def cmdVerify(core, args):
+    failed = 0
+    for project in args.projects or core.listProjects():
+        problems = core.verifyProject(project)
+        if problems:
+            failed += 1
+            print(project)
+            for problem in problems:
+                print(f"    {problem}")
+    if failed:
+        print(f"{failed} project(s) with problems", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cmdPrune(core, args):
+    totalBytes = 0
+    for project in args.projects or core.listProjects():
+        removed = core.pruneProject(project, dryRun=args.dry_run)
+        for filename, versionData in removed:
+            totalBytes += versionData["size"]
+            print(f"{'would remove' if args.dry_run else 'removed'} {project}/{versionData['name']}")
+    print(f"{totalBytes / 1024 ** 2:.1f} MB {'reclaimable' if args.dry_run else 'reclaimed'}")
+    return 0
+
+
+def cmdReconcile(core, args):
+    report = core.reconcileProjects(args.projects or None, dryRun=args.dry_run, workers=args.workers)
+    if args.json:
+        printJson(report)
+        return 0
+    for project in sorted(report):
+        print(project)
+        for change in report[project]:
+            before, after = change["before"] or "-", change["after"] or "-"
+            print(f"    {change['change']:<8} {change['file']}: {before} -> {after}")
+    total = sum(len(changes) for changes in report.values())
+    print(f"{total} change(s) in {len(report)} project(s){' (dry run)' if args.dry_run else ''}")
+    return 0
+
+
+def cmdMetadata(core, args):
+    from .hipMetadata import describe
+    metadata = core.projectMetadata(args.project)
+    if args.file:
+        metadata = {args.file: metadata.get(args.file, {})}
+    if args.json:
+        printJson(metadata)
+        return 0
+    for fileName in sorted(metadata):
+        for version in sorted(metadata[fileName]):
+            print(f"{args.project}_{fileName}_{version}")
+            for line in describe(metadata[fileName][version]).splitlines():
+                print(f"    {line}")
+    return 0
+
+
+def cmdExtract(core, args):
+    failed = []
+
+    def report(key, meta, error):
+        project, fileName, version = key
+        if error:
+            failed.append(key)
+            print(f"failed  {project}_{fileName}_{version}: {error}", file=sys.stderr)
+        else:
+            print(f"done    {project}_{fileName}_{version}")
+
+    try:
+        extracted = core.extractMetadata(args.projects or None, args.hython, args.workers, report)
+    except FileNotFoundError as e:
+        print(e, file=sys.stderr)
+        return 2
+    print(f"Extracted metadata for {extracted} version(s), {len(failed)} failed")
+    return 1 if failed else 0
+
+
+def cmdMove(core, args):
+    try:
+        folder = core.moveProject(args.project, args.root)
+    except (KeyError, OSError) as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"Moved {args.project} to {folder}")
+    return 0
+
+
+def cmdExport(core, args):
+    data = core.exportProjects(args.projects or None)
+    if args.output:
+        with open(args.output, "w") as file:
+            printJson(data, file)
+    else:
+        printJson(data)
+    return 0
+
+
+def buildParser():
+    parser = argparse.ArgumentParser(prog="quickProject", description="Quick project bookkeeping without Houdini.")
+    parser.add_argument("--prefs", help="Houdini user pref dir (default: $HOUDINI_USER_PREF_DIR)")
+    parser.add_argument("--home", help="projects folder to use instead of the roots in the settings")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("list", help="list projects")
+    command.add_argument("--files", action="store_true", help="include every project's files")
+    command.add_argument("--roots", action="store_true", help="show the root each project is in")
+    command.add_argument("--json", action="store_true")
+    command.set_defaults(run=cmdList)
+
+    command = commands.add_parser("latest", help="latest version of a file on disk")
+    command.add_argument("project")
+    command.add_argument("file")
+    command.add_argument("--path", action="store_true", help="print the hip path instead of the version")
+    command.add_argument("--json", action="store_true")
+    command.set_defaults(run=cmdLatest)
+
+    command = commands.add_parser("reindex", help="update the SQLite project index")
+    command.add_argument("--full", action="store_true", help="re-read every project, not just changed ones")
+    command.set_defaults(run=cmdReindex)
+
+    command = commands.add_parser("verify", help="check project jsons against the hips on disk")
+    command.add_argument("projects", nargs="*")
+    command.set_defaults(run=cmdVerify)
+
+    command = commands.add_parser("prune", help="apply retention policies")
+    command.add_argument("projects", nargs="*")
+    command.add_argument("--dry-run", action="store_true", help="only report what would be removed")
+    command.set_defaults(run=cmdPrune)
+
+    command = commands.add_parser("reconcile", help="repair project jsons from the hips on disk")
+    command.add_argument("projects", nargs="*")
+    command.add_argument("--dry-run", action="store_true", help="only report what would change")
+    command.add_argument("--workers", type=int, help="threads scanning project folders")
+    command.add_argument("--json", action="store_true")
+    command.set_defaults(run=cmdReconcile)
+
+    command = commands.add_parser("metadata", help="show what is inside a project's versions")
+    command.add_argument("project")
+    command.add_argument("file", nargs="?")
+    command.add_argument("--json", action="store_true")
+    command.set_defaults(run=cmdMetadata)
+
+    command = commands.add_parser("extract", help="collect metadata and referenced files of saved versions with hython")
+    command.add_argument("projects", nargs="*")
+    command.add_argument("--workers", type=int, default=2, help="hython processes to run at once")
+    command.add_argument("--hython", help="hython executable (default: from PATH or $HFS)")
+    command.set_defaults(run=cmdExtract)
+
+    command = commands.add_parser("move", help="move a project to another root")
+    command.add_argument("project")
+    command.add_argument("root", help="name of the root, see \"roots\" in the settings")
+    command.set_defaults(run=cmdMove)
+
+    command = commands.add_parser("export", help="dump projects, files and versions as JSON")
+    command.add_argument("projects", nargs="*")
+    command.add_argument("-o", "--output", help="write to this file instead of stdout")
+    command.set_defaults(run=cmdExport)
+    return parser
+
+
+def main(argv=None):
+    args = buildParser().parse_args(argv)
+    try:
+        core = projectCore(args.prefs, args.home)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    try:
+        return args.run(core, args)
+    except OSError as e:
+        print(f"quickProject {args.command}: {e}", file=sys.stderr)
+        return 1
+    except KeyError as e:
+        # no project folder set up / unknown root, str() of a KeyError would add quotes
+        print(f"quickProject {args.command}: {e.args[0] if e.args else e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
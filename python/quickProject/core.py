@@ -0,0 +1,916 @@
+from pathlib import Path
+import os
+import threading
+from .settingsStore import getStore, DEFAULT_SETTINGS
+from .jsonUtils import readJson, atomicWriteJson
+from .versionScan import scanProjectFolder, mergeFiles, addSizes
+from .scanSnapshot import scanSnapshot
+from .projectJournal import projectJournal, fileLock, readProject
+from ALToolsProfiler import traced
+
+
+
+class projectCore:
+    """
+    Everything quickProject knows about projects, files and versions, without hou or Qt.
+
+    quickProjectLogic adds saving and dialogs on top for Houdini, the CLI (cli.py) and
+    render node / cron scripts use this directly:
+
+        core = projectCore("/home/me/houdini21.0")
+        core.latestVersion("shot010", "fx")
+
+    Args:
+        prefDir (str | Path): Houdini user pref dir holding ALTools/Projects.json,
+            defaults to $HOUDINI_USER_PREF_DIR
+        homeDir (str | Path): Use only this projects folder instead of the roots in the settings
+    """
+
+    def __init__(self, prefDir=None, homeDir=None):
+        prefDir = prefDir or os.environ.get("HOUDINI_USER_PREF_DIR")
+        if not prefDir:
+            raise ValueError("No Houdini preferences folder given and HOUDINI_USER_PREF_DIR isn't set")
+        self.jsonPath = Path(prefDir) / "ALTools" / "Projects.json" # the ALTools folder is made by the first write
+        self.settings = getStore(self.jsonPath) # shared cached copy of Projects.json
+        self.indexPath = self.jsonPath.parent / "ProjectIndex.db"
+        self.snapshot = scanSnapshot(self.jsonPath.parent / "ScanSnapshot.json")
+        self.mirrorQueuePath = self.jsonPath.parent / "MirrorQueue.json"
+        self.thumbnailDir = self.jsonPath.parent / "Thumbnails"
+        self.homeOverride = os.fspath(homeDir) if homeDir else None
+        self._projectRoots = {} # project name -> root name, filled by every scan
+        self._projectRootsLock = threading.Lock()
+
+    def projectDir(self):
+        if self.homeOverride:
+            return self.homeOverride
+        return self.settings["homeDir"]
+
+    # -----------------------------------------------------------------
+    # Project roots
+    # -----------------------------------------------------------------
+
+    def roots(self):
+        """
+        The folders projects are kept in, highest priority (lowest number) first:
+
+            [{"name": "Home", "path": homeDir, "priority": 0}, *settings["roots"]]
+
+        homeDir is always the "Home" root and the default save target, "roots" in the
+        settings adds more, eg {"name": "Archive", "path": "//nas/archive", "priority": 5}.
+        When a project name exists in several roots the higher priority one is used.
+        """
+        if self.homeOverride:
+            return [{"name": "Home", "path": self.homeOverride, "priority": 0}]
+        roots = []
+        names = set()
+        home = self.settings.get("homeDir", "")
+        if home:
+            roots.append({"name": "Home", "path": home, "priority": 0})
+            names.add("Home")
+        for order, root in enumerate(self.settings.get("roots", [])):
+            path = root.get("path", "")
+            name = root.get("name") or os.path.basename(os.path.normpath(path))
+            if not path or name in names:
+                continue
+            names.add(name)
+            roots.append({"name": name, "path": path, "priority": root.get("priority", order + 1)})
+        roots.sort(key=lambda root: root["priority"]) # stable, so Home wins ties
+        return roots
+
+    def root(self, name=None):
+        """
+        The root called name, the default save root (the first one) when name is None.
+        """
+        roots = self.roots()
+        if not roots:
+            raise KeyError("No project folder set up, set homeDir in the settings")
+        for root in roots:
+            if name is None or root["name"] == name:
+                return root
+        raise KeyError(f"No project root called {name!r}")
+
+    def projectRoot(self, project):
+        """
+        The root project lives in, or None if it doesn't exist in any of them.
+        """
+        roots = self.roots()
+        with self._projectRootsLock:
+            known = self._projectRoots.get(project)
+        for root in roots:
+            if root["name"] == known and os.path.exists(os.path.join(root["path"], project, f"{project}_Project.json")):
+                return root
+        for root in roots:
+            if os.path.exists(os.path.join(root["path"], project, f"{project}_Project.json")):
+                self.rememberRoot(project, root["name"])
+                return root
+        return None
+
+    def rememberRoot(self, project, rootName):
+        with self._projectRootsLock:
+            self._projectRoots[project] = rootName
+
+    def projectFolder(self, project, root=None):
+        """
+        Folder of project. An existing project is found in whichever root holds it, a new
+        one goes into root (a root name) or the default root.
+        """
+        found = self.projectRoot(project)
+        if found is None:
+            found = self.root(root)
+        return Path(found["path"]) / project
+
+
+    def checkJsonExists(self):
+        return self.settings.ensureExists(DEFAULT_SETTINGS)
+        # print(f"Created new JSON file at: {self.jsonPath}")
+
+    def recordSavedVersion(self, project, file, version, filePath):
+        """
+        Bookkeeping after a hip was written to filePath: records its size / mtime in the
+        index, queues it for the mirror and, when a retention policy applies to the project,
+        lets the retention pruner look at it.
+        """
+        filePath = Path(filePath)
+        if not filePath.exists():
+            return
+
+        # === record size / mtime of the new version === #
+        index = self.projectIndex()
+        if index is not None:
+            stat = filePath.stat()
+            fileData = {"version": version, "author": self.settings["author"]}
+            index.recordVersion(project, file, fileData, filePath.parent, stat.st_size, stat.st_mtime)
+
+        # === hand the new version to the mirror, copied in the background === #
+        mirror = self.mirror()
+        if mirror is not None:
+            journal = projectJournal(filePath.parent, project)
+            paths = [filePath] + [path for path in (journal.snapshotPath, journal.journalPath) if path.exists()]
+            # other roots get their own folder in the mirror, Home stays at its top like before
+            root = self.projectRoot(project) or self.root()
+            mirrorDir = self.settings["mirrorDir"]
+            if root["name"] != "Home":
+                mirrorDir = os.path.join(mirrorDir, root["name"])
+            mirror.enqueue(paths, root["path"], mirrorDir)
+
+        # === keep a local copy, the next open of this version skips the network === #
+        cache = self.hipCache()
+        if cache is not None:
+            cache.put(filePath)
+
+        # === apply the retention policy to the project off the main thread, if it has one === #
+        if self.settings.get("retention") or self.retentionPolicy(project):
+            self.pruneInBackground([project])
+
+    def mirror(self):
+        """
+        Returns the session's mirrorQueue when a "mirrorDir" is set in the settings, otherwise None.
+        """
+        if not self.settings.get("mirrorDir", ""):
+            return None
+        from .mirrorQueue import getMirror # worker threads only when mirroring is on
+        return getMirror(self.mirrorQueuePath, self.settings.get("mirrorWorkers", 2))
+
+    def hipCache(self):
+        """
+        Returns the session's hipCache when a "hipCacheDir" is set in the settings, otherwise
+        None. Capped at "hipCacheMB".
+        """
+        cacheDir = self.settings.get("hipCacheDir", "")
+        if not cacheDir:
+            return None
+        from .hipCache import getHipCache
+        return getHipCache(cacheDir, self.settings.get("hipCacheMB", 4096) * 1024 ** 2)
+
+    def thumbnails(self):
+        """
+        Returns the session's thumbnailCache, capped at "thumbnailCacheMB" from the settings.
+        """
+        from .thumbnailCache import getThumbnails
+        return getThumbnails(self.thumbnailDir, self.settings.get("thumbnailCacheMB", 200) * 1024 ** 2)
+
+    def updateJsonSettings(self, setting, value):
+        if value == "":
+            # print("value was blank")
+            return
+
+        else:
+            self.settings.set(setting, value)
+
+    def timestamp(self):
+        from datetime import datetime
+        return datetime.now().strftime("%d-%m-%Y %H:%M:%S")
+
+    def projectJsonPath(self, project, root=None):
+        return self.projectFolder(project, root) / f"{project}_Project.json"
+
+    def newProjectStructure(self, project, author, now):
+        return {
+            "ProjectData": {
+                "project": f"{project}",  # Project name
+                "author": f"{author}",    # Project author
+                "created": f"{now}"       # Creation timestamp
+                },
+            "Files": {  # Empty files section to be populated later
+            }
+            }
+
+    def newFileStructure(self, author, now):
+        return {
+            "version": f"v{0:03}",
+            "author": f"{author}",
+            "created": f"{now}",
+            "modified": f"{now}"
+        }
+
+    @traced("quickProject.commitVersion")
+    def commitVersion(self, project, filename, root=None):
+        """
+        Create the project, add the file and increment its version as one transaction.
+
+        The whole read-modify-write happens under the project's lock file so two artists
+        saving into the same shared project can never be handed the same version.
+        With storageMode "json" the project JSON is rewritten with a single temp file +
+        atomic rename, with "journal" only a small record is appended to
+        <project>_Project.journal (see projectJournal).
+
+        Args:
+            project (str): The name of the project
+            filename (str): The hip file name inside the project
+            root (str): Name of the root a new project is created in, the default root when None
+
+        Returns:
+            str: The new version string (eg "v004") to pass to saveHipFile
+        """
+        now = self.timestamp()
+        author = self.settings["author"]
+        jsonDir = self.projectJsonPath(project, root)
+        journal = projectJournal(jsonDir.parent, project)
+
+        if self.settings.get("storageMode", "json") == "journal":
+            version = journal.commitVersion(filename, author, now)
+            fileData = {"version": version, "author": author, "modified": now}
+        else:
+            with fileLock(journal.lockPath):
+                data = journal.read() or self.newProjectStructure(project, author, now)
+
+                fileData = data.setdefault("Files", {}).setdefault(filename, self.newFileStructure(author, now))
+                vNum = int(fileData["version"].lstrip("v"))
+                fileData["version"] = f"v{vNum + 1:03}"
+                fileData["modified"] = f"{now}"
+
+                journal.write(data) # also folds in a journal left by journal mode users
+        # print(f"{filename} was updated to {fileData['version']}")
+
+        index = self.projectIndex()
+        if index is not None:
+            index.recordVersion(project, filename, fileData, jsonDir.parent)
+        return fileData["version"]
+
+    def initProjectJson(self, project):
+        """
+        Initialize a new project JSON file for tracking project metadata.
+        
+        Args:
+            project (str): The name of the project to initialize
+            
+        This function:
+        1. Gets the current timestamp for project creation date
+        2. Reads user settings from the main settings JSON file
+        3. Creates a new project-specific JSON file if it doesn't exist
+        4. Sets up initial project metadata including author and creation date
+        """
+
+        # Read user settings from the cached settings store
+        author = self.settings["author"]  # Get author from settings
+        jsonDir = self.projectJsonPath(project)  # Construct project JSON path
+
+        # Create new project JSON file if it doesn't exist
+        if not jsonDir.exists():
+            structure = self.newProjectStructure(project, author, self.timestamp())
+            # Write initial project structure to JSON file (creates the project directory too)
+            atomicWriteJson(jsonDir, structure)
+            # print(f"{project} was initilized at {jsonDir.parent}")
+        else:
+            # print(f"initProjectJson was skiped due to entry {project} already existing")
+            pass  # If project JSON already exists, do nothing
+
+    def addFileToJson(self, project, filename):
+        author = self.settings["author"]
+        jsonDir = self.projectJsonPath(project)
+
+        data = readJson(jsonDir)
+            
+        if filename not in data.get("Files",{}):
+            data["Files"][filename] = self.newFileStructure(author, self.timestamp())
+            atomicWriteJson(jsonDir, data)
+            # print(f"{filename} was initialized in {project} at {jsonDir.parent}")
+
+        else:
+            # print(f"addFileToJson was skiped due to entry {filename} already existing in {project}")
+            pass
+
+    def incProjectVersion(self, project, filename):
+        """
+        This function increments the version of the current file and updates the updated part to the current time
+        """
+
+        jsonDir = self.projectJsonPath(project)
+        data = readJson(jsonDir)
+
+        if filename not in data.get("Files",{}):
+            # print(f"{filename}, was not found in {project}")
+            return
+        else:
+            version = data["Files"][filename]["version"]
+            vNum = int(version.lstrip("v"))
+            newV = vNum + 1
+            data["Files"][filename]["version"] = f"v{newV:03}"
+            data["Files"][filename]["modified"] = f"{self.timestamp()}"
+            atomicWriteJson(jsonDir, data)
+            # print(f"{filename} was updated to v{newV:03}")
+
+    # -----------------------------------------------------------------
+    # Project index
+    # -----------------------------------------------------------------
+
+    def useIndex(self):
+        return self.settings.get("indexBackend", "json") == "sqlite"
+
+    def projectIndex(self):
+        """
+        Returns the SQLite projectIndex when "indexBackend" is set to "sqlite" in the settings,
+        otherwise None. A fresh index is filled from the existing project JSON files.
+        """
+        if not self.useIndex():
+            return None
+        from .projectIndex import getIndex # sqlite3 is only loaded when the index is used
+        index = getIndex(self.indexPath)
+        if index.isEmpty():
+            index.importFromJson(self.rootPaths())
+        return index
+
+    def rootPaths(self):
+        return [root["path"] for root in self.roots()]
+
+    def listProjectRoots(self):
+        """
+        Returns {projectName: rootName} for every project with a <project>_Project.json in
+        any of the roots. A name in several roots belongs to the highest priority one.
+        """
+        roots = [root for root in self.roots() if os.path.isdir(root["path"])]
+        if not roots:
+            return {}
+
+        projects = {}
+        index = self.projectIndex()
+        if index is not None:
+            index.importFromJson(self.rootPaths()) # only re-reads projects whose json changed
+            rootNames = {os.path.normcase(os.path.abspath(root["path"])): root["name"] for root in roots}
+            offline = {os.path.normcase(os.path.abspath(path)) for path in self.rootPaths()} - set(rootNames)
+            for projectName, path in index.projectPaths().items():
+                parent = os.path.normcase(os.path.abspath(os.path.dirname(path)))
+                if parent in offline:
+                    continue # kept in the index for when its root is back
+                projects[projectName] = rootNames.get(parent, roots[0]["name"])
+        else:
+            for root in roots:
+                with os.scandir(root["path"]) as entries:
+                    for entry in entries:
+                        if entry.name in projects or not entry.is_dir():
+                            continue
+                        if os.path.exists(os.path.join(entry.path, f"{entry.name}_Project.json")):
+                            projects[entry.name] = root["name"]
+
+        with self._projectRootsLock:
+            self._projectRoots.update(projects)
+        return projects
+
+    def listProjects(self):
+        """
+        Names of every project in the roots that has a <project>_Project.json.
+        """
+        return sorted(self.listProjectRoots())
+
+    def loadSnapshot(self):
+        """
+        Returns the projects recorded by the last scan ({name: {"root", "mtime", "Files"}}),
+        so the tree can be painted before anything on disk is touched.
+        """
+        projects = self.snapshot.load(self.rootPaths())
+        with self._projectRootsLock:
+            for projectName, entry in projects.items():
+                self._projectRoots.setdefault(projectName, entry.get("root"))
+        return projects
+
+    def iterProjects(self, isCancelled=None, snapshot=None):
+        """
+        Yields (projectName, filesDict) for every project in every root. Each root is listed
+        on its own thread, so a slow network root doesn't hold up the local ones, and the
+        projects are yielded in whatever order the roots find them. Never touches hou or Qt,
+        so it is safe to run from a worker thread. isCancelled is polled between projects.
+
+        When the snapshot from loadSnapshot() is passed, projects whose folder mtime still
+        matches it are skipped and projects that are gone are yielded as (projectName, None),
+        so only the changes need to be applied to a tree painted from the snapshot.
+        A finished scan is written back as the new snapshot.
+
+        A project found in a higher priority root after a lower priority one was yielded
+        is yielded again, rootName() then tells which root it ended up in.
+        """
+        import queue
+        roots = [root for root in self.roots() if os.path.isdir(root["path"])]
+        if not roots:
+            return
+        snapshot = snapshot or {}
+
+        index = self.projectIndex()
+        if index is not None:
+            index.importFromJson(self.rootPaths()) # unreachable roots keep their indexed projects
+
+        found = queue.Queue()
+        stopped = threading.Event() # set when the caller stops consuming
+
+        def cancelled():
+            return stopped.is_set() or (isCancelled is not None and isCancelled())
+
+        def scan(root):
+            try:
+                for projectName, entry, changed in self.scanRoot(root, snapshot, index, cancelled):
+                    found.put((root["name"], projectName, entry, changed))
+            except OSError as e:
+                print(f"Failed to scan {root['path']}: {e}")
+            finally:
+                found.put((root["name"], None, None, False))
+
+        for root in roots:
+            threading.Thread(target=scan, args=(root,), name=f"scan {root['name']}", daemon=True).start()
+
+        priority = {root["name"]: order for order, root in enumerate(roots)}
+        projects = {}
+        running = len(roots)
+        try:
+            while running:
+                rootName, projectName, entry, changed = found.get()
+                if projectName is None:
+                    running -= 1
+                    continue
+                current = projects.get(projectName)
+                if current is not None and priority[current["root"]] <= priority[rootName]:
+                    continue # the same name in a higher priority root wins
+                projects[projectName] = entry
+                self.rememberRoot(projectName, rootName)
+                if changed or current is not None:
+                    yield projectName, entry["Files"]
+        except BaseException:
+            stopped.set() # the caller stopped early, let the root threads wind down
+            raise
+
+        if cancelled():
+            return
+        for projectName in set(snapshot) - set(projects):
+            yield projectName, None
+        self.snapshot.save(self.rootPaths(), projects)
+
+    def scanRoot(self, root, snapshot, index, isCancelled):
+        """
+        One os.scandir of a root for iterProjects.
+
+        Yields:
+            (projectName, {"root", "mtime", "Files"}, changed) where changed is False when
+            the project came from the snapshot untouched
+        """
+        with os.scandir(root["path"]) as entries:
+            for entry in entries:
+                if isCancelled():
+                    return
+                try:
+                    if not entry.is_dir():
+                        continue
+                    mtime = entry.stat().st_mtime_ns
+                except OSError:
+                    continue
+
+                cached = snapshot.get(entry.name)
+                # a project moved to another root keeps its folder mtime, so the root must match too
+                if cached is not None and cached.get("mtime") == mtime and cached.get("root") == root["name"]:
+                    yield entry.name, cached, False # folder untouched since the last scan
+                    continue
+
+                if index is not None:
+                    if not os.path.exists(os.path.join(entry.path, f"{entry.name}_Project.json")):
+                        continue
+                    filesDict = index.projectFiles(entry.name)
+                else:
+                    try:
+                        data = readProject(entry.path, entry.name)
+                    except (OSError, ValueError) as e:
+                        print(f"Failed to read project {entry.name}: {e}")
+                        continue
+                    if data is None:
+                        continue
+                    # one listing of the folder for untracked hips and the disk usage columns
+                    versionMap = scanProjectFolder(entry.path, entry.name)
+                    filesDict = addSizes(mergeFiles(data.get("Files", {}), versionMap), versionMap)
+
+                yield entry.name, {"root": root["name"], "mtime": mtime, "Files": filesDict}, True
+
+    def iterProjectUpdates(self, projectNames=(), knownProjects=None, isCancelled=None):
+        """
+        Yields (projectName, filesDict) for each of projectNames, or (projectName, None) if
+        the project has gone. When knownProjects is given the roots are listed too and
+        projects that appeared or vanished since are reported as well. knownProjects can be
+        a {projectName: rootName} dict, then projects that moved to another root are reported too.
+        """
+        projectNames = set(projectNames)
+
+        if knownProjects is not None:
+            current = self.listProjectRoots() # also brings the index up to date
+            if isinstance(knownProjects, dict):
+                projectNames |= {name for name, rootName in knownProjects.items()
+                                 if name in current and current[name] != rootName}
+            knownProjects = set(knownProjects)
+            projectNames |= set(current) - knownProjects
+            projectNames |= knownProjects - set(current)
+        else:
+            index = self.projectIndex()
+            if index is not None:
+                index.importFromJson(self.rootPaths())
+
+        for projectName in sorted(projectNames):
+            if isCancelled and isCancelled():
+                return
+            if self.projectRoot(projectName) is None:
+                yield projectName, None
+            else:
+                yield projectName, self.projectFiles(projectName)
+
+    def rootName(self, project):
+        """
+        Name of the root project was last seen in by a scan, looked up on disk if no scan saw it yet.
+        """
+        with self._projectRootsLock:
+            rootName = self._projectRoots.get(project)
+        if rootName is None:
+            root = self.projectRoot(project)
+            rootName = root["name"] if root else None
+        return rootName
+
+    def moveProject(self, project, rootName):
+        """
+        Moves project into the root called rootName. Renamed in one step when both roots are
+        on the same volume, otherwise copied across next to the target, renamed into place
+        and then removed from the old root. The project lock is held throughout, so saves
+        wait for the move instead of landing in a half copied folder.
+
+        Returns:
+            Path: the project's new folder
+        """
+        import shutil
+        source = self.projectRoot(project)
+        if source is None:
+            raise FileNotFoundError(f"No project called {project} in any root")
+        target = self.root(rootName)
+        if source["name"] == target["name"]:
+            return Path(target["path"]) / project
+        sourceFolder = Path(source["path"]) / project
+        targetFolder = Path(target["path"]) / project
+        if targetFolder.exists():
+            raise FileExistsError(f"{targetFolder} already exists")
+        targetFolder.parent.mkdir(parents=True, exist_ok=True)
+
+        lockPath = projectJournal(sourceFolder, project).lockPath
+        with fileLock(lockPath):
+            try:
+                os.rename(sourceFolder, targetFolder)
+                renamed = True
+            except OSError:
+                renamed = False # other volume, or Windows refusing while the lock file is open
+
+            if not renamed:
+                staging = targetFolder.with_name(f".{project}.moving") # never picked up as a project
+                shutil.rmtree(staging, ignore_errors=True)
+                try:
+                    shutil.copytree(sourceFolder, staging, ignore=shutil.ignore_patterns(lockPath.name))
+                    os.rename(staging, targetFolder)
+                except OSError:
+                    shutil.rmtree(staging, ignore_errors=True)
+                    raise
+                with os.scandir(sourceFolder) as entries:
+                    for entry in entries:
+                        if entry.name == lockPath.name:
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            shutil.rmtree(entry.path)
+                        else:
+                            os.remove(entry.path)
+        if not renamed:
+            shutil.rmtree(sourceFolder, ignore_errors=True)
+
+        self.rememberRoot(project, target["name"])
+        index = self.projectIndex()
+        if index is not None:
+            index.importProject(targetFolder)
+        return targetFolder
+
+    def projectFiles(self, project):
+        """
+        Returns the "Files" section of a project ({filename: {version, author, created, modified}}).
+        """
+        index = self.projectIndex()
+        if index is not None:
+            return index.projectFiles(project)
+        try:
+            data = readProject(self.projectJsonPath(project).parent, project)
+            return data.get("Files", {}) if data else {}
+        except (OSError, ValueError) as e:
+            print(f"Failed to read project {project}: {e}")
+            return {}
+
+    def projectVersionMap(self, project):
+        """
+        One os.scandir of the project folder parsed into
+        {fileName: {version: {"version", "mtime", "size"}}}, including hips the JSON doesn't know about.
+        """
+        return scanProjectFolder(self.projectFolder(project), project)
+
+    def projectVersions(self, project, filename, versionMap=None):
+        """
+        Returns the versions of a file that exist on disk as
+        [{"version": int, "size": int, "mtime": float}] sorted oldest first.
+        Pass a versionMap from projectVersionMap to avoid listing the folder again.
+        """
+        if versionMap is None:
+            versionMap = self.projectVersionMap(project)
+        versions = versionMap.get(filename, {})
+        return [versions[v] for v in sorted(versions)]
+
+    def latestVersion(self, project, filename):
+        """
+        Returns the newest version of a file that exists on disk as
+        {"version": int, "size": int, "mtime": float, "path": str}, or None.
+        """
+        versions = self.projectVersions(project, filename)
+        if not versions:
+            return None
+        latest = dict(versions[-1])
+        latest["path"] = os.path.join(self.projectFolder(project), latest.pop("name"))
+        return latest
+
+    def verifyProject(self, project):
+        """
+        Checks a project's document against its folder.
+
+        Returns:
+            list: problem descriptions, empty when everything matches
+        """
+        folder = self.projectFolder(project)
+        problems = []
+        try:
+            data = readProject(folder, project)
+        except (OSError, ValueError) as e:
+            return [f"unreadable project json: {e}"]
+        if data is None:
+            return ["no project json"]
+
+        versionMap = scanProjectFolder(folder, project)
+        for filename, fileData in sorted(data.get("Files", {}).items()):
+            try:
+                version = int(str(fileData.get("version", "v000")).lstrip("v") or 0)
+            except ValueError:
+                problems.append(f"{filename}: bad version {fileData.get('version')!r}")
+                continue
+            onDisk = versionMap.get(filename, {})
+            if version and version not in onDisk:
+                problems.append(f"{filename}: v{version:03} is in the json but not on disk")
+            newer = [v for v in onDisk if v > version]
+            if newer:
+                problems.append(f"{filename}: v{max(newer):03} on disk is newer than the json's v{version:03}")
+        for filename in sorted(set(versionMap) - set(data.get("Files", {}))):
+            problems.append(f"{filename}: {len(versionMap[filename])} untracked version(s) on disk")
+        return problems
+
+    def exportProjects(self, projects=None):
+        """
+        Every project (or just projects) with its files and on disk versions, as plain
+        JSON-able data: {project: {"ProjectData": {...}, "Files": {file: {..., "versions": [...]}}}}
+        """
+        exported = {}
+        for project in projects or self.listProjects():
+            data = readProject(self.projectFolder(project), project)
+            if data is None:
+                continue
+            versionMap = self.projectVersionMap(project)
+            files = {}
+            for filename, fileData in mergeFiles(data.get("Files", {}), versionMap).items():
+                versions = versionMap.get(filename, {})
+                files[filename] = dict(fileData, versions=[versions[v] for v in sorted(versions)])
+            exported[project] = {"ProjectData": data.get("ProjectData", {}), "Files": files}
+        return exported
+
+    def iterReconcile(self, projects=None, dryRun=False, workers=None, isCancelled=None):
+        """
+        Rebuilds the Files / version / modified entries of projects (every project when None)
+        from the hip files on disk, on a thread pool. Safe while others save, see reconcile.py.
+
+        Yields:
+            (projectName, changes, data) as each project finishes, changes is
+            [{"file", "change", "before", "after"}, ...] and empty when nothing was wrong
+        """
+        from .reconcile import iterReconcile
+        if projects is None:
+            projects = self.listProjects()
+        index = None if dryRun else self.projectIndex()
+        author = self.settings.get("author", "")
+        folders = [(project, self.projectFolder(project)) for project in projects]
+        for project, changes, data in iterReconcile(folders, author, dryRun, workers, isCancelled):
+            if changes and index is not None:
+                index.importProject(self.projectFolder(project), data)
+            yield project, changes, data
+
+    def reconcileProjects(self, projects=None, dryRun=False, workers=None):
+        """
+        Runs iterReconcile to the end.
+
+        Returns:
+            dict: {projectName: changes} for the projects that were (or would be) repaired
+        """
+        return {project: changes for project, changes, data
+                in self.iterReconcile(projects, dryRun, workers) if changes}
+
+    # -----------------------------------------------------------------
+    # Hip metadata
+    # -----------------------------------------------------------------
+
+    def recordMetadata(self, project, entries, replace=False):
+        """
+        Stores hip metadata [(fileName, version, metadata), ...] of one project in its
+        <project>_Metadata.json and the index. Fields are merged into what the versions
+        already have unless replace is set.
+        """
+        from .hipMetadata import writeMetadata
+        folder = self.projectFolder(project)
+        merged = writeMetadata(folder, project, entries, replace)
+        index = self.projectIndex()
+        if index is not None:
+            for fileName, version, meta in entries:
+                if isinstance(version, int):
+                    version = f"v{version:03}"
+                index.recordMetadata(project, fileName, version, merged[fileName][version], folder)
+
+    def recordLoadTime(self, project, fileName, version, mode, seconds):
+        """
+        Remembers how long a version took to open, per load mode ("full", "fast", "merge").
+        """
+        meta = self.projectMetadata(project).get(fileName, {}).get(version, {})
+        loadSeconds = dict(meta.get("loadSeconds", {}), **{mode: round(seconds, 2)})
+        self.recordMetadata(project, [(fileName, version, {"loadSeconds": loadSeconds})])
+
+    def projectMetadata(self, project):
+        """
+        Returns {fileName: {"vNNN": metadata}} of a project.
+        """
+        from .hipMetadata import readMetadata
+        return readMetadata(self.projectFolder(project), project)
+
+    def missingMetadata(self, projects=None):
+        """
+        Versions on disk without metadata yet, or without the file references that only
+        the batch extractor collects (a save records the rest).
+
+        Returns:
+            list: [((project, fileName, "vNNN"), hipPath), ...] newest versions first
+        """
+        missing = []
+        for project in projects or self.listProjects():
+            known = self.projectMetadata(project)
+            folder = self.projectFolder(project)
+            for fileName, versions in self.projectVersionMap(project).items():
+                for version, versionData in versions.items():
+                    key = f"v{version:03}"
+                    if "references" not in known.get(fileName, {}).get(key, {}):
+                        missing.append(((project, fileName, key), str(folder / versionData["name"]), versionData["mtime"]))
+        missing.sort(key=lambda job: job[2], reverse=True)
+        return [(key, path) for key, path, mtime in missing]
+
+    def extractMetadata(self, projects=None, hython=None, workers=2, onResult=None, isCancelled=None):
+        """
+        Fills in metadata for versions saved before it was collected (or outside quickProject)
+        by loading them in parallel hython processes, see hipMetadata.extractMetadata.
+        Results are written as they arrive so an interrupted run keeps what it did.
+
+        Returns:
+            int: number of versions extracted
+        """
+        from .hipMetadata import extractMetadata
+        writeLock = threading.Lock()
+
+        def store(key, meta, error):
+            project, fileName, version = key
+            if meta is not None:
+                with writeLock: # one writer, the index connection is shared
+                    self.recordMetadata(project, [(fileName, version, meta)])
+            if onResult is not None:
+                onResult(key, meta, error)
+
+        return extractMetadata(self.missingMetadata(projects), hython, workers, store, isCancelled)
+
+    # -----------------------------------------------------------------
+    # Retention
+    # -----------------------------------------------------------------
+
+    def retentionPolicy(self, project, data=None):
+        """
+        The policy that applies to project, see retention.effectivePolicy.
+        """
+        from .retention import effectivePolicy
+        if data is None:
+            data = readProject(self.projectFolder(project), project)
+        return effectivePolicy(data, self.settings.get("retention", {}))
+
+    def tagVersion(self, project, filename, version, tagged=True):
+        """
+        Tags a version so "keepTagged" retention never removes it.
+        """
+        journal = projectJournal(self.projectFolder(project), project)
+        if self.settings.get("storageMode", "json") == "journal":
+            journal.tagVersion(filename, version, tagged)
+            return
+        with fileLock(journal.lockPath):
+            data = journal.read()
+            if data is None or filename not in data.get("Files", {}):
+                return
+            fileData = data["Files"][filename]
+            versions = set(fileData.get("tagged", []))
+            if tagged:
+                versions.add(int(version))
+            else:
+                versions.discard(int(version))
+            fileData["tagged"] = sorted(versions)
+            journal.write(data)
+
+    def pruneProject(self, project, dryRun=False):
+        """
+        Removes the versions of project its retention policy doesn't keep and drops them
+        from the index. Holds the project lock so it can't race a save or a tag.
+
+        Returns:
+            list: [(fileName, versionDict), ...] that were (or with dryRun would be) removed
+        """
+        from .retention import pruneFolder
+        folder = self.projectFolder(project)
+        journal = projectJournal(folder, project)
+        with fileLock(journal.lockPath):
+            data = journal.read()
+            if data is None:
+                return []
+            removed = pruneFolder(folder, project, data, self.retentionPolicy(project, data), dryRun)
+
+        index = self.projectIndex()
+        if index is not None and removed and not dryRun:
+            byFile = {}
+            for fileName, versionData in removed:
+                byFile.setdefault(fileName, []).append(versionData["version"])
+            for fileName, versions in byFile.items():
+                index.removeVersions(project, fileName, versions)
+        return removed
+
+    def pruneInBackground(self, projects=None):
+        """
+        Queues projects (every project when None) for the background retention pruner.
+        Does nothing when no retention is configured globally and projects is None.
+        """
+        if projects is None:
+            if not self.settings.get("retention"):
+                return None
+            projects = self.listProjects()
+        from .retention import getPruner
+        return getPruner().start(projects, self.pruneProject)
+
+    def loadSettingsJson(self, setting):
+        # print(self.settings[setting])
+        return self.settings[setting]
+
+
+    def readProjectValue(self, projectpath, keys):
+        """
+        Returns a value from a project document (journal replayed), following keys
+        (a key or a sequence of keys) through nested dictionaries.
+
+        Raises:
+            FileNotFoundError: The project doesn't exist
+            KeyError: A key wasn't found
+        """
+        projectpath = Path(projectpath)
+        data = readProject(projectpath.parent, projectpath.name[:-len("_Project.json")])
+        if data is None:
+            raise FileNotFoundError(f"Project file not found: {projectpath}")
+
+        if isinstance(keys, str):
+            keys = (keys,)
+        current = data
+        for key in keys:
+            if not isinstance(current, dict) or key not in current:
+                raise KeyError(f"Key '{key}' not found while traversing {projectpath}")
+            current = current[key]
+        return current
@@ -0,0 +1,568 @@
+try:
+    from PySide2 import QtCore
+except Exception:
+    from PySide6 import QtCore
+
+from .versionScan import mergeFiles, addSizes
+from .hipMetadata import describe
+
+
+class treeNode:
+    """
+    One row of the quick project tree. kind is "root", "group" (a project root, only when
+    there are several), "project", "file", "version" or "more" (the "load older…" row
+    closing a file's page of versions). Children of projects and files are only filled in
+    when the row is expanded. Every node keeps its row under its parent, so only change
+    children through addChildren / insertChild / popChild.
+    """
+
+    def __init__(self, kind, name, parent=None, data=None):
+        self.kind = kind
+        self.name = name
+        self.parent = parent
+        self.data = data if data is not None else {}
+        self.children = []
+        self.fetched = kind in ("group", "version", "more")
+        self.limit = None # versions shown under a file, grows a page per "load older…"
+        self.rowNumber = 0
+
+    def row(self):
+        return self.rowNumber if self.parent is not None else 0
+
+    def addChildren(self, nodes):
+        for node in nodes:
+            node.parent = self
+            node.rowNumber = len(self.children)
+            self.children.append(node)
+
+    def insertChild(self, row, node):
+        node.parent = self
+        self.children.insert(row, node)
+        self.renumber(row)
+
+    def popChild(self, row):
+        node = self.children.pop(row)
+        self.renumber(row)
+        return node
+
+    def renumber(self, start=0):
+        for row in range(start, len(self.children)):
+            self.children[row].rowNumber = row
+
+    def child(self, name):
+        for node in self.children:
+            if node.name == name:
+                return node
+        return None
+
+    def project(self):
+        node = self
+        while node is not None and node.kind != "project":
+            node = node.parent
+        return node
+
+
+class fileTreeModel(QtCore.QAbstractItemModel):
+    """
+    Lazy item model for the quick project browser.
+
+    Only the project list is read up front. A project's file list is read the first time
+    it is expanded (fetchMore) and a file's versions (with their stat data) the first
+    time the file is expanded, so opening the panel costs about one folder listing.
+
+    Files only get rows for their newest pageSize versions, newest first, followed by a
+    "load older…" row that adds the next page. File rows show their latest version and
+    its date, so the rows (and their memory / paint cost) stay bounded however long a shot runs.
+
+    With more than one project root every root gets a top level group row, in priority
+    order, and its projects go below it.
+    """
+
+    headers = ["Project", "Version", "Modified", "Size", "Frames", "Nodes"]
+
+    projectUpdated = QtCore.Signal(str, object) # projectName, filesDict (None when removed)
+
+    def __init__(self, logic, icons=None, parent=None, pageSize=10):
+        super().__init__(parent)
+        self.logic = logic
+        self.icons = icons or {}
+        self.pageSize = max(1, int(pageSize))
+        self.thumbnails = None # the logic's thumbnailCache, fetched on the first tooltip
+        self.root = treeNode("root", "")
+        self.root.fetched = True
+        self.groups = {} # root name -> group node, empty with a single root
+
+    # -----------------------------------------------------------------
+    # Qt model interface
+    # -----------------------------------------------------------------
+
+    def nodeFromIndex(self, index):
+        if index.isValid():
+            return index.internalPointer()
+        return self.root
+
+    def indexFromNode(self, node, column=0):
+        if node is self.root or node is None:
+            return QtCore.QModelIndex()
+        return self.createIndex(node.row(), column, node)
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        parentNode = self.nodeFromIndex(parent)
+        if 0 <= row < len(parentNode.children) and 0 <= column < len(self.headers):
+            return self.createIndex(row, column, parentNode.children[row])
+        return QtCore.QModelIndex()
+
+    def parent(self, index):
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        node = index.internalPointer()
+        return self.indexFromNode(node.parent)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid() and parent.column() != 0:
+            return 0
+        return len(self.nodeFromIndex(parent).children)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return len(self.headers)
+
+    def hasChildren(self, parent=QtCore.QModelIndex()):
+        node = self.nodeFromIndex(parent)
+        if node.kind in ("version", "more"):
+            return False
+        if not node.fetched:
+            return True # unknown until expanded, show the arrow
+        return len(node.children) > 0
+
+    def canFetchMore(self, parent):
+        return not self.nodeFromIndex(parent).fetched
+
+    def fetchMore(self, parent):
+        node = self.nodeFromIndex(parent)
+        if node.fetched:
+            return
+        node.fetched = True
+
+        children = self.loadChildren(node)
+        if not children:
+            return
+        self.beginInsertRows(parent, 0, len(children) - 1)
+        node.addChildren(children)
+        self.endInsertRows()
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        column = index.column()
+
+        if role == QtCore.Qt.DisplayRole:
+            return self.displayText(node, column)
+        if role == QtCore.Qt.DecorationRole and column == 0:
+            return self.icons.get(node.kind)
+        if role == QtCore.Qt.ToolTipRole:
+            if node.kind == "group":
+                return node.data.get("path")
+            return self.toolTip(node)
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+
+    # -----------------------------------------------------------------
+    # Loading
+    # -----------------------------------------------------------------
+
+    def displayText(self, node, column):
+        if node.kind == "version":
+            if column == 0:
+                return node.parent.name
+            if column == 1:
+                return node.name
+            if column == 2:
+                return self.formatTime(node.data.get("mtime"))
+            if column == 3:
+                return self.formatSize(node.data.get("size"))
+            return self.metadataText(self.versionMetadata(node), column)
+        if node.kind == "more":
+            if column == 0:
+                return f"Load older… ({node.data.get('remaining', 0)} more)"
+            return None
+        if node.kind == "file" and column in (1, 2):
+            return self.latestText(node, column)
+        if node.kind == "file" and column in (4, 5):
+            return self.metadataText(self.versionMetadata(node), column)
+        if column == 0:
+            return node.name
+        if column == 3 and node.kind != "group":
+            return self.formatSize(self.nodeSize(node))
+        return None
+
+    def nodeSize(self, node):
+        """
+        Bytes used on disk by a file (all versions) or a project (all files), from the sizes
+        the scan already collected. Project totals are cached until its Files change.
+        """
+        if node.kind == "file":
+            return node.data.get("size")
+        if node.kind != "project":
+            return None
+        filesDict = node.data.get("Files")
+        if filesDict is None:
+            return None
+        cached = node.data.get("sizeOf")
+        if cached is None or cached[0] is not filesDict:
+            sizes = [fileData["size"] for fileData in filesDict.values() if "size" in fileData]
+            cached = (filesDict, sum(sizes) if sizes else None)
+            node.data["sizeOf"] = cached
+        return cached[1]
+
+    def latestText(self, node, column):
+        """
+        Version / Modified of a file row: the newest version on disk when the scan saw it,
+        otherwise what the project JSON says.
+        """
+        latest = node.data.get("latest")
+        if column == 1:
+            return f"v{latest:03}" if latest is not None else node.data.get("version", "")
+        if node.data.get("latestMtime") is not None:
+            return self.formatTime(node.data["latestMtime"])
+        return node.data.get("modified", "")
+
+    def versionMetadata(self, node):
+        """
+        Hip metadata of a version row, or of the latest version for a file row. Read with
+        the project's files when it is expanded, None if none was collected.
+        """
+        if node.kind == "version":
+            fileNode, version = node.parent, node.name
+        elif node.kind == "file":
+            fileNode, version = node, self.latestText(node, 1)
+        else:
+            return None
+        metadata = fileNode.parent.data.get("Metadata") or {}
+        return metadata.get(fileNode.name, {}).get(version)
+
+    def metadataText(self, meta, column):
+        if not meta:
+            return None
+        if column == 4 and meta.get("frameRange"):
+            start, end = meta["frameRange"]
+            return f"{start:g}-{end:g}"
+        if column == 5:
+            return meta.get("nodes")
+        return None
+
+    def toolTip(self, node):
+        """
+        Thumbnail and metadata summary of a version (or a file's latest), as rich text.
+        """
+        parts = []
+        path = self.thumbnailPath(node)
+        if path:
+            parts.append(f'<img src="{path}">')
+        summary = describe(self.versionMetadata(node))
+        if summary:
+            import html
+            parts.append(f"<pre>{html.escape(summary)}</pre>")
+        return "<br>".join(parts) or None
+
+    def thumbnailKey(self, node):
+        """
+        Thumbnail cache key of a version row, or of the latest version for a file row.
+        """
+        if self.thumbnails is None:
+            self.thumbnails = self.logic.thumbnails()
+        if node.kind == "version":
+            return self.thumbnails.key(node.parent.parent.name, node.parent.name, node.name)
+        if node.kind == "file":
+            version = self.latestText(node, 1)
+            if version:
+                return self.thumbnails.key(node.parent.name, node.name, version)
+        return None
+
+    def thumbnailPath(self, node):
+        key = self.thumbnailKey(node)
+        return self.thumbnails.get(key, touch=False) if key else None
+
+    def formatSize(self, size):
+        if size is None:
+            return ""
+        for unit in ("B", "KB", "MB", "GB"):
+            if size < 1024 or unit == "GB":
+                return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+            size /= 1024
+
+    def formatTime(self, mtime):
+        if mtime is None:
+            return "N/A"
+        return QtCore.QDateTime.fromSecsSinceEpoch(int(mtime)).toString("HH:mm:ss dd/MM/yyyy")
+
+    def loadChildren(self, node):
+        if node.kind == "project":
+            # files streamed in by the background scan, otherwise read them now
+            filesDict = node.data.get("Files")
+            if filesDict is None:
+                filesDict = self.logic.projectFiles(node.name)
+                node.data["Files"] = filesDict
+                self.projectUpdated.emit(node.name, filesDict)
+
+            # one listing of the project folder serves every file below it
+            versionMap = self.logic.projectVersionMap(node.name)
+            node.data["Versions"] = versionMap
+            node.data["Metadata"] = self.logic.projectMetadata(node.name)
+
+            filesDict = addSizes(mergeFiles(filesDict, versionMap), versionMap)
+            node.data["Files"] = filesDict # sized, so the project's Size column is filled in too
+            return [treeNode("file", fileName, node, fileData)
+                    for fileName, fileData in sorted(filesDict.items())]
+
+        if node.kind == "file":
+            versionMap = node.parent.data.get("Versions")
+            versions = self.logic.projectVersions(node.parent.name, node.name, versionMap)
+            limit = node.limit or self.pageSize
+            page = versions[::-1][:limit] # newest first
+            children = [treeNode("version", f"v{versionData['version']:03}", node, versionData)
+                        for versionData in page]
+            if len(versions) > limit:
+                children.append(treeNode("more", "more", node, {"remaining": len(versions) - limit}))
+            return children
+        return []
+
+    def loadOlder(self, moreNode):
+        """
+        Shows the next page of versions of the file a "load older…" row belongs to.
+        """
+        fileNode = moreNode.parent
+        fileNode.limit = (fileNode.limit or self.pageSize) + self.pageSize
+        self.refreshNode(fileNode)
+
+    def reload(self):
+        """
+        Throws everything away and lists the projects again, children load on expand.
+        """
+        self.beginResetModel()
+        self.resetGroups()
+        for projectName, rootName in sorted(self.logic.listProjectRoots().items()):
+            parentNode = self.projectParent(rootName)
+            parentNode.addChildren([treeNode("project", projectName, parentNode)])
+        self.endResetModel()
+
+    def clear(self):
+        self.beginResetModel()
+        self.resetGroups()
+        self.endResetModel()
+
+    def resetGroups(self):
+        """
+        Empties the tree down to a group row per root (none with a single root), rows are
+        only touched directly so call inside begin/endResetModel.
+        """
+        roots = self.logic.roots()
+        self.root.children = []
+        self.groups = {}
+        if len(roots) > 1:
+            for order, root in enumerate(roots):
+                group = treeNode("group", root["name"], self.root, {"order": order, "path": root["path"]})
+                self.root.addChildren([group])
+                self.groups[root["name"]] = group
+
+    def projectParent(self, rootName):
+        """
+        The node projects of rootName go under: its group, or the tree root with a single root.
+        """
+        if not self.groups:
+            return self.root
+        return self.groups.get(rootName) or self.root.children[0]
+
+    def projectNodes(self):
+        if not self.groups:
+            return list(self.root.children)
+        return [node for group in self.root.children for node in group.children]
+
+    def projectNode(self, projectName):
+        if not self.groups:
+            return self.root.child(projectName)
+        for group in self.root.children:
+            node = group.child(projectName)
+            if node is not None:
+                return node
+        return None
+
+    def isEmpty(self):
+        return not self.projectNodes()
+
+    def refresh(self):
+        """
+        Incrementally syncs the tree with disk, keeping existing rows (and so their
+        expanded state). New projects are added, and anything already expanded is
+        re-read so new files and versions show up.
+        """
+        if self.isEmpty():
+            self.reload()
+            return
+
+        existing = set(self.projectNames())
+        for projectName, rootName in self.logic.listProjectRoots().items():
+            if projectName not in existing:
+                self.insertChild(self.projectParent(rootName), treeNode("project", projectName))
+
+        for projectNode in self.projectNodes():
+            projectNode.data.pop("Files", None)
+            self.refreshNode(projectNode)
+
+    def refreshProject(self, projectName):
+        projectNode = self.projectNode(projectName)
+        if projectNode is None:
+            self.insertChild(self.projectParent(self.logic.rootName(projectName)), treeNode("project", projectName))
+        else:
+            projectNode.data.pop("Files", None)
+            self.refreshNode(projectNode)
+
+    def mergeProjects(self, projects):
+        """
+        Adds, updates or removes (filesDict is None) a batch of (projectName, filesDict)
+        streamed from a background scan. Only the affected rows are touched, a project
+        that turned up in another root moves to that root's group.
+        """
+        if self.isEmpty():
+            # first batch into an empty tree, one reset instead of a row insert per project
+            self.beginResetModel()
+            self.resetGroups()
+            for projectName, filesDict in sorted(projects, key=lambda project: project[0]):
+                if filesDict is not None:
+                    parentNode = self.projectParent(self.logic.rootName(projectName))
+                    parentNode.addChildren([treeNode("project", projectName, parentNode, {"Files": filesDict})])
+            self.endResetModel()
+            for projectName, filesDict in projects:
+                self.projectUpdated.emit(projectName, filesDict)
+            return
+
+        for projectName, filesDict in projects:
+            self.projectUpdated.emit(projectName, filesDict)
+            projectNode = self.projectNode(projectName)
+            if filesDict is None:
+                if projectNode is not None:
+                    self.removeChild(projectNode)
+                continue
+            parentNode = self.projectParent(self.logic.rootName(projectName))
+            if projectNode is not None and projectNode.parent is not parentNode:
+                self.removeChild(projectNode)
+                projectNode = None
+            if projectNode is None:
+                self.insertChild(parentNode, treeNode("project", projectName, parentNode, {"Files": filesDict}))
+            else:
+                projectNode.data["Files"] = filesDict
+                self.dataChanged.emit(self.indexFromNode(projectNode, 0),
+                                      self.indexFromNode(projectNode, len(self.headers) - 1))
+                self.refreshNode(projectNode)
+
+    def refreshNode(self, node):
+        """
+        Re-reads an already fetched project or file node and applies the difference:
+        new rows are inserted, changed rows updated and rows that are gone removed.
+        """
+        if not node.fetched:
+            return
+        children = self.loadChildren(node)
+
+        names = {child.name for child in children}
+        for existingChild in [child for child in node.children if child.name not in names]:
+            self.removeChild(existingChild)
+
+        for child in children:
+            existingChild = node.child(child.name)
+            if existingChild is None:
+                self.insertChild(node, child)
+            else:
+                existingChild.data = child.data
+                self.dataChanged.emit(self.indexFromNode(existingChild, 0),
+                                      self.indexFromNode(existingChild, len(self.headers) - 1))
+                self.refreshNode(existingChild)
+
+    def removeChild(self, node):
+        parentNode = node.parent
+        row = node.row()
+        self.beginRemoveRows(self.indexFromNode(parentNode), row, row)
+        parentNode.popChild(row)
+        self.endRemoveRows()
+
+    def projectNames(self):
+        return [node.name for node in self.projectNodes()]
+
+    def knownProjects(self):
+        """
+        The projects in the tree for logic.iterProjectUpdates: {projectName: rootName} when
+        grouped by root, so moves between roots are picked up, otherwise just the names.
+        """
+        if not self.groups:
+            return self.projectNames()
+        return {node.name: node.parent.name for node in self.projectNodes()}
+
+    def sortKey(self, node):
+        """
+        Groups keep the roots' priority order, projects and files sort by name, versions
+        newest first with "load older…" last.
+        """
+        if node.kind == "group":
+            return (0, node.data.get("order", 0), node.name)
+        if node.kind == "version":
+            return (0, -node.data.get("version", 0), "")
+        if node.kind == "more":
+            return (1, 0, "")
+        return (0, 0, node.name)
+
+    def insertChild(self, parentNode, node):
+        """
+        Inserts node under parentNode keeping the children in sortKey order.
+        """
+        key = self.sortKey(node)
+        row = 0
+        while row < len(parentNode.children) and self.sortKey(parentNode.children[row]) < key:
+            row += 1
+        self.beginInsertRows(self.indexFromNode(parentNode), row, row)
+        parentNode.insertChild(row, node)
+        self.endInsertRows()
+
+
+class fileTreeFilter(QtCore.QSortFilterProxyModel):
+    """
+    Filters the lazy tree with a searchIndex result, None shows everything.
+    Version rows follow their file unless a version term ("v12") picks one of them.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.result = None
+
+    def setResult(self, result):
+        self.result = result
+        self.invalidateFilter()
+
+    def nodeFromIndex(self, index):
+        return self.sourceModel().nodeFromIndex(self.mapToSource(index))
+
+    def filterAcceptsRow(self, sourceRow, sourceParent):
+        if self.result is None:
+            return True
+        parentNode = self.sourceModel().nodeFromIndex(sourceParent)
+        if sourceRow >= len(parentNode.children):
+            return True
+        node = parentNode.children[sourceRow]
+
+        if node.kind == "group":
+            return any(self.result.acceptsProject(project.name) for project in node.children)
+        if node.kind == "project":
+            return self.result.acceptsProject(node.name)
+        if node.kind == "file":
+            return self.result.acceptsFile(node.parent.name, node.name)
+        if node.kind == "version":
+            return self.result.acceptsVersion(node.parent.parent.name, node.parent.name, node.data.get("version"))
+        return True
@@ -0,0 +1,223 @@
+import hashlib
+import os
+import queue
+import shutil
+import threading
+import time
+from collections import OrderedDict
+
+
+STALE_TEMP_SECONDS = 24 * 60 * 60 # copies a crashed session left half written
+
+
+class hipCache:
+    """
+    Read-through local copies of hip files kept on slow (network) storage, so re-opening
+    a version reads it from the local disk instead of the NAS.
+
+        <cacheDir>/<path hash>-<mtime ns>-<size>/<project>_<file>_v004.hip
+
+    An entry is only used while the source's mtime and size still match the ones in its
+    folder name, so checking for a hit costs one stat of the source. Copies are made by
+    put() on a background thread (after saves and after loads that missed) and the least
+    recently used entries are removed once the folder grows past maxBytes. Recency
+    survives restarts through the entry folders' mtimes, and several Houdini sessions can
+    share one cache folder: entries appear with a single rename.
+    """
+
+    def __init__(self, cacheDir, maxBytes=4 * 1024 ** 3):
+        self.cacheDir = os.fspath(cacheDir)
+        self.maxBytes = int(maxBytes)
+        self._entries = None # path hash -> (entry folder, stamp, bytes), least recently used first
+        self._total = 0
+        self._lock = threading.Lock()
+        self._jobs = queue.Queue()
+        self._queued = set()
+        self._thread = None
+
+    def pathKey(self, sourcePath):
+        path = os.path.normcase(os.path.abspath(os.fspath(sourcePath)))
+        return hashlib.sha1(path.encode("utf-8")).hexdigest()[:16]
+
+    def stamp(self, stat):
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    def _index(self):
+        """
+        Lists the cache folder the first time it is needed. Call with _lock held.
+        """
+        if self._entries is not None:
+            return self._entries
+        found = {}
+        try:
+            entries = list(os.scandir(self.cacheDir))
+        except FileNotFoundError:
+            entries = []
+        for entry in entries:
+            try:
+                if not entry.is_dir():
+                    continue
+                mtime = entry.stat().st_mtime
+            except OSError:
+                continue
+            if entry.name.startswith("."):
+                if entry.name.endswith(".tmp") and time.time() - mtime > STALE_TEMP_SECONDS:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                continue
+            key, _, stamp = entry.name.partition("-")
+            try:
+                size = int(stamp.rsplit("-", 1)[1])
+            except (IndexError, ValueError):
+                continue
+            older = found.get(key)
+            if older is not None:
+                # an older version of the same file, only the newest one can still be a hit
+                if older[0] > mtime:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                    continue
+                shutil.rmtree(older[1], ignore_errors=True)
+            found[key] = (mtime, entry.path, stamp, size)
+
+        self._entries = OrderedDict()
+        for key, (mtime, path, stamp, size) in sorted(found.items(), key=lambda item: item[1][0]):
+            self._entries[key] = (path, stamp, size)
+            self._total += size
+        return self._entries
+
+    def lookup(self, sourcePath, touch=True):
+        """
+        Returns the local copy of sourcePath when the cache holds its current version,
+        otherwise None (also when the source can't be reached).
+        """
+        sourcePath = os.fspath(sourcePath)
+        try:
+            stamp = self.stamp(os.stat(sourcePath))
+        except OSError:
+            return None
+        key = self.pathKey(sourcePath)
+        with self._lock:
+            entry = self._index().get(key)
+            if entry is None or entry[1] != stamp:
+                return None
+            if touch:
+                self._entries.move_to_end(key)
+        localPath = os.path.join(entry[0], os.path.basename(sourcePath))
+        try:
+            if touch:
+                os.utime(entry[0]) # keeps the LRU order for the next session
+            if not os.path.isfile(localPath):
+                raise FileNotFoundError(localPath)
+        except OSError:
+            # evicted by another session sharing the folder
+            with self._lock:
+                self._drop(key, remove=False)
+            return None
+        return localPath
+
+    def put(self, sourcePath):
+        """
+        Queues sourcePath to be copied into the cache unless its current version is there
+        already. Returns straight away, the copy happens on the cache's thread.
+        """
+        sourcePath = os.fspath(sourcePath)
+        with self._lock:
+            if sourcePath in self._queued:
+                return
+            self._queued.add(sourcePath)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._work, name="hipCache", daemon=True)
+                self._thread.start()
+        self._jobs.put(sourcePath)
+
+    def wait(self):
+        self._jobs.join()
+
+    def _work(self):
+        while True:
+            sourcePath = self._jobs.get()
+            try:
+                self._store(sourcePath)
+            except Exception as e:
+                print(f"Failed to cache {sourcePath}: {e}")
+            finally:
+                with self._lock:
+                    self._queued.discard(sourcePath)
+                self._jobs.task_done()
+
+    def _store(self, sourcePath):
+        stat = os.stat(sourcePath)
+        if stat.st_size > self.maxBytes:
+            return # would push everything else out and still not fit
+        key, stamp = self.pathKey(sourcePath), self.stamp(stat)
+        with self._lock:
+            entry = self._index().get(key)
+            if entry is not None and entry[1] == stamp:
+                return
+
+        folder = os.path.join(self.cacheDir, f"{key}-{stamp}")
+        temp = os.path.join(self.cacheDir, f".{key}-{stamp}.{os.getpid()}.tmp")
+        os.makedirs(temp, exist_ok=True)
+        try:
+            shutil.copyfile(sourcePath, os.path.join(temp, os.path.basename(sourcePath)))
+            if self.stamp(os.stat(sourcePath)) != stamp:
+                return # saved over while it was copied, the copy may be torn
+            try:
+                os.rename(temp, folder)
+            except OSError:
+                if not os.path.isdir(folder):
+                    raise
+                # another session cached the same version first, use theirs
+        finally:
+            shutil.rmtree(temp, ignore_errors=True)
+
+        with self._lock:
+            entries = self._index()
+            previous = entries.get(key)
+            self._drop(key, remove=previous is not None and previous[0] != folder)
+            entries[key] = (folder, stamp, stat.st_size)
+            self._total += stat.st_size
+            self.trim()
+
+    def trim(self):
+        """
+        Removes least recently used copies until the cache fits maxBytes. Call with _lock held.
+        """
+        entries = self._index()
+        while self._total > self.maxBytes and len(entries) > 1:
+            self._drop(next(iter(entries)))
+
+    def _drop(self, key, remove=True):
+        entry = self._entries.pop(key, None) if self._entries is not None else None
+        if entry is None:
+            return
+        self._total -= entry[2]
+        if remove:
+            shutil.rmtree(entry[0], ignore_errors=True)
+
+    def totalBytes(self):
+        with self._lock:
+            self._index()
+            return self._total
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._index()):
+                self._drop(key)
+
+
+_caches = {}
+_cachesLock = threading.Lock()
+
+
+def getHipCache(cacheDir, maxBytes=4 * 1024 ** 3):
+    """
+    Returns the shared hipCache for cacheDir, so saves and loads see the same index.
+    """
+    key = os.path.normcase(os.path.abspath(cacheDir))
+    with _cachesLock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = hipCache(cacheDir, maxBytes)
+            _caches[key] = cache
+        cache.maxBytes = int(maxBytes)
+        return cache
@@ -0,0 +1,252 @@
+"""
+What is inside a hip version, so the browser can answer "which version was it?" without
+loading it: node count, frame range, Houdini build, top level networks and the files it
+references.
+
+Collected from the live session on every quick project save (collectMetadata) and kept
+next to the project JSON in <project>_Metadata.json. The save only reads what is cheap,
+"nodes" counts the nodes directly inside the top level networks, the file references
+need a walk over every parm of the scene and are left to the batch extractor:
+
+    {"fx": {"v004": {"nodes": 64, "frameRange": [1001, 1100], "fps": 24.0, "build": "21.0.440",
+                     "networks": {"obj": [...], "stage": [...]}, "references": [...], "size": 1234}}}
+
+Versions saved before this existed, or without references yet, are filled in by
+extractMetadata, which loads them in parallel hython worker processes. Run this module with hython to get one such worker:
+it reads hip paths from stdin and answers each with one JSON line on stdout.
+"""
+import json
+import os
+import sys
+import threading
+
+from .jsonUtils import readJson, atomicWriteJson
+from .projectJournal import fileLock
+
+
+NETWORKS = ("obj", "stage", "out", "mat", "ch")
+MAX_NETWORK_NODES = 50
+MAX_REFERENCES = 200
+RESULT_PREFIX = "@@quickProject " # hython prints load messages on stdout too
+
+
+def collectMetadata(hou, references=False):
+    """
+    Metadata of the scene currently open in hou. Only walks the top level networks, cheap
+    enough to run on every save.
+
+    Args:
+        hou: the hou module
+        references (bool): Also collect the referenced files, scans every parm of the
+            scene so only the batch extractor asks for it
+    """
+    start, end = hou.playbar.frameRange()
+    networks = {}
+    nodes = 0
+    for name in NETWORKS:
+        network = hou.node(f"/{name}")
+        if network is not None:
+            children = network.children()
+            nodes += len(children)
+            if children:
+                networks[name] = sorted(child.name() for child in children)[:MAX_NETWORK_NODES]
+
+    meta = {
+        "nodes": nodes,
+        "frameRange": [start, end],
+        "fps": hou.fps(),
+        "build": hou.applicationVersionString(),
+        "networks": networks,
+    }
+    if references:
+        paths = set()
+        for parm, path in hou.fileReferences():
+            if path and not path.startswith("op:"):
+                paths.add(path)
+        meta["references"] = sorted(paths)[:MAX_REFERENCES]
+        meta["referenceCount"] = len(paths)
+    return meta
+
+
+def describe(meta):
+    """
+    Multi line summary of a metadata dict for tooltips and the CLI.
+    """
+    if not meta:
+        return ""
+    lines = []
+    if meta.get("frameRange"):
+        start, end = meta["frameRange"]
+        lines.append(f"Frames {start:g}-{end:g} @ {meta.get('fps', 0):g} fps")
+    if meta.get("nodes") is not None:
+        lines.append(f"{meta['nodes']} top level nodes")
+    if meta.get("build"):
+        lines.append(f"Houdini {meta['build']}")
+    for network, names in sorted(meta.get("networks", {}).items()):
+        more = "…" if len(names) >= MAX_NETWORK_NODES else ""
+        lines.append(f"/{network}: {', '.join(names[:8])}{', …' if len(names) > 8 else more}")
+    for mode, seconds in sorted(meta.get("loadSeconds", {}).items()):
+        lines.append(f"Opened in {seconds:.1f}s ({mode})")
+    references = meta.get("references", [])
+    if references:
+        lines.append(f"{meta.get('referenceCount', len(references))} referenced files:")
+        lines.extend(f"    {path}" for path in references[:10])
+        if len(references) > 10:
+            lines.append("    …")
+    return "\n".join(lines)
+
+
+# -----------------------------------------------------------------
+# <project>_Metadata.json
+# -----------------------------------------------------------------
+
+def metadataPath(projectFolder, project):
+    return os.path.join(os.fspath(projectFolder), f"{project}_Metadata.json")
+
+
+def readMetadata(projectFolder, project):
+    """
+    Returns {fileName: {"vNNN": metadata}} for a project, {} when nothing was collected yet.
+    """
+    try:
+        return readJson(metadataPath(projectFolder, project))
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable metadata for {project}: {e}")
+        return {}
+
+
+def writeMetadata(projectFolder, project, entries, replace=False):
+    """
+    Merges entries [(fileName, version, metadata), ...] into the project's metadata file
+    under its own lock, so saves and the batch extractor never drop each other's entries.
+    A version's fields are updated, not replaced, so eg recorded load times survive a
+    re-extraction. replace starts the versions over, for a freshly saved hip.
+
+    Returns:
+        dict: the project's metadata after the merge
+    """
+    path = metadataPath(projectFolder, project)
+    with fileLock(f"{path[:-len('.json')]}.lock"):
+        data = readMetadata(projectFolder, project)
+        for fileName, version, meta in entries:
+            if isinstance(version, int):
+                version = f"v{version:03}"
+            if replace:
+                data.setdefault(fileName, {})[version] = dict(meta)
+            else:
+                data.setdefault(fileName, {}).setdefault(version, {}).update(meta)
+        atomicWriteJson(path, data, indent=None)
+    return data
+
+
+# -----------------------------------------------------------------
+# Batch extraction with hython
+# -----------------------------------------------------------------
+
+def findHython():
+    import shutil
+    hython = shutil.which("hython")
+    if hython is None and os.environ.get("HFS"):
+        candidate = os.path.join(os.environ["HFS"], "bin", "hython.exe" if os.name == "nt" else "hython")
+        if os.path.exists(candidate):
+            hython = candidate
+    return hython
+
+
+def extractMetadata(jobs, hython=None, workers=2, onResult=None, isCancelled=None):
+    """
+    Loads hip files in workers persistent hython processes and collects their metadata.
+    Each process pulls the next file as soon as it is done, so a slow hip doesn't hold
+    up a whole batch, and hython's start up cost is paid once per worker.
+
+    Args:
+        jobs (list): [(key, hipPath), ...], key is handed back with the result
+        hython (str): hython executable, found on PATH / $HFS when None
+        workers (int): number of hython processes
+        onResult (callable): onResult(key, metadata or None, error or None), called from worker threads
+
+    Returns:
+        int: number of files that were extracted
+    """
+    import queue
+    import subprocess
+
+    hython = hython or findHython()
+    if hython is None:
+        raise FileNotFoundError("hython not found, put it on PATH, set $HFS or pass its path")
+
+    pending = queue.Queue()
+    for job in jobs:
+        pending.put(job)
+    done = [0]
+    doneLock = threading.Lock()
+
+    env = dict(os.environ)
+    pythonDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [pythonDir, env.get("PYTHONPATH")]))
+
+    def work():
+        process = subprocess.Popen([hython, "-m", "quickProject.hipMetadata"], stdin=subprocess.PIPE,
+                                   stdout=subprocess.PIPE, text=True, env=env)
+        try:
+            while not (isCancelled and isCancelled()):
+                try:
+                    key, hipPath = pending.get_nowait()
+                except queue.Empty:
+                    break
+                process.stdin.write(f"{hipPath}\n")
+                process.stdin.flush()
+                line = process.stdout.readline()
+                while line and not line.startswith(RESULT_PREFIX):
+                    line = process.stdout.readline()
+                if not line:
+                    if onResult is not None:
+                        onResult(key, None, "hython worker exited")
+                    break
+                result = json.loads(line[len(RESULT_PREFIX):])
+                if onResult is not None:
+                    onResult(key, result.get("metadata"), result.get("error"))
+                if result.get("metadata") is not None:
+                    with doneLock:
+                        done[0] += 1
+        finally:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+            process.wait()
+
+    threads = [threading.Thread(target=work, name=f"hython{i}", daemon=True)
+               for i in range(max(1, min(int(workers), pending.qsize())))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return done[0]
+
+
+def workerMain():
+    """
+    hython side of extractMetadata: one hip path per stdin line, one JSON line back.
+    """
+    import hou
+    for line in sys.stdin:
+        hipPath = line.strip()
+        if not hipPath:
+            continue
+        try:
+            hou.hipFile.load(hipPath, suppress_save_prompt=True, ignore_load_warnings=True)
+            meta = collectMetadata(hou, references=True)
+            meta["size"] = os.path.getsize(hipPath)
+            result = {"path": hipPath, "metadata": meta}
+        except Exception as e:
+            result = {"path": hipPath, "error": f"{type(e).__name__}: {e}"}
+        sys.stdout.write(RESULT_PREFIX + json.dumps(result) + "\n")
+        sys.stdout.flush()
+    hou.hipFile.clear(suppress_save_prompt=True)
+
+
+if __name__ == "__main__":
+    workerMain()
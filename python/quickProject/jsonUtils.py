@@ -0,0 +1,38 @@
+import json
+import os
+from pathlib import Path
+
+from ALToolsProfiler import traced
+
+
+@traced("quickProject.json.read")
+def readJson(path):
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+@traced("quickProject.json.write")
+def atomicWriteJson(path, data, indent=4):
+    """
+    Write data as JSON to path without ever leaving a half written file behind.
+
+    The JSON is written to a temp file next to the target and then swapped in with
+    os.replace, so readers on other machines see either the old or the new file.
+    """
+    import tempfile # only writers pay for it, keeps read-only tools (cli.py) quick to start
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmpPath = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w") as file:
+            json.dump(data, file, indent=indent)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmpPath, path)
+    except BaseException:
+        try:
+            os.remove(tmpPath)
+        except OSError:
+            pass
+        raise
@@ -1,188 +1,176 @@
 import hou
-import json
-from pathlib import Path
 import os
-from quickProject import settingsPannel
-from PySide6 import QtWidgets
-import platform
+from pathlib import Path
+from .core import projectCore
+from ALToolsProfiler import span
+
 
 
+class quickProjectLogic(projectCore):
+    """
+    Houdini side of quick project: saving through hou.hipFile and reporting problems with
+    hou dialogs. All of the project bookkeeping lives in core.projectCore.
+    """
+
+    previousUpdateMode = None # update mode before a fast open, shared by every panel in the session
 
-class quickProjectLogic:
     def __init__(self):
-        self.jsonPath = Path(f"{hou.getenv('HOUDINI_USER_PREF_DIR')}/ALTools/Projects.json")
-        self.jsonPath.parent.mkdir(parents=True, exist_ok=True) # make sure ALTools folder exists
+        super().__init__(hou.getenv('HOUDINI_USER_PREF_DIR'))
         self.startup()
         self.projectDir()
-        from datetime import datetime
-        nowUnformantted = datetime.now()
-        self.now = nowUnformantted.strftime("%d-%m-%Y %H:%M:%S")
+        self.now = self.timestamp()
+
+        mirror = self.mirror()
+        if mirror is not None:
+            mirror.resume() # copies queued before Houdini was last closed
 
     def startup(self):
         if self.checkJsonExists():
             print("Json Dosnt exist")
             self.checkJsonExists()
-            settings = settingsPannel()
+            from .settingsPannel import settingsPannel
+            settings = settingsPannel(self.settings)
             settings.show()
         else:
             pass
 
-    def projectDir(self):
-        with open(self.jsonPath, "r") as file:
-            data = json.load(file)
-            Value = data["settings"]["homeDir"]
-        return Value
-            
-
-    def checkJsonExists(self):
-        if not os.path.exists(self.jsonPath):
-                structure = {
-                    "settings": {
-                        "author": "",
-                        "homeDir": "",
-                        "Style": "Default"
-                    }
-                }
-
-                with open(self.jsonPath, 'w') as file:  
-                    json.dump(structure, file, indent=4)
-                    # print(f"Created new JSON file at: {self.jsonPath}")
-
-    def saveHipFile(self, project, file, version):
-        # === get File Path === #
-        self.filePath = Path(f"{self.projectDir()}/{project}/{project}_{file}_{version}.hip")
-        self.filePath.parent.mkdir(parents=True, exist_ok=True)
+    def saveHipFile(self, project, file, version, root=None):
+        # === get File Path (root only matters for a new project) === #
+        self.filePath = self.projectFolder(project, root) / f"{project}_{file}_{version}.hip"
 
         # === check for inputs === #
-        if not project:
-            hou.ui.displayMessage("No Project Was Given",buttons=("Ok",), severity=hou.severityType.Warning)
-            return
-        if not file:
-            hou.ui.displayMessage("No File Name Was Given",buttons=("Ok",), severity=hou.severityType.Warning)
+        if not self.checkSaveInputs(project, file):
             return
+        self.filePath.parent.mkdir(parents=True, exist_ok=True)
 
         # === save file === #
-        self.save = hou.hipFile.save(str(self.filePath),True)
+        with span("quickProject.hip.save"):
+            self.save = hou.hipFile.save(str(self.filePath),True)
     # print(f"Saved File At: {self.filePath}")
 
-    def updateJsonSettings(self, setting, value):
-        if value == "":
-            # print("value was blank")
-            return
-
-        else:
-            with open(self.jsonPath, "r") as file:
-                data = json.load(file)
+        # === index / mirror / retention === #
+        self.recordSavedVersion(project, file, version, self.filePath)
 
-            data["settings"][str(setting)] = value
+        # === what is in the scene, read from memory so it costs next to nothing === #
+        try:
+            from .hipMetadata import collectMetadata
+            with span("quickProject.metadata.collect"):
+                meta = collectMetadata(hou)
+            meta["size"] = self.filePath.stat().st_size
+            self.recordMetadata(project, [(file, version, meta)], replace=True) # a new hip, old load times don't apply
+        except Exception as e:
+            print(f"Couldn't record metadata for {self.filePath.name}: {e}")
 
-            with open(self.jsonPath, "w") as file:
-                json.dump(data, file, indent=4)
+        # === thumbnail, encoded and cached off the main thread === #
+        if self.settings.get("thumbnails", False):
+            self.captureThumbnail(project, file, version)
 
-    def initProjectJson(self, project):
+    def captureThumbnail(self, project, file, version):
         """
-        Initialize a new project JSON file for tracking project metadata.
-        
-        Args:
-            project (str): The name of the project to initialize
-            
-        This function:
-        1. Gets the current timestamp for project creation date
-        2. Reads user settings from the main settings JSON file
-        3. Creates a new project-specific JSON file if it doesn't exist
-        4. Sets up initial project metadata including author and creation date
+        Flipbooks the current frame of the scene viewer into a small temp image and hands
+        it to the thumbnail cache. Only the flipbook itself runs here (hou needs the main
+        thread), a missing viewer or a failed capture never stops the save.
         """
+        viewer = hou.ui.paneTabOfType(hou.paneTabType.SceneViewer)
+        if viewer is None:
+            return
+        import tempfile
+        frame = int(hou.frame())
+        output = Path(tempfile.gettempdir()) / f"altools_thumb_{os.getpid()}_$F4.jpg"
+        try:
+            with span("quickProject.thumbnail.capture"):
+                settings = viewer.flipbookSettings().stash()
+                settings.frameRange((frame, frame))
+                settings.output(output.as_posix())
+                settings.outputToMPlay(False)
+                settings.useResolution(True)
+                settings.resolution((480, 270))
+                viewer.flipbook(viewer.curViewport(), settings)
+        except hou.Error as e:
+            print(f"Thumbnail capture failed: {e}")
+            return
+        capture = Path(str(output).replace("$F4", f"{frame:04}"))
+        if capture.exists():
+            thumbnails = self.thumbnails()
+            thumbnails.put(thumbnails.key(project, file, version), capture)
 
-        # Read user settings from main settings file
-        with open(self.jsonPath, "r") as settFile:
-            userdata = json.load(settFile)
-            author = userdata["settings"]["author"]  # Get author from settings
-            homeDir = Path(userdata["settings"]["homeDir"])  # Get project home directory
-            jsonDir = homeDir / project / f"{project}_Project.json"  # Construct project JSON path
-
-        # Create new project JSON file if it doesn't exist
-        if not jsonDir.exists():
-            # Define initial project structure
-            structure = {
-                "ProjectData": {
-                    "project": f"{project}",  # Project name
-                    "author": f"{author}",    # Project author
-                    "created": f"{self.now}"  # Creation timestamp
-                    },
-                "Files": {  # Empty files section to be populated later
-                }
-                }
-    
-            # Create project directory if it doesn't exist
-            jsonDir.parent.mkdir(parents=True, exist_ok=True)
-            # Write initial project structure to JSON file
-            with open(jsonDir, "w") as file:
-                json.dump(structure, file, indent=4)
-            # print(f"{project} was initilized at {homeDir}\{project}")
-        else:
-            # print(f"initProjectJson was skiped due to entry {project} already existing")
-            pass  # If project JSON already exists, do nothing
-
-    def addFileToJson(self, project, filename):
-        with open(self.jsonPath, "r") as settFile:
-            userdata = json.load(settFile)
-            author = userdata["settings"]["author"]
-            homeDir = Path(userdata["settings"]["homeDir"])
-            jsonDir = homeDir / project / f"{project}_Project.json"
-
-        with open(jsonDir,"r") as file:
-            data = json.load(file)
-            
-        if filename not in data.get("Files",{}):
-            data["Files"][filename] = {
-                "version": f"v{0:03}",
-                "author": f"{author}",
-                "created": f"{self.now}",
-                "modified": f"{self.now}"
-            }
-
-            with open(jsonDir,"w") as file:
-                json.dump(data, file, indent=4)
-            # print(f"{filename} was initialized in {project} at {homeDir}\{project}")
+    def openHipFile(self, hipPath, fast=False, skipWarnings=False, mergePattern=None):
+        """
+        Opens (or with mergePattern merges the matching top level nodes of) a hip file.
+        With a hip cache set up the file is read from its local copy when that is current,
+        the scene still points at hipPath so $HIP and saves go where they always did.
+        While a local copy loads $HIP is the cache folder, so nothing cooks until the name
+        is set back (manual update mode), and hips with an otls / hda folder next to them
+        always load from hipPath since their HDAs are found through $HIP during the load.
+        A miss is copied into the cache in the background for the next open.
 
-        else:
-            # print(f"addFileToJson was skiped due to entry {filename} already existing in {project}")
-            pass
+        Args:
+            hipPath (str | Path): hip file to open
+            fast (bool): switch the update mode to manual first, so nothing cooks on open.
+                The previous mode is kept for restoreUpdateMode
+            skipWarnings (bool): don't stop on load warning dialogs
+            mergePattern (str): hou.hipFile.merge node pattern, eg "/obj/geo1 /obj/cam1"
 
-    def incProjectVersion(self, project, filename):
+        Returns:
+            float: seconds the load took
         """
-        This function increments the version of the current file and updates the updated part to the current time
+        import time
+        if fast and hou.updateModeSetting() != hou.updateMode.Manual:
+            quickProjectLogic.previousUpdateMode = hou.updateModeSetting()
+            hou.setUpdateMode(hou.updateMode.Manual)
+
+        cache = self.hipCache()
+        if cache is not None and not mergePattern and self.hasHipAssets(hipPath):
+            cache = None
+        localPath = cache.lookup(hipPath) if cache is not None else None
+
+        start = time.perf_counter()
+        with span("quickProject.hip.merge" if mergePattern else "quickProject.hip.load", fast=fast,
+                  cached=localPath is not None):
+            if mergePattern:
+                # a merge keeps the current scene's $HIP, where the file is read from doesn't show
+                hou.hipFile.merge(str(localPath or hipPath), node_pattern=mergePattern, ignore_load_warnings=skipWarnings)
+            elif localPath is None:
+                hou.hipFile.load(str(hipPath), ignore_load_warnings=skipWarnings)
+            else:
+                updateMode = hou.updateModeSetting()
+                hou.setUpdateMode(hou.updateMode.Manual)
+                try:
+                    hou.hipFile.load(str(localPath), ignore_load_warnings=skipWarnings)
+                    hou.hipFile.setName(str(hipPath)) # $HIP, the title bar and ctrl+s use the real location
+                finally:
+                    hou.setUpdateMode(updateMode)
+        seconds = time.perf_counter() - start
+
+        if cache is not None and localPath is None:
+            cache.put(hipPath)
+        return seconds
+
+    def hasHipAssets(self, hipPath):
         """
+        True when hipPath has an otls or hda folder next to it ($HIP/otls, $HIP/hda).
+        """
+        folder = Path(hipPath).parent
+        return any((folder / name).is_dir() for name in ("otls", "hda"))
 
-        with open(self.jsonPath, "r") as settFile:
-            userdata = json.load(settFile)
-            author = userdata["settings"]["author"]
-            homeDir = Path(userdata["settings"]["homeDir"])
-            jsonDir = homeDir / project / f"{project}_Project.json"
-
-        with open(jsonDir,"r") as file:
-            data = json.load(file)
-            
-
-        if filename not in data.get("Files",{}):
-            # print(f"{filename}, was not found in {project}")
-            return
-        else:
-            with open(jsonDir,"w") as file:
-                version = data["Files"][filename]["version"]
-                vNum = int(version.lstrip("v"))
-                newV = vNum + 1
-                data["Files"][filename]["version"] = f"v{newV:03}"
-                data["Files"][filename]["modified"] = f"{self.now}"
-                json.dump(data,file,indent=4)
-                # print(f"{filename} was updated to v{newV:03}")
-
-    def loadSettingsJson(self, setting):
-        with open(self.jsonPath, "r") as file:
-            data = json.load(file)
-        # print(data["settings"][str(setting)])
-        return data["settings"][str(setting)]
+    def restoreUpdateMode(self):
+        """
+        Puts the update mode back to what it was before a fast open (auto update if unknown).
+        """
+        hou.setUpdateMode(quickProjectLogic.previousUpdateMode or hou.updateMode.AutoUpdate)
+        quickProjectLogic.previousUpdateMode = None
 
+    def checkSaveInputs(self, project, file):
+        if not project:
+            hou.ui.displayMessage("No Project Was Given",buttons=("Ok",), severity=hou.severityType.Warning)
+            return False
+        if not file:
+            hou.ui.displayMessage("No File Name Was Given",buttons=("Ok",), severity=hou.severityType.Warning)
+            return False
+        if not self.roots():
+            hou.ui.displayMessage("No Project Folder Is Set, Pick One In The Settings",buttons=("Ok",), severity=hou.severityType.Warning)
+            return False
+        return True
 
     def loadProjectJson(self, projectpath , keys):
         """
@@ -201,35 +189,12 @@ class quickProjectLogic:
         Returns:
             The requested value if found, otherwise None.
         """
-
-        projectpath = Path(projectpath)
-
-        # Ensure the project file exists
-        if not projectpath.exists():
-            hou.ui.displayMessage(f"Project file not found: {projectpath}", buttons=("Ok",), severity=hou.severityType.Warning)
-            return None
-
-        # Load JSON from file with basic error handling
         try:
-            with open(projectpath, "r") as file:
-                data = json.load(file)
+            return self.readProjectValue(projectpath, keys)
+        except FileNotFoundError as e:
+            hou.ui.displayMessage(str(e), buttons=("Ok",), severity=hou.severityType.Warning)
+        except KeyError as e:
+            hou.ui.displayMessage(e.args[0], buttons=("Ok",), severity=hou.severityType.Warning)
         except Exception as e:
             hou.ui.displayMessage(f"Failed to read project file: {e}", buttons=("Ok",), severity=hou.severityType.Warning)
-            return None
-
-        # Normalize keys to a tuple to allow uniform traversal
-        if isinstance(keys, str):
-            keys = (keys,)
-
-        # Traverse nested dictionaries following the provided keys
-        current = data
-        for key in keys:
-            if isinstance(current, dict) and key in current:
-                current = current[key]
-            else:
-                hou.ui.displayMessage(f"Key '{key}' not found while traversing {projectpath}", buttons=("Ok",), severity=hou.severityType.Warning)
-                return None
-
-    # Print the result for visibility and return it
-    # print(f"got value {current} from {projectpath}")
-        return current
+        return None
@@ -0,0 +1,240 @@
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from .jsonUtils import readJson, atomicWriteJson
+from .projectJournal import fileLock
+
+
+class mirrorQueue:
+    """
+    Copies freshly saved files to a secondary root (eg a backup share) in the background.
+
+    Every job is written to ALTools/MirrorQueue.json before it is handed to a worker and
+    only removed once the copy landed, so jobs left over when Houdini closes are picked
+    up again by resume() next session. Jobs name exact files, the mirror never walks
+    the tree. Failed copies are retried with a growing delay up to maxAttempts.
+
+    Layout:
+        {"jobs": {sourcePath: {"source", "target", "queued", "attempts"}}}
+    """
+
+    def __init__(self, queuePath, workers=2, maxAttempts=5, retryDelay=2.0):
+        self.queuePath = Path(queuePath)
+        self.lockPath = self.queuePath.with_suffix(".lock")
+        self.workers = max(1, int(workers))
+        self.maxAttempts = maxAttempts
+        self.retryDelay = retryDelay
+        self._jobs = queue.Queue()
+        self._threads = []
+        self._threadsLock = threading.Lock()
+        self._active = 0
+        self._idle = threading.Condition(self._threadsLock)
+        self._stopped = threading.Event()
+        self._resumed = False
+
+    # -----------------------------------------------------------------
+    # Persisted queue
+    # -----------------------------------------------------------------
+
+    def _load(self):
+        try:
+            return readJson(self.queuePath).get("jobs", {})
+        except (OSError, ValueError):
+            return {}
+
+    def _update(self, change):
+        """
+        Applies change(jobs) to the queue file under its lock (several Houdini sessions
+        may share one preferences folder).
+        """
+        with fileLock(self.lockPath):
+            jobs = self._load()
+            change(jobs)
+            atomicWriteJson(self.queuePath, {"jobs": jobs}, indent=None)
+
+    def pending(self):
+        return list(self._load().values())
+
+    # -----------------------------------------------------------------
+    # Queueing
+    # -----------------------------------------------------------------
+
+    def enqueue(self, paths, homeDir, mirrorDir):
+        """
+        Queues paths (files under homeDir) to be copied to the same relative place under
+        mirrorDir. Returns straight away, the copies happen on the worker threads.
+        """
+        homeDir = Path(homeDir)
+        mirrorDir = Path(mirrorDir)
+        now = time.time()
+        jobs = []
+        for path in paths:
+            path = Path(path)
+            try:
+                relative = path.relative_to(homeDir)
+            except ValueError:
+                print(f"Not mirroring {path}, it isn't under {homeDir}")
+                continue
+            jobs.append({"source": os.fspath(path), "target": os.fspath(mirrorDir / relative),
+                         "queued": now, "attempts": 0})
+        if not jobs:
+            return
+
+        def add(queued):
+            for job in jobs:
+                queued[job["source"]] = job
+        self._update(add)
+
+        for job in jobs:
+            self._put(job)
+
+    def resume(self):
+        """
+        Re-queues the jobs a previous session didn't get to, once per session. Returns how
+        many there were.
+        """
+        if self._resumed:
+            return 0
+        self._resumed = True
+        jobs = self.pending()
+        for job in jobs:
+            self._put(job)
+        return len(jobs)
+
+    def _put(self, job):
+        with self._threadsLock:
+            if self._stopped.is_set():
+                return # stays in the queue file for the next session's resume()
+            self._active += 1
+            if len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work, name="mirror", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+        self._jobs.put(job)
+
+    # -----------------------------------------------------------------
+    # Workers
+    # -----------------------------------------------------------------
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            if self._stopped.is_set():
+                self._done()
+                return
+            try:
+                self._run(job)
+            except Exception as e:
+                print(f"Mirror job for {job.get('source')} failed: {e}")
+            finally:
+                self._done()
+
+    def _done(self, count=1):
+        with self._threadsLock:
+            self._active -= count
+            self._idle.notify_all()
+
+    def _run(self, job):
+        try:
+            self.copy(job["source"], job["target"])
+        except FileNotFoundError:
+            # the source was deleted or renamed since, nothing left to mirror
+            self._finish(job)
+        except OSError as e:
+            job["attempts"] += 1
+            if job["attempts"] >= self.maxAttempts:
+                print(f"Giving up mirroring {job['source']} after {job['attempts']} attempts: {e}")
+                self._finish(job)
+                return
+            self._update(lambda jobs: jobs.get(job["source"], {}).update(attempts=job["attempts"]))
+            delay = self.retryDelay * 2 ** (job["attempts"] - 1)
+            timer = threading.Timer(delay, self._put, (job,))
+            timer.daemon = True
+            timer.start()
+        else:
+            self._finish(job)
+
+    def _finish(self, job):
+        def remove(jobs):
+            # keep it if the file was saved over and queued again while we were copying
+            if jobs.get(job["source"], {}).get("queued") == job["queued"]:
+                del jobs[job["source"]]
+        self._update(remove)
+
+    def copy(self, source, target):
+        """
+        Copies into a temp file next to target and renames it into place, so the mirror
+        never holds a half copied hip.
+        """
+        target = Path(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tempPath = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copy2(source, tempPath)
+            os.replace(tempPath, target)
+        except BaseException:
+            try:
+                os.remove(tempPath)
+            except OSError:
+                pass
+            raise
+
+    def wait(self, timeout=None):
+        """
+        Blocks until every queued copy finished (or is waiting for a retry). Returns False
+        on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self._active:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def stop(self):
+        """
+        Stops the workers, whatever is still queued stays in the queue file for resume().
+        Copies already running finish, so wait() returns once they did.
+        """
+        with self._threadsLock:
+            self._stopped.set()
+            threads, self._threads = self._threads, []
+        dropped = 0
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                dropped += 1
+        self._done(dropped)
+        for _ in threads:
+            self._jobs.put(None)
+
+
+_mirrors = {}
+_mirrorsLock = threading.Lock()
+
+
+def getMirror(queuePath, workers=2):
+    """
+    Returns the shared mirrorQueue for queuePath, so every save in a session feeds the
+    same workers.
+    """
+    key = os.path.normcase(os.path.abspath(queuePath))
+    with _mirrorsLock:
+        mirror = _mirrors.get(key)
+        if mirror is None:
+            mirror = mirrorQueue(queuePath, workers)
+            _mirrors[key] = mirror
+        return mirror
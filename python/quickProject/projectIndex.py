@@ -0,0 +1,386 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from .projectJournal import readProject
+from .versionScan import scanProjectFolder, mergeFiles
+from .hipMetadata import readMetadata
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    path TEXT NOT NULL,
+    author TEXT,
+    created TEXT,
+    jsonMtime REAL
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    projectId INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0,
+    author TEXT,
+    created TEXT,
+    modified TEXT,
+    UNIQUE (projectId, name)
+);
+CREATE TABLE IF NOT EXISTS versions (
+    id INTEGER PRIMARY KEY,
+    fileId INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    version INTEGER NOT NULL,
+    author TEXT,
+    created TEXT,
+    modified TEXT,
+    size INTEGER,
+    mtime REAL,
+    UNIQUE (fileId, version)
+);
+CREATE TABLE IF NOT EXISTS metadata (
+    fileId INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    version INTEGER NOT NULL,
+    nodes INTEGER,
+    frameStart REAL,
+    frameEnd REAL,
+    build TEXT,
+    data TEXT,
+    PRIMARY KEY (fileId, version)
+);
+CREATE INDEX IF NOT EXISTS versionsByFile ON versions (fileId, version DESC);
+CREATE INDEX IF NOT EXISTS versionsByMtime ON versions (mtime);
+"""
+
+
+def versionNumber(version):
+    """ "v004" -> 4, 4 -> 4 """
+    if isinstance(version, int):
+        return version
+    return int(str(version).lstrip("v") or 0)
+
+
+class projectIndex:
+    """
+    Optional SQLite index of every project, file and version under the home directory.
+
+    The per project <project>_Project.json files stay the source of truth, this is a
+    cache that turns "latest version of X" or "everything modified this week" into an
+    indexed query instead of a directory walk + JSON parse per project.
+    """
+
+    def __init__(self, dbPath):
+        self.dbPath = Path(dbPath)
+        self.dbPath.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(str(self.dbPath), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def isEmpty(self):
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM projects LIMIT 1").fetchone() is None
+
+    # -----------------------------------------------------------------
+    # Writing
+    # -----------------------------------------------------------------
+
+    def _projectId(self, project, path="", author="", created="", jsonMtime=None):
+        self.conn.execute(
+            "INSERT INTO projects (name, path, author, created, jsonMtime) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET "
+            "path = CASE WHEN excluded.path != '' THEN excluded.path ELSE path END, "
+            "jsonMtime = COALESCE(excluded.jsonMtime, jsonMtime)",
+            (project, str(path), author, created, jsonMtime))
+        return self.conn.execute("SELECT id FROM projects WHERE name = ?", (project,)).fetchone()["id"]
+
+    def _fileId(self, projectId, filename, fileData):
+        self.conn.execute(
+            "INSERT INTO files (projectId, name, version, author, created, modified) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(projectId, name) DO UPDATE SET "
+            "version = MAX(version, excluded.version), "
+            "modified = COALESCE(NULLIF(excluded.modified, ''), modified)",
+            (projectId, filename, versionNumber(fileData.get("version", 0)),
+             fileData.get("author", ""), fileData.get("created", ""), fileData.get("modified", "")))
+        return self.conn.execute("SELECT id FROM files WHERE projectId = ? AND name = ?",
+                                 (projectId, filename)).fetchone()["id"]
+
+    def recordVersion(self, project, filename, fileData, projectPath="", size=None, mtime=None):
+        """
+        Upserts the project, file and the version named in fileData["version"].
+
+        Args:
+            project (str): Project name
+            filename (str): File name inside the project
+            fileData (dict): The file entry from the project JSON (version, author, created, modified)
+            projectPath (str | Path): Project folder, stored so lookups don't need the home dir
+            size (int): Size of the saved hip in bytes, if known
+            mtime (float): Modified time of the saved hip, if known
+        """
+        with self._lock, self.conn:
+            projectId = self._projectId(project, projectPath)
+            fileId = self._fileId(projectId, filename, fileData)
+            self.conn.execute(
+                "INSERT INTO versions (fileId, version, author, created, modified, size, mtime) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(fileId, version) DO UPDATE SET "
+                "modified = COALESCE(NULLIF(excluded.modified, ''), modified), "
+                "size = COALESCE(excluded.size, size), mtime = COALESCE(excluded.mtime, mtime)",
+                (fileId, versionNumber(fileData["version"]), fileData.get("author", ""),
+                 fileData.get("modified", ""), fileData.get("modified", ""), size, mtime))
+
+    def importProject(self, projectFolder, data=None, jsonMtime=None):
+        """
+        Replaces everything the index knows about one project with what is in its JSON
+        and on disk. The project folder is listed once, hip files are matched by name.
+        """
+        projectFolder = Path(projectFolder)
+        project = projectFolder.name
+        if data is None:
+            data = readProject(projectFolder, project) or {}
+        projectData = data.get("ProjectData", {})
+
+        # one listing of the folder instead of a stat per version
+        versionMap = scanProjectFolder(projectFolder, project)
+
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM projects WHERE name = ?", (project,))
+            projectId = self._projectId(project, projectFolder, projectData.get("author", ""),
+                                        projectData.get("created", ""), jsonMtime)
+            for filename, fileData in mergeFiles(data.get("Files", {}), versionMap).items():
+                fileId = self._fileId(projectId, filename, fileData)
+                for versionData in versionMap.get(filename, {}).values():
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO versions (fileId, version, author, created, modified, size, mtime) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (fileId, versionData["version"], fileData.get("author", ""), None, None,
+                         versionData["size"], versionData["mtime"]))
+            for filename, versions in readMetadata(projectFolder, project).items():
+                fileId = self._fileId(projectId, filename, {})
+                for version, meta in versions.items():
+                    self._insertMetadata(fileId, version, meta)
+
+    def _insertMetadata(self, fileId, version, meta):
+        frameRange = meta.get("frameRange") or (None, None)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO metadata (fileId, version, nodes, frameStart, frameEnd, build, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (fileId, versionNumber(version), meta.get("nodes"), frameRange[0], frameRange[1],
+             meta.get("build"), json.dumps(meta)))
+
+    def recordMetadata(self, project, filename, version, meta, projectPath=""):
+        """
+        Stores a version's hip metadata (see hipMetadata), the queryable fields get columns.
+        """
+        with self._lock, self.conn:
+            projectId = self._projectId(project, projectPath)
+            fileId = self._fileId(projectId, filename, {})
+            self._insertMetadata(fileId, version, meta)
+
+    def metadata(self, project, filename=None):
+        """
+        Returns {fileName: {"vNNN": metadata}} for a project (or one of its files).
+        """
+        query = ("SELECT f.name AS file, m.version AS version, m.data AS data FROM metadata m "
+                 "JOIN files f ON f.id = m.fileId JOIN projects p ON p.id = f.projectId WHERE p.name = ?")
+        args = [project]
+        if filename is not None:
+            query += " AND f.name = ?"
+            args.append(filename)
+        result = {}
+        with self._lock:
+            for row in self.conn.execute(query, args):
+                result.setdefault(row["file"], {})[f"v{row['version']:03}"] = json.loads(row["data"])
+        return result
+
+    def removeVersions(self, project, filename, versions):
+        """
+        Drops pruned versions of a file from the index.
+        """
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "DELETE FROM versions WHERE version = ? AND fileId = "
+                "(SELECT f.id FROM files f JOIN projects p ON p.id = f.projectId WHERE p.name = ? AND f.name = ?)",
+                [(versionNumber(version), project, filename) for version in versions])
+
+    def importFromJson(self, homeDirs, onlyChanged=True):
+        """
+        Imports every <project>/<project>_Project.json under homeDirs (one folder or a
+        list of project roots, highest priority first, the first root holding a name wins).
+
+        With onlyChanged the JSON (and journal) mtime is compared against the one stored at
+        the last import, so a refresh only re-parses projects that were actually saved to.
+        Projects whose folder is gone are dropped from the index, but only from roots that
+        were listed completely: a root that can't be reached (share offline, VPN down)
+        keeps its projects until it can be scanned again.
+
+        Returns:
+            list: names of the projects that were (re)imported
+        """
+        if isinstance(homeDirs, (str, os.PathLike)):
+            homeDirs = [homeDirs]
+        homeDirs = [Path(homeDir) for homeDir in homeDirs]
+
+        with self._lock:
+            known = {row["name"]: (row["jsonMtime"], row["path"]) for row in
+                     self.conn.execute("SELECT name, jsonMtime, path FROM projects")}
+
+        imported = []
+        seen = set()
+        scanned = set()
+        for homeDir in homeDirs:
+            try:
+                self._importFolder(homeDir, known, seen, imported, onlyChanged)
+            except OSError as e:
+                print(f"Couldn't scan project root {homeDir}, keeping its indexed projects: {e}")
+                continue
+            scanned.add(self._rootKey(homeDir))
+        if not scanned:
+            return imported
+
+        # a project's root is the folder holding it, roots no longer configured count as scanned
+        configured = {self._rootKey(homeDir) for homeDir in homeDirs}
+        with self._lock, self.conn:
+            for project in set(known) - seen:
+                root = self._rootKey(os.path.dirname(known[project][1]))
+                if root in scanned or root not in configured:
+                    self.conn.execute("DELETE FROM projects WHERE name = ?", (project,))
+        return imported
+
+    def _rootKey(self, folder):
+        return os.path.normcase(os.path.abspath(folder))
+
+    def _importFolder(self, homeDir, known, seen, imported, onlyChanged):
+        with os.scandir(homeDir) as entries:
+            for entry in entries:
+                if not entry.is_dir() or entry.name in seen:
+                    continue
+                projectJson = Path(entry.path) / f"{entry.name}_Project.json"
+                try:
+                    jsonMtime = projectJson.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+                try:
+                    # journaled saves only touch the journal
+                    jsonMtime = max(jsonMtime, projectJson.with_suffix(".journal").stat().st_mtime)
+                except FileNotFoundError:
+                    pass
+                seen.add(entry.name)
+                if onlyChanged and known.get(entry.name) == (jsonMtime, str(Path(entry.path))):
+                    continue # a project moved to another root keeps its mtime but not its path
+                try:
+                    data = readProject(entry.path, entry.name)
+                except (OSError, ValueError) as e:
+                    print(f"Skipping unreadable project json {projectJson}: {e}")
+                    continue
+                if data is None:
+                    continue
+                self.importProject(entry.path, data, jsonMtime)
+                imported.append(entry.name)
+
+    # -----------------------------------------------------------------
+    # Queries
+    # -----------------------------------------------------------------
+
+    def listProjects(self):
+        with self._lock:
+            return [row["name"] for row in self.conn.execute("SELECT name FROM projects ORDER BY name")]
+
+    def projectPaths(self):
+        """
+        Returns {projectName: project folder} for every indexed project.
+        """
+        with self._lock:
+            return {row["name"]: row["path"] for row in self.conn.execute("SELECT name, path FROM projects")}
+
+    def projectFiles(self, project):
+        """
+        Returns the project's files in the same shape as the "Files" section of the project JSON,
+        plus "size" (bytes of every indexed version) and "versions" (how many there are).
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT f.name, f.version, f.author, f.created, f.modified, "
+                "COALESCE(SUM(v.size), 0) AS size, COUNT(v.id) AS versions FROM files f "
+                "JOIN projects p ON p.id = f.projectId LEFT JOIN versions v ON v.fileId = f.id "
+                "WHERE p.name = ? GROUP BY f.id ORDER BY f.name", (project,))
+            return {row["name"]: {"version": f"v{row['version']:03}",
+                                  "author": row["author"],
+                                  "created": row["created"],
+                                  "modified": row["modified"],
+                                  "size": row["size"],
+                                  "versions": row["versions"]} for row in rows}
+
+    def projectSizes(self):
+        """
+        Returns {projectName: bytes} for every indexed project, one aggregate query.
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT p.name, COALESCE(SUM(v.size), 0) AS size FROM projects p "
+                "LEFT JOIN files f ON f.projectId = p.id LEFT JOIN versions v ON v.fileId = f.id "
+                "GROUP BY p.id")
+            return {row["name"]: row["size"] for row in rows}
+
+    def listVersions(self, project, filename):
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT v.version, v.size, v.mtime, v.author FROM versions v "
+                "JOIN files f ON f.id = v.fileId JOIN projects p ON p.id = f.projectId "
+                "WHERE p.name = ? AND f.name = ? ORDER BY v.version", (project, filename))
+            return [dict(row) for row in rows]
+
+    def latestVersion(self, project, filename):
+        """
+        Returns the newest version row of a file as a dict (version, size, mtime, path) or None.
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT v.version, v.size, v.mtime, p.path FROM versions v "
+                "JOIN files f ON f.id = v.fileId JOIN projects p ON p.id = f.projectId "
+                "WHERE p.name = ? AND f.name = ? ORDER BY v.version DESC LIMIT 1", (project, filename)).fetchone()
+        if row is None:
+            return None
+        result = dict(row)
+        result["path"] = str(Path(row["path"]) / f"{project}_{filename}_v{row['version']:03}.hip")
+        return result
+
+    def modifiedSince(self, since):
+        """
+        Every version whose hip was modified after since (epoch seconds), newest first.
+        Example: index.modifiedSince(time.time() - 7 * 24 * 3600) for "this week".
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT p.name AS project, f.name AS file, v.version, v.size, v.mtime FROM versions v "
+                "JOIN files f ON f.id = v.fileId JOIN projects p ON p.id = f.projectId "
+                "WHERE v.mtime >= ? ORDER BY v.mtime DESC", (since,))
+            return [dict(row) for row in rows]
+
+    def modifiedThisWeek(self):
+        return self.modifiedSince(time.time() - 7 * 24 * 3600)
+
+
+_indexes = {}
+_indexesLock = threading.Lock()
+
+
+def getIndex(dbPath):
+    """
+    Returns the shared projectIndex for dbPath, one connection per database per session.
+    """
+    key = os.path.normcase(os.path.abspath(dbPath))
+    with _indexesLock:
+        index = _indexes.get(key)
+        if index is None:
+            index = projectIndex(dbPath)
+            _indexes[key] = index
+        return index
@@ -0,0 +1,271 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from .jsonUtils import readJson, atomicWriteJson
+
+try:
+    import fcntl
+except ImportError: # Windows
+    fcntl = None
+    import msvcrt
+
+
+_heldLocks = threading.local() # lock paths the current thread holds exclusively
+
+
+@contextmanager
+def fileLock(lockPath, timeout=30.0, shared=False):
+    """
+    Advisory lock on lockPath, shared between processes and machines that honour it
+    (flock on Linux / macOS, msvcrt.locking on Windows). Exclusive by default, with shared
+    any number of readers can hold it at once (Windows has no shared mode, readers take
+    turns). A shared lock never creates the lock file: without one nothing has written
+    under the lock yet, so there is nothing to wait for. A thread already holding the
+    exclusive lock gets it again straight away, so locked code can call read().
+    """
+    lockPath = Path(lockPath)
+    key = os.path.normcase(os.path.abspath(lockPath))
+    held = getattr(_heldLocks, "paths", None)
+    if held is None:
+        held = _heldLocks.paths = set()
+    if key in held:
+        yield
+        return
+
+    if shared:
+        try:
+            lockFile = open(lockPath, "r")
+        except OSError:
+            lockFile = None # no lock file yet, or a read only share
+        if lockFile is None:
+            yield
+            return
+    else:
+        lockPath.parent.mkdir(parents=True, exist_ok=True)
+        lockFile = open(lockPath, "a+")
+
+    with lockFile:
+        if fcntl is not None:
+            fcntl.flock(lockFile.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    lockFile.seek(0)
+                    msvcrt.locking(lockFile.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"Timed out waiting for lock {lockPath}")
+                    time.sleep(0.05)
+        if not shared:
+            held.add(key)
+        try:
+            yield
+        finally:
+            held.discard(key)
+            if fcntl is not None:
+                fcntl.flock(lockFile.fileno(), fcntl.LOCK_UN)
+            else:
+                lockFile.seek(0)
+                msvcrt.locking(lockFile.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def applyRecord(data, record):
+    """
+    Replays one journal record onto a project document. Every record is idempotent so
+    replaying a journal that was already compacted (crash between the two steps) is harmless.
+    """
+    op = record.get("op")
+    files = data.setdefault("Files", {})
+
+    if op == "file":
+        files.setdefault(record["file"], {
+            "version": f"v{0:03}",
+            "author": record.get("author", ""),
+            "created": record.get("created", ""),
+            "modified": record.get("created", ""),
+        })
+
+    elif op == "version":
+        fileData = files.setdefault(record["file"], {
+            "version": f"v{0:03}",
+            "author": record.get("author", ""),
+            "created": record.get("modified", ""),
+            "modified": record.get("modified", ""),
+        })
+        current = int(fileData.get("version", "v000").lstrip("v") or 0)
+        if record["version"] >= current:
+            fileData["version"] = f"v{record['version']:03}"
+            fileData["modified"] = record.get("modified", "")
+
+    elif op == "tag":
+        fileData = files.get(record["file"])
+        if fileData is not None:
+            tagged = set(fileData.get("tagged", []))
+            if record.get("tagged", True):
+                tagged.add(record["version"])
+            else:
+                tagged.discard(record["version"])
+            fileData["tagged"] = sorted(tagged)
+    return data
+
+
+class projectJournal:
+    """
+    Journaled storage for one project folder.
+
+    <project>_Project.json is the last compacted snapshot and <project>_Project.journal
+    holds one JSON record per line for every save since. Saves append a single small
+    record under an advisory lock instead of rewriting the whole document, readers replay
+    the journal on top of the snapshot, and compaction folds the journal back into the
+    snapshot (in the background once it grows past compactAfter records).
+    """
+
+    def __init__(self, projectFolder, project=None, compactAfter=64):
+        self.projectFolder = Path(projectFolder)
+        self.project = project or self.projectFolder.name
+        self.snapshotPath = self.projectFolder / f"{self.project}_Project.json"
+        self.journalPath = self.projectFolder / f"{self.project}_Project.journal"
+        self.lockPath = self.projectFolder / f"{self.project}_Project.lock"
+        self.compactAfter = compactAfter
+
+    # -----------------------------------------------------------------
+    # Reading
+    # -----------------------------------------------------------------
+
+    def readRecords(self):
+        try:
+            with open(self.journalPath, "r") as file:
+                lines = file.read().split("\n")
+        except FileNotFoundError:
+            return []
+
+        records = []
+        for line in lines:
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                pass # torn last line from a crashed writer, it was never acknowledged
+        return records
+
+    def read(self):
+        """
+        Returns the current project document: the snapshot with the journal replayed on top.
+        None if the project doesn't exist. Holds the lock shared, so a compaction can't
+        swap the snapshot and empty the journal between the two reads.
+        """
+        with fileLock(self.lockPath, shared=True):
+            try:
+                data = readJson(self.snapshotPath)
+            except FileNotFoundError:
+                data = None
+            records = self.readRecords()
+
+        if data is None and not records:
+            return None
+        data = data or {"ProjectData": {"project": self.project}, "Files": {}}
+        for record in records:
+            applyRecord(data, record)
+        return data
+
+    # -----------------------------------------------------------------
+    # Writing
+    # -----------------------------------------------------------------
+
+    def append(self, records):
+        """
+        Appends records to the journal. Call with the lock held.
+        """
+        self.projectFolder.mkdir(parents=True, exist_ok=True)
+        payload = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+        with open(self.journalPath, "a") as file:
+            file.write(payload)
+            file.flush()
+            os.fsync(file.fileno())
+        try:
+            # appending doesn't change the folder mtime, bump it so watchers and the
+            # scan snapshot notice the save
+            os.utime(self.projectFolder, None)
+        except OSError:
+            pass
+
+    def commitVersion(self, filename, author, now):
+        """
+        Creates the project / file if needed and appends the next version of filename,
+        all under the project lock so concurrent saves never hand out the same version.
+
+        Returns:
+            str: The new version string (eg "v004")
+        """
+        with fileLock(self.lockPath):
+            data = self.read()
+            records = []
+            if data is None:
+                # the snapshot doubles as the "this folder is a project" marker
+                data = {"ProjectData": {"project": self.project, "author": author, "created": now}, "Files": {}}
+                atomicWriteJson(self.snapshotPath, data)
+            if filename not in data.get("Files", {}):
+                records.append({"op": "file", "file": filename, "author": author, "created": now})
+                current = 0
+            else:
+                current = int(data["Files"][filename]["version"].lstrip("v") or 0)
+
+            newVersion = current + 1
+            records.append({"op": "version", "file": filename, "version": newVersion,
+                            "author": author, "modified": now})
+            self.append(records)
+            journalLength = len(self.readRecords())
+
+        if journalLength >= self.compactAfter:
+            self.compactInBackground()
+        return f"v{newVersion:03}"
+
+    def tagVersion(self, filename, version, tagged=True):
+        """
+        Marks (or unmarks) a version of filename as tagged, tagged versions survive retention.
+        """
+        with fileLock(self.lockPath):
+            self.append([{"op": "tag", "file": filename, "version": int(version), "tagged": tagged}])
+
+    def write(self, data):
+        """
+        Replaces the snapshot with data and drops the journal it already contains.
+        Call with the lock held.
+        """
+        atomicWriteJson(self.snapshotPath, data)
+        if self.journalPath.exists():
+            with open(self.journalPath, "w"):
+                pass
+
+    def compact(self):
+        """
+        Folds the journal into the snapshot: write the replayed document atomically, then
+        empty the journal. A crash in between only means some records get replayed twice.
+        """
+        with fileLock(self.lockPath):
+            if not self.journalPath.exists():
+                return False
+            data = self.read()
+            if data is None:
+                return False
+            self.write(data)
+            return True
+
+    def compactInBackground(self):
+        thread = threading.Thread(target=self.compact, name=f"compact {self.project}", daemon=True)
+        thread.start()
+        return thread
+
+
+def readProject(projectFolder, project=None):
+    """
+    Reads a project document whether or not it has a journal, None if it doesn't exist.
+    """
+    return projectJournal(projectFolder, project).read()
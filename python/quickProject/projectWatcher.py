@@ -0,0 +1,133 @@
+import os
+from pathlib import Path
+
+try:
+    from PySide2 import QtCore
+except Exception:
+    from PySide6 import QtCore
+
+
+class projectWatcher(QtCore.QObject):
+    """
+    Watches the project roots and every project folder and reports what changed.
+
+    QFileSystemWatcher is used where it works (inotify on Linux, ReadDirectoryChangesW on
+    Windows). Folders it refuses to watch, or everything when watchMode is "poll" (eg SMB
+    shares where remote saves raise no events), are polled for mtime changes instead.
+    Bursts of events are debounced into one homeChanged / projectsChanged emit.
+    """
+
+    homeChanged = QtCore.Signal() # a project was added to or removed from a root
+    projectsChanged = QtCore.Signal(list) # project names whose folder changed
+
+    def __init__(self, homeDirs, mode="auto", debounceMs=500, pollSeconds=10, parent=None, folderOf=None):
+        """
+        Args:
+            homeDirs (list): root folders, a single path works too
+            folderOf (callable): projectName -> project folder, the first root / name when None
+        """
+        super().__init__(parent)
+        self.mode = mode
+        if isinstance(homeDirs, (str, os.PathLike)):
+            homeDirs = [homeDirs]
+        self.homeDirs = [Path(homeDir) for homeDir in homeDirs]
+        self.folderOf = folderOf or (lambda projectName: self.homeDirs[0] / projectName)
+        self.pending = set()
+        self.polled = {} # path -> last seen mtime_ns
+
+        self.watcher = QtCore.QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.onDirectoryChanged)
+
+        self.debounce = QtCore.QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.setInterval(debounceMs)
+        self.debounce.timeout.connect(self.flush)
+
+        self.pollTimer = QtCore.QTimer(self)
+        self.pollTimer.setInterval(int(pollSeconds * 1000))
+        self.pollTimer.timeout.connect(self.poll)
+
+        if self.mode != "off":
+            for homeDir in self.homeDirs:
+                self.watchPath(homeDir)
+
+    def stop(self):
+        self.debounce.stop()
+        self.pollTimer.stop()
+        paths = self.watcher.directories()
+        if paths:
+            self.watcher.removePaths(paths)
+        self.polled.clear()
+        self.pending.clear()
+
+    # -----------------------------------------------------------------
+    # Watched paths
+    # -----------------------------------------------------------------
+
+    def watchPath(self, path):
+        path = str(path)
+        if path in self.polled or path in self.watcher.directories():
+            return
+        if self.mode == "auto" and self.watcher.addPath(path):
+            return
+
+        # polling fallback
+        try:
+            self.polled[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            return
+        if not self.pollTimer.isActive():
+            self.pollTimer.start()
+
+    def unwatchPath(self, path):
+        path = str(path)
+        self.polled.pop(path, None)
+        if path in self.watcher.directories():
+            self.watcher.removePath(path)
+
+    def watchProjects(self, projectNames):
+        if self.mode == "off":
+            return
+        for projectName in projectNames:
+            self.watchPath(self.folderOf(projectName))
+
+    def unwatchProjects(self, projectNames):
+        for projectName in projectNames:
+            self.unwatchPath(self.folderOf(projectName))
+
+    # -----------------------------------------------------------------
+    # Events
+    # -----------------------------------------------------------------
+
+    def onDirectoryChanged(self, path):
+        self.pending.add(path)
+        self.debounce.start() # restarts the timer, so a burst of saves becomes one refresh
+
+    def poll(self):
+        for path, mtime in list(self.polled.items()):
+            try:
+                newMtime = os.stat(path).st_mtime_ns
+            except OSError:
+                newMtime = None
+            if newMtime != mtime:
+                self.polled[path] = newMtime
+                self.onDirectoryChanged(path)
+
+    def flush(self):
+        pending, self.pending = self.pending, set()
+        homeDirs = {os.path.normcase(str(homeDir)) for homeDir in self.homeDirs}
+
+        projects = set()
+        homeChanged = False
+        for path in pending:
+            path = Path(path)
+            if os.path.normcase(str(path)) in homeDirs:
+                homeChanged = True
+            elif os.path.normcase(str(path.parent)) in homeDirs:
+                projects.add(path.name)
+
+        if homeChanged:
+            self.homeChanged.emit() # once, even when several roots changed
+
+        if projects:
+            self.projectsChanged.emit(sorted(projects))
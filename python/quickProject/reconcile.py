@@ -0,0 +1,155 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .versionScan import scanProjectFolder
+from .projectJournal import projectJournal, fileLock
+
+
+TIME_FORMAT = "%d-%m-%Y %H:%M:%S"
+
+
+def versionNumber(version):
+    try:
+        return int(str(version).lstrip("v") or 0)
+    except ValueError:
+        return None
+
+
+def stamp(epoch):
+    return time.strftime(TIME_FORMAT, time.localtime(epoch))
+
+
+def recentlyModified(fileData, now, graceSeconds):
+    """
+    True when the JSON entry was touched within graceSeconds. commitVersion bumps the
+    version before the hip is written, so a JSON ahead of the disk may just be a save in flight.
+    """
+    try:
+        modified = time.mktime(time.strptime(fileData.get("modified", ""), TIME_FORMAT))
+    except (TypeError, ValueError, OverflowError):
+        return False
+    return now - modified < graceSeconds
+
+
+def reconcileFiles(data, versionMap, author="", now=None, graceSeconds=600):
+    """
+    Repairs data["Files"] in place so it matches the hip files on disk:
+
+        added     hips on disk the JSON doesn't track get an entry at their latest version
+        updated   the JSON version is moved to the latest version on disk
+        removed   entries whose hips are all gone are dropped
+
+    Versions / entries the JSON has ahead of the disk are left alone while they are newer
+    than graceSeconds, someone may be saving them right now.
+
+    Returns:
+        list: [{"file", "change", "before", "after"}, ...]
+    """
+    now = time.time() if now is None else now
+    files = data.setdefault("Files", {})
+    changes = []
+
+    for fileName in sorted(set(files) | set(versionMap)):
+        versions = versionMap.get(fileName, {})
+        fileData = files.get(fileName)
+        latest = max(versions) if versions else 0
+
+        if fileData is None:
+            files[fileName] = {
+                "version": f"v{latest:03}",
+                "author": author,
+                "created": stamp(min(v["mtime"] for v in versions.values())),
+                "modified": stamp(versions[latest]["mtime"]),
+            }
+            changes.append({"file": fileName, "change": "added", "before": None, "after": f"v{latest:03}"})
+            continue
+
+        current = versionNumber(fileData.get("version", "v000"))
+        if current == latest:
+            continue
+        if current is not None and current > latest and recentlyModified(fileData, now, graceSeconds):
+            continue
+        if not versions:
+            if current == 0:
+                continue # added to the project but never saved yet
+            del files[fileName]
+            changes.append({"file": fileName, "change": "removed", "before": fileData.get("version"), "after": None})
+            continue
+
+        before = fileData.get("version")
+        fileData["version"] = f"v{latest:03}"
+        fileData["modified"] = stamp(versions[latest]["mtime"])
+        if fileData.get("tagged"):
+            fileData["tagged"] = [v for v in fileData["tagged"] if v in versions]
+        changes.append({"file": fileName, "change": "updated", "before": before, "after": f"v{latest:03}"})
+    return changes
+
+
+def reconcileFolder(projectFolder, project, author="", dryRun=False, graceSeconds=600):
+    """
+    Reconciles one project folder. The folder is checked without any lock first, only a
+    project that needs repairs is then re-read, re-listed, repaired and written under the
+    project lock, so concurrent saves are never lost and healthy projects cost no locking.
+
+    Returns:
+        (list, dict): the changes and the repaired project document (None if there is none)
+    """
+    projectFolder = os.fspath(projectFolder)
+    journal = projectJournal(projectFolder, project)
+    data = journal.read()
+    if data is None:
+        return [], None
+    changes = reconcileFiles(data, scanProjectFolder(projectFolder, project), author, graceSeconds=graceSeconds)
+    if dryRun or not changes:
+        return changes, data
+
+    with fileLock(journal.lockPath):
+        data = journal.read()
+        if data is None:
+            return [], None
+        changes = reconcileFiles(data, scanProjectFolder(projectFolder, project), author, graceSeconds=graceSeconds)
+        if changes:
+            journal.write(data)
+    return changes, data
+
+
+def iterReconcile(projectFolders, author="", dryRun=False, workers=None, isCancelled=None,
+                  graceSeconds=600):
+    """
+    Reconciles projects [(projectName, projectFolder), ...] on a thread pool. Listing
+    folders and reading JSON is almost all waiting on the disk, so threads overlap it
+    well even on a network share, and projects from several roots can share one pool.
+
+    Yields:
+        (projectName, changes, data) as each project finishes, in no particular order
+    """
+    workers = workers or min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reconcile") as pool:
+        futures = {}
+        pending = iter(projectFolders)
+
+        def submit():
+            project, folder = next(pending, (None, None))
+            if project is not None:
+                future = pool.submit(reconcileFolder, folder, project, author, dryRun, graceSeconds)
+                futures[future] = project
+
+        # keep a bounded number in flight so cancelling stops quickly
+        for _ in range(workers * 2):
+            submit()
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            future = done.pop()
+            project = futures.pop(future)
+            try:
+                changes, data = future.result()
+            except Exception as e:
+                print(f"Reconcile failed for {project}: {e}")
+                changes, data = [], None
+            yield project, changes, data
+            if isCancelled is not None and isCancelled():
+                for future in futures:
+                    future.cancel()
+                return
+            submit()
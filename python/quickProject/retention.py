@@ -0,0 +1,148 @@
+import os
+import threading
+import time
+
+from .versionScan import scanProjectFolder
+
+
+def effectivePolicy(data, defaultPolicy=None):
+    """
+    A project's retention policy: "retention" in its ProjectData if set, otherwise the
+    global one from the settings. Empty / None means keep everything.
+
+    Policy keys (all optional, a version is kept if any of them keeps it):
+        keepLast (int): keep the newest N versions of every file
+        dailyAfterDays (int): keep everything newer than this many days, older versions
+            only keep the newest one of each day
+        keepTagged (bool): never remove versions listed in the file's "tagged" (default True)
+    """
+    projectPolicy = (data or {}).get("ProjectData", {}).get("retention")
+    if projectPolicy is not None:
+        return projectPolicy
+    return defaultPolicy or {}
+
+
+def prunableVersions(versions, policy, tagged=(), now=None):
+    """
+    Returns the versions (dicts with "version" and "mtime") the policy doesn't keep,
+    oldest first. The latest version of a file is always kept.
+    """
+    if not policy or not versions:
+        return []
+    now = time.time() if now is None else now
+    ordered = sorted(versions, key=lambda v: v["version"])
+    keep = {ordered[-1]["version"]}
+    hasRule = False
+
+    keepLast = policy.get("keepLast")
+    if keepLast:
+        hasRule = True
+        keep.update(v["version"] for v in ordered[-int(keepLast):])
+
+    dailyAfterDays = policy.get("dailyAfterDays")
+    if dailyAfterDays is not None:
+        hasRule = True
+        cutoff = now - float(dailyAfterDays) * 86400
+        newestOfDay = {}
+        for v in ordered:
+            if v["mtime"] >= cutoff:
+                keep.add(v["version"])
+            else:
+                newestOfDay[time.localtime(v["mtime"])[:3]] = v["version"] # ascending, the last one wins
+        keep.update(newestOfDay.values())
+
+    if not hasRule:
+        return []
+    if policy.get("keepTagged", True):
+        keep.update(int(v) for v in tagged)
+    return [v for v in ordered if v["version"] not in keep]
+
+
+def pruneFolder(projectFolder, project, data, policy, dryRun=False, now=None):
+    """
+    Applies policy to every hip in one project folder (one listing) and deletes what it
+    doesn't keep. With dryRun nothing is deleted.
+
+    Returns:
+        list: [(fileName, versionDict), ...] removed (or that would be removed)
+    """
+    if not policy:
+        return []
+    files = (data or {}).get("Files", {})
+    removed = []
+    for fileName, versions in sorted(scanProjectFolder(projectFolder, project).items()):
+        tagged = files.get(fileName, {}).get("tagged", ())
+        for versionData in prunableVersions(list(versions.values()), policy, tagged, now):
+            if not dryRun:
+                try:
+                    os.remove(os.path.join(projectFolder, versionData["name"]))
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    print(f"Failed to remove {versionData['name']}: {e}")
+                    continue
+            removed.append((fileName, versionData))
+    return removed
+
+
+class retentionPruner:
+    """
+    Applies retention on a background thread, batchSize projects at a time with a short
+    pause in between so a big sweep doesn't hog a shared file server. Projects requested
+    while a pass is running are picked up by the same thread.
+    """
+
+    def __init__(self, batchSize=20, pause=0.1):
+        self.batchSize = batchSize
+        self.pause = pause
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self, projects, prune):
+        """
+        Queues projects to be pruned with prune(projectName). Returns the worker thread.
+        """
+        with self._lock:
+            for project in projects:
+                self._pending[project] = prune
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._work, name="retention", daemon=True)
+                self._thread.start()
+            return self._thread
+
+    def _work(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+                batch = list(self._pending.items())[:self.batchSize]
+                for project, _ in batch:
+                    del self._pending[project]
+
+            for project, prune in batch:
+                try:
+                    prune(project)
+                except Exception as e:
+                    print(f"Retention failed for {project}: {e}")
+            time.sleep(self.pause)
+
+    def isRunning(self):
+        with self._lock:
+            return self._thread is not None
+
+
+_pruner = None
+_prunerLock = threading.Lock()
+
+
+def getPruner():
+    """
+    Returns the session's shared retentionPruner.
+    """
+    global _pruner
+    with _prunerLock:
+        if _pruner is None:
+            _pruner = retentionPruner()
+        return _pruner
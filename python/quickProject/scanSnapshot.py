@@ -0,0 +1,47 @@
+import os
+from pathlib import Path
+
+from .jsonUtils import readJson, atomicWriteJson
+
+
+SNAPSHOT_FORMAT = 2
+
+
+class scanSnapshot:
+    """
+    The result of the last scan of the project roots, kept in ALTools/ScanSnapshot.json.
+
+    The panel paints straight from it on open and a background scan then only re-reads
+    project folders whose mtime differs from the one stored here.
+
+    Layout:
+        {"format": 2, "roots": ["...", ...], "projects": {name: {"root": "Home", "mtime": ns, "Files": {...}}}}
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def load(self, rootPaths):
+        """
+        Returns {projectName: {"root": str, "mtime": int, "Files": dict}} for the root folders
+        rootPaths, or {} when there is no usable snapshot (missing, unreadable, other format
+        or other roots).
+        """
+        try:
+            data = readJson(self.path)
+        except (OSError, ValueError):
+            return {}
+        if data.get("format") != SNAPSHOT_FORMAT or data.get("roots") != [os.fspath(path) for path in rootPaths]:
+            return {}
+        return data.get("projects", {})
+
+    def save(self, rootPaths, projects):
+        data = {
+            "format": SNAPSHOT_FORMAT,
+            "roots": [os.fspath(path) for path in rootPaths],
+            "projects": projects,
+        }
+        try:
+            atomicWriteJson(self.path, data, indent=None)
+        except OSError as e:
+            print(f"Failed to write scan snapshot {self.path}: {e}")
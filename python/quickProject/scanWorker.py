@@ -0,0 +1,58 @@
+import threading
+import traceback
+
+from ALToolsProfiler import traced
+
+try:
+    from PySide2 import QtCore
+except Exception:
+    from PySide6 import QtCore
+
+
+class scanSignals(QtCore.QObject):
+    projectsFound = QtCore.Signal(list) # [(projectName, filesDict or None if removed), ...]
+    finished = QtCore.Signal()
+    failed = QtCore.Signal(str)
+
+
+class projectScanWorker(QtCore.QRunnable):
+    """
+    Runs a project scan on a QThreadPool thread and streams the projects back to the
+    GUI thread in batches through signals, so the panel never waits on the disk.
+
+    scan is a callable taking an isCancelled function and returning an iterable of
+    (projectName, filesDict) pairs, eg quickProjectLogic.iterProjects.
+    """
+
+    def __init__(self, scan, batchSize=25):
+        super().__init__()
+        self.scan = scan
+        self.batchSize = batchSize
+        self.signals = scanSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def isCancelled(self):
+        return self._cancelled.is_set()
+
+    @traced("quickProject.scan")
+    def run(self):
+        try:
+            batch = []
+            for project in self.scan(self.isCancelled):
+                if self.isCancelled():
+                    return
+                batch.append(project)
+                if len(batch) >= self.batchSize:
+                    self.signals.projectsFound.emit(batch)
+                    batch = []
+
+            if batch and not self.isCancelled():
+                self.signals.projectsFound.emit(batch)
+        except Exception:
+            self.signals.failed.emit(traceback.format_exc())
+        finally:
+            if not self.isCancelled():
+                self.signals.finished.emit()
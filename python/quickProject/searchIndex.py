@@ -0,0 +1,676 @@
+import bisect
+import re
+import time
+from datetime import datetime
+
+
+TOKEN_SPLIT = re.compile(r"[^0-9a-z]+")
+SINCE_PATTERN = re.compile(r"^(\d+)([hdwm])$")
+VERSION_TERM = re.compile(r"^(?:(.+?)_)?v(\d+)$") # "v12", "fx_v012"
+
+
+def tokenize(text):
+    """
+    "Shot_010 FX" -> {"shot_010 fx", "shot", "010", "fx"}, the whole lowered name is kept
+    as a token too so queries like "shot_0" still prefix match.
+    """
+    text = str(text).lower()
+    tokens = {part for part in TOKEN_SPLIT.split(text) if part}
+    if text:
+        tokens.add(text)
+    return tokens
+
+
+def trigrams(token):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+def parseTime(value):
+    """
+    Turns the "%d-%m-%Y %H:%M:%S" timestamps from the project JSON into epoch seconds.
+    """
+    if not value:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        # fixed layout, slicing is a lot cheaper than strptime for 100k entries
+        return datetime(int(value[6:10]), int(value[3:5]), int(value[0:2]),
+                        int(value[11:13]), int(value[14:16]), int(value[17:19])).timestamp()
+    except (ValueError, TypeError):
+        return None
+
+
+def latestVersion(fileData):
+    """
+    A file's newest version number: the newest on disk when the scan sized it, otherwise
+    the one in the project JSON ("v012" -> 12).
+    """
+    latest = fileData.get("latest")
+    if latest is not None:
+        return int(latest)
+    try:
+        return int(str(fileData.get("version", "")).lstrip("v") or 0)
+    except ValueError:
+        return 0
+
+
+def parseSince(value, now=None):
+    """
+    "7d", "12h", "2w", "1m" or a date ("2025-10-01" / "01-10-2025") -> epoch seconds.
+    """
+    now = time.time() if now is None else now
+    match = SINCE_PATTERN.match(value.lower())
+    if match:
+        amount = int(match[1])
+        unit = {"h": 3600, "d": 86400, "w": 7 * 86400, "m": 30 * 86400}[match[2]]
+        return now - amount * unit
+    for fmt in ("%Y-%m-%d", "%d-%m-%Y", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(value, fmt).timestamp()
+        except ValueError:
+            pass
+    return None
+
+
+def parseQuery(text):
+    """
+    Splits the search box text into free text terms and the author: / since: / before: filters.
+
+        parseQuery("fx author:jack since:7d") -> (["fx"], "jack", <epoch>, None)
+    """
+    terms = []
+    author = since = before = None
+    for part in text.split():
+        key, _, value = part.partition(":")
+        key = key.lower()
+        if value and key == "author":
+            author = value.lower()
+        elif value and key == "since":
+            since = parseSince(value)
+        elif value and key == "before":
+            before = parseSince(value)
+        else:
+            terms.append(part.lower())
+    return terms, author, since, before
+
+
+class nameIndex:
+    """
+    Prefix trie plus trigram postings over a set of unique names (project or file names).
+
+    Names shared by many entries (every project has a "fx" file) are only indexed once,
+    lookups return names which the searchIndex expands to entries.
+    """
+
+    def __init__(self, maxDepth=16):
+        self.maxDepth = maxDepth
+        self.trie = {}
+        self.grams = {}
+        self.counts = {} # name -> number of entries using it
+
+    def add(self, name):
+        count = self.counts.get(name, 0)
+        self.counts[name] = count + 1
+        if count:
+            return
+        for token in tokenize(name):
+            node = self.trie
+            for char in token[:self.maxDepth]:
+                node = node.setdefault(char, {})
+                node.setdefault(None, set()).add(name) # None key holds the names below this prefix
+            for gram in trigrams(token):
+                self.grams.setdefault(gram, set()).add(name)
+
+    def remove(self, name):
+        count = self.counts.get(name, 0) - 1
+        if count > 0:
+            self.counts[name] = count
+            return
+        self.counts.pop(name, None)
+        for token in tokenize(name):
+            node = self.trie
+            for char in token[:self.maxDepth]:
+                node = node.get(char)
+                if node is None:
+                    break
+                node[None].discard(name)
+            for gram in trigrams(token):
+                names = self.grams.get(gram)
+                if names is not None:
+                    names.discard(name)
+                    if not names:
+                        del self.grams[gram]
+
+    def prefix(self, term):
+        node = self.trie
+        for char in term[:self.maxDepth]:
+            node = node.get(char)
+            if node is None:
+                return set()
+        names = node.get(None, set())
+        if len(term) > self.maxDepth:
+            names = {name for name in names if term in name.lower()}
+        return names
+
+    def fuzzy(self, term, threshold=0.5):
+        """
+        Names sharing at least threshold of the term's trigrams, catches typos.
+        """
+        grams = trigrams(term)
+        if not grams:
+            return set()
+        counts = {}
+        for gram in grams:
+            for name in self.grams.get(gram, ()):
+                counts[name] = counts.get(name, 0) + 1
+        needed = max(1, int(len(grams) * threshold + 0.5))
+        return {name for name, count in counts.items() if count >= needed}
+
+    def match(self, term):
+        names = self.prefix(term)
+        if not names and len(term) >= 3:
+            names = self.fuzzy(term)
+        return names
+
+
+# how many of a project's files pass a condition, from its summary alone
+NO_FILE, SOME_FILE, EVERY_FILE = range(3)
+
+
+def timeBounds(since, before):
+    return (since if since is not None else float("-inf"),
+            before if before is not None else float("inf"))
+
+
+def anyInRange(times, low, high):
+    """
+    times are sorted, is any of them in [low, high)
+    """
+    index = bisect.bisect_left(times, low)
+    return index < len(times) and times[index] < high
+
+
+def allInRange(info, low, high):
+    """
+    Every file of the project summary info has a time in [low, high).
+    """
+    return info["newest"] is not None and info["dated"] and low <= info["oldest"] and info["newest"] < high
+
+
+def inRange(times, values, low, high):
+    """
+    The values in [low, high), values are ordered like the sorted times.
+    """
+    return values[bisect.bisect_left(times, low):bisect.bisect_left(times, high)]
+
+
+class searchCondition:
+    """
+    One search term or filter.
+
+        accepts(entry)              a single file (project, fileName, author, mtime, latestVersion)
+        state(project, info)        NO_FILE / SOME_FILE / EVERY_FILE of a project,
+                                    from its summary (see searchIndex.summarize)
+        candidates(project, info)   names of the project's passing files, only asked for
+                                    projects whose state is SOME_FILE
+        projects()                  the projects that can have a passing file, None for any
+    """
+
+    def __init__(self, accepts, state, candidates, projects=None, version=None, byName=None):
+        self.accepts = accepts
+        self.state = state
+        self.candidates = candidates
+        self.projects = projects or (lambda: None)
+        self.version = version # a version term: only that version row is shown
+        self.byName = byName # entry passes through its project / file name, so every version shows
+
+    def acceptsVersion(self, entry, version):
+        return self.version is None or version == self.version or self.byName(entry)
+
+
+class searchResult:
+    """
+    projects: project rows to show
+    wholeProjects: projects whose name matched every term, all of their files are shown
+    Files (and, with a version term, version rows) are checked against the conditions
+    when the tree asks for them, so a search never builds per file sets.
+    """
+
+    def __init__(self, index, conditions):
+        self.index = index
+        self.conditions = conditions
+        self.projects = set()
+        self.wholeProjects = set()
+
+    def acceptsProject(self, project):
+        return project in self.projects
+
+    def entry(self, project, fileName):
+        entryId = self.index.fileIds.get((project, fileName))
+        return self.index.entries[entryId] if entryId is not None else None
+
+    def acceptsFile(self, project, fileName):
+        if project in self.wholeProjects:
+            return True
+        if project not in self.projects:
+            return False
+        entry = self.entry(project, fileName)
+        return entry is not None and all(condition.accepts(entry) for condition in self.conditions)
+
+    def acceptsVersion(self, project, fileName, version):
+        entry = self.entry(project, fileName)
+        if entry is None:
+            return True
+        return all(condition.acceptsVersion(entry, version) for condition in self.conditions)
+
+
+class searchIndex:
+    """
+    In memory search over every project, file and version seen by the scans.
+
+    Project and file names go into prefix tries (with trigram fuzzy fallback) and every
+    project keeps a summary of its files: names, files by modified time (also per author)
+    and the highest version. Lookups from file names and authors to projects, the modified
+    times of each file name and the projects ordered by their oldest / newest file cut a
+    query down to the projects that can match, which are then decided from their
+    summaries. Only projects where several terms have to hold on the same file intersect
+    the files each one names, so it stays at a few milliseconds with 100k files.
+    Versions are the range v001 to a file's latest, "v12" or "fx_v012" find the files
+    that have that version.
+    Updates replace one project at a time to follow the incremental tree updates.
+    """
+
+    def __init__(self):
+        self.entries = {} # id -> (project, fileName, author, mtime, latestVersion)
+        self.fileIds = {} # (project, fileName) -> id
+        self.projectEntries = {} # project -> set of ids
+        self.projectInfo = {} # project -> summary of its files, see summarize()
+        self.nameProjects = {} # fileName -> set of projects
+        self.authorProjects = {} # author -> set of projects
+        self.nameTimes = {} # fileName -> ([mtime, ...], [project, ...]) sorted by time
+        self.dateOrder = None # projects by oldest / newest file, rebuilt after changes
+        self.projectNames = nameIndex()
+        self.fileNames = nameIndex()
+        self.nextId = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        self.__init__()
+
+    # -----------------------------------------------------------------
+    # Updating
+    # -----------------------------------------------------------------
+
+    def updateProject(self, project, filesDict):
+        """
+        Replaces everything indexed for project. filesDict None removes the project.
+        """
+        self.removeProject(project)
+        if filesDict is None:
+            return
+
+        self.projectNames.add(project)
+        ids = self.projectEntries.setdefault(project, set())
+        entries = []
+        for fileName, fileData in filesDict.items():
+            entryId = self.nextId
+            self.nextId += 1
+            author = str(fileData.get("author", "")).lower()
+            entry = (project, fileName, author, parseTime(fileData.get("modified")), latestVersion(fileData))
+
+            entries.append(entry)
+            self.entries[entryId] = entry
+            self.fileIds[(project, fileName)] = entryId
+            ids.add(entryId)
+            self.fileNames.add(fileName)
+
+        info = self.summarize(entries)
+        self.projectInfo[project] = info
+        for fileName in info["names"]:
+            self.nameProjects.setdefault(fileName, set()).add(project)
+        for author in info["byAuthor"]:
+            self.authorProjects.setdefault(author, set()).add(project)
+        for mtime, fileName in zip(info["times"], info["timeNames"]):
+            times, projects = self.nameTimes.setdefault(fileName, ([], []))
+            index = bisect.bisect_right(times, mtime)
+            times.insert(index, mtime)
+            projects.insert(index, project)
+        self.dateOrder = None
+
+    def summarize(self, entries):
+        """
+        What a search needs to know about a project's files without looking at each one.
+        """
+        byTime = sorted((entry[3], entry[1], entry[2]) for entry in entries if entry[3] is not None)
+        byVersion = sorted((entry[4], entry[1]) for entry in entries)
+        byAuthor = {}
+        for mtime, fileName, author in byTime:
+            times, names = byAuthor.setdefault(author, ([], []))
+            times.append(mtime)
+            names.append(fileName)
+        for entry in entries:
+            if entry[3] is None:
+                byAuthor.setdefault(entry[2], ([], []))[1].append(entry[1]) # after the dated ones
+        return {
+            "names": {entry[1] for entry in entries},
+            "byAuthor": byAuthor, # author -> (times, file names), oldest first like times / timeNames
+            "times": [mtime for mtime, _, _ in byTime], # oldest first, files without a time left out
+            "timeNames": [fileName for _, fileName, _ in byTime],
+            "oldest": byTime[0][0] if byTime else None,
+            "newest": byTime[-1][0] if byTime else None,
+            "dated": len(byTime) == len(entries),
+            "versions": [latest for latest, _ in byVersion], # lowest first
+            "versionNames": [fileName for _, fileName in byVersion],
+            "latest": byVersion[-1][0] if byVersion else 0,
+        }
+
+    def removeProject(self, project):
+        ids = self.projectEntries.pop(project, None)
+        if ids is None:
+            return
+        info = self.projectInfo.pop(project)
+        for fileName in info["names"]:
+            self.discard(self.nameProjects, fileName, project)
+        for author in info["byAuthor"]:
+            self.discard(self.authorProjects, author, project)
+        for mtime, fileName in zip(info["times"], info["timeNames"]):
+            times, projects = self.nameTimes[fileName]
+            index = bisect.bisect_left(times, mtime)
+            while projects[index] != project:
+                index += 1
+            del times[index], projects[index]
+            if not times:
+                del self.nameTimes[fileName]
+        self.dateOrder = None
+
+        self.projectNames.remove(project)
+        for entryId in ids:
+            _, fileName, _, _, _ = self.entries.pop(entryId)
+            self.fileIds.pop((project, fileName), None)
+            self.fileNames.remove(fileName)
+
+    def discard(self, mapping, key, value):
+        values = mapping.get(key)
+        if values is not None:
+            values.discard(value)
+            if not values:
+                del mapping[key]
+
+    def datedProjects(self):
+        """
+        (newest times, projects), (oldest times, projects), both sorted by time.
+        """
+        if self.dateOrder is None:
+            dated = [(info["oldest"], info["newest"], project)
+                     for project, info in self.projectInfo.items() if info["newest"] is not None]
+            byNewest = sorted((newest, project) for _, newest, project in dated)
+            byOldest = sorted((oldest, project) for oldest, _, project in dated)
+            self.dateOrder = (([time for time, _ in byNewest], [project for _, project in byNewest]),
+                              ([time for time, _ in byOldest], [project for _, project in byOldest]))
+        return self.dateOrder
+
+    def projectsInRange(self, since, before):
+        """
+        The projects whose files span times overlapping [since, before).
+        """
+        low, high = timeBounds(since, before)
+        (newestTimes, byNewest), (oldestTimes, byOldest) = self.datedProjects()
+        found = set(byNewest[bisect.bisect_left(newestTimes, low):])
+        if before is not None:
+            found.intersection_update(byOldest[:bisect.bisect_left(oldestTimes, high)])
+        return found
+
+    # -----------------------------------------------------------------
+    # Searching
+    # -----------------------------------------------------------------
+
+    def termCondition(self, field, term, since=None, before=None):
+        """
+        A file passes a term if its project's name or its own name matches, or for a
+        version term ("v12", "fx_v012") if it has that version (and the rest matches).
+        With since / before (plain terms only) the file also has to be modified in that
+        range, the time buckets of the matching names give the projects that have one.
+        """
+        projects = self.projectNames.match(term) if field in ("any", "project") else set()
+        names = self.fileNames.match(term) if field in ("any", "file") else set()
+        versionMatch = VERSION_TERM.match(term) if field in ("any", "file") else None
+
+        def byName(entry):
+            return entry[0] in projects or entry[1] in names
+
+        if since is not None or before is not None:
+            return self.datedTermCondition(projects, names, byName, since, before)
+
+        if versionMatch is None or int(versionMatch[2]) < 1:
+            def state(project, info):
+                if project in projects:
+                    return EVERY_FILE
+                return NO_FILE if names.isdisjoint(info["names"]) else SOME_FILE
+
+            def candidateProjects():
+                if len(names) > 64 or len(projects) == len(self.projectInfo):
+                    return None # short terms match most names, checking each project is cheaper
+                found = set(projects)
+                for name in names:
+                    found.update(self.nameProjects.get(name, ()))
+                return found
+
+            # candidates are only asked for when the project's name doesn't match
+            return searchCondition(byName, state, lambda project, info: names, candidateProjects)
+
+        version = int(versionMatch[2])
+        rest = versionMatch[1]
+        restProjects = self.projectNames.match(rest) if rest and field == "any" else set()
+        restNames = self.fileNames.match(rest) if rest else set()
+
+        def withVersion(info):
+            # the project's files that went up to version
+            return info["versionNames"][bisect.bisect_left(info["versions"], version):]
+
+        def hasVersion(entry):
+            return entry[4] >= version and (not rest or entry[0] in restProjects or entry[1] in restNames)
+
+        def state(project, info):
+            if project in projects:
+                return EVERY_FILE
+            if not names.isdisjoint(info["names"]):
+                return SOME_FILE
+            if info["latest"] < version:
+                return NO_FILE
+            if not rest or project in restProjects:
+                return SOME_FILE # the file holding the highest version
+            return NO_FILE if restNames.isdisjoint(withVersion(info)) else SOME_FILE
+
+        def candidates(project, info):
+            found = names.intersection(info["names"])
+            if not rest or project in restProjects:
+                return found.union(withVersion(info))
+            return found.union(restNames.intersection(withVersion(info)))
+
+        return searchCondition(lambda entry: byName(entry) or hasVersion(entry), state, candidates,
+                               version=version, byName=byName)
+
+    def datedTermCondition(self, projects, names, byName, since, before):
+        low, high = timeBounds(since, before)
+        # projects with a file of a matching name in the range
+        namedProjects = set()
+        for name in names:
+            times, found = self.nameTimes.get(name, ((), ()))
+            namedProjects.update(inRange(times, found, low, high))
+
+        def state(project, info):
+            if project in projects:
+                if not anyInRange(info["times"], low, high):
+                    return NO_FILE
+                return EVERY_FILE if allInRange(info, low, high) else SOME_FILE
+            return SOME_FILE if project in namedProjects else NO_FILE
+
+        def candidates(project, info):
+            found = inRange(info["times"], info["timeNames"], low, high)
+            return found if project in projects else names.intersection(found)
+
+        def candidateProjects():
+            return namedProjects | (projects & self.projectsInRange(since, before))
+
+        def accepts(entry):
+            return byName(entry) and entry[3] is not None and low <= entry[3] < high
+
+        return searchCondition(accepts, state, candidates, candidateProjects)
+
+    def filterCondition(self, author, since, before):
+        """
+        The author and modified time filters as one condition, both have to hold on the
+        same file and the per author times of each project answer that with a bisect.
+        """
+        authors = None if author is None else {name for name in self.authorProjects if author in name}
+        dated = since is not None or before is not None
+        low, high = timeBounds(since, before)
+
+        def state(project, info):
+            if authors is None:
+                if not anyInRange(info["times"], low, high):
+                    return NO_FILE
+                return EVERY_FILE if allInRange(info, low, high) else SOME_FILE
+            byAuthor = info["byAuthor"]
+            if authors.isdisjoint(byAuthor):
+                return NO_FILE
+            if dated:
+                for name in authors.intersection(byAuthor):
+                    if anyInRange(byAuthor[name][0], low, high):
+                        break
+                else:
+                    return NO_FILE
+            if (not dated or allInRange(info, low, high)) and byAuthor.keys() <= authors:
+                return EVERY_FILE
+            return SOME_FILE
+
+        def candidates(project, info):
+            if authors is None:
+                return inRange(info["times"], info["timeNames"], low, high)
+            byAuthor = info["byAuthor"]
+            found = []
+            for name in authors.intersection(byAuthor):
+                times, names = byAuthor[name]
+                found += inRange(times, names, low, high) if dated else names
+            return found
+
+        def candidateProjects():
+            found = None
+            if authors is not None:
+                found = set()
+                for name in authors:
+                    found.update(self.authorProjects[name])
+            if dated:
+                inDates = self.projectsInRange(since, before)
+                found = inDates if found is None else found & inDates
+            return found
+
+        def accepts(entry):
+            if authors is not None and entry[2] not in authors:
+                return False
+            return not dated or (entry[3] is not None and low <= entry[3] < high)
+
+        return searchCondition(accepts, state, candidates, candidateProjects)
+
+    def matchProjects(self, toCheck):
+        """
+        The projects that have a file passing all of their remaining conditions, the
+        candidate names of the conditions are intersected.
+
+        Args:
+            toCheck (list): [(projectName, [searchCondition, ...]), ...]
+        """
+        found = set()
+        for project, conditions in toCheck:
+            info = self.projectInfo[project]
+            fileNames = info["names"]
+            for condition in conditions:
+                candidates = condition.candidates(project, info)
+                # set.intersection walks its argument, keep that the short side
+                if isinstance(candidates, set) and len(candidates) > len(fileNames):
+                    fileNames = candidates.intersection(fileNames)
+                else:
+                    fileNames = fileNames.intersection(candidates)
+                if not fileNames:
+                    break
+            else:
+                found.add(project)
+        return found
+
+    def search(self, text="", project="", file="", author=None, since=None, before=None):
+        """
+        Returns a searchResult for the rows matching every term and filter, or None when
+        there is nothing to filter on (show everything).
+
+        Args:
+            text (str): Free text, may contain author:, since: and before: filters
+            project (str): Prefix/fuzzy match against project names only
+            file (str): Prefix/fuzzy match against file names (and versions) only
+            author (str): Only files by this author (substring)
+            since (float): Only files modified at or after this epoch time
+            before (float): Only files modified before this epoch time
+        """
+        terms, textAuthor, textSince, textBefore = parseQuery(text or "")
+        author = (author or textAuthor or "").lower() or None
+        since = since if since is not None else textSince
+        before = before if before is not None else textBefore
+
+        terms = [("any", term) for term in terms]
+        terms += [("project", term) for term in project.lower().split()]
+        terms += [("file", term) for term in file.lower().split()]
+        filtered = author is not None or since is not None or before is not None
+        # without an author the time range goes into the first plain term, it has to hold
+        # on the same file and the name time buckets find those projects directly
+        plain = [index for index, (_, term) in enumerate(terms) if not VERSION_TERM.match(term)]
+        datedTerm = plain[0] if author is None and plain and filtered else None
+
+        # the filter first, its few candidate names per project narrow the terms' large sets
+        conditions = []
+        if filtered and datedTerm is None:
+            conditions.append(self.filterCondition(author, since, before))
+        for index, (field, term) in enumerate(terms):
+            if index == datedTerm:
+                conditions.append(self.termCondition(field, term, since, before))
+            else:
+                conditions.append(self.termCondition(field, term))
+        if not conditions:
+            return None
+
+        # only projects every condition leaves open are looked at
+        candidates = None
+        for condition in conditions:
+            projects = condition.projects()
+            if projects is not None:
+                candidates = projects if candidates is None else candidates & projects
+        if candidates is None:
+            candidates = self.projectInfo
+
+        result = searchResult(self, conditions)
+        toCheck = []
+        for projectName in candidates:
+            info = self.projectInfo[projectName]
+            remaining = []
+            for condition in conditions:
+                state = condition.state(projectName, info)
+                if state == EVERY_FILE:
+                    continue
+                if state == NO_FILE:
+                    break
+                remaining.append(condition)
+            else:
+                if not remaining:
+                    result.projects.add(projectName)
+                    if not filtered:
+                        # matched by name, all of its files show, even ones without entries
+                        result.wholeProjects.add(projectName)
+                elif len(remaining) == 1:
+                    result.projects.add(projectName)
+                else:
+                    toCheck.append((projectName, remaining)) # they have to hold on the same file
+
+        if toCheck:
+            result.projects |= self.matchProjects(toCheck)
+        return result
@@ -3,18 +3,22 @@ try:
     from PySide2 import QtWidgets, QtCore, QtGui
 except Exception:
     from PySide6 import QtWidgets, QtCore, QtGui
-from StyleLoader import style
+from StyleLoader import applyStyle, qtIcon, themes, currentTheme, setTheme
 
 
 class settingsPannel(QtWidgets.QDialog):
     authorChanged = QtCore.Signal(str)
     filePathChanged = QtCore.Signal(str)
+    rootsChanged = QtCore.Signal() # the project folder or the other roots were changed
 
-    def __init__(self):
+    def __init__(self, store=None):
         super().__init__(hou.qt.mainWindow())
+        self.store = store # shared settingsStore, values are read from and written through it
+        self.savedTheme = currentTheme()
         self.configure_dialog()
         self.widgets()
         self.layout()
+        self.loadCurrentSettings()
 
     def configure_dialog(self):
         self.setWindowTitle("Quick Project Settings")
@@ -22,39 +26,77 @@ class settingsPannel(QtWidgets.QDialog):
 
 
     def widgets(self):
-        #Stylesheets
-        textStyle = style("textLineStyle.qss")
-        buttonStyle = style("buttonStyle.qss")
-        folderButtonStyle = style("folderButtonStyle.qss")
-
         # Author Widget
         self.author = QtWidgets.QLineEdit()
-        self.author.setStyleSheet(textStyle)
+        applyStyle(self.author, "textLineStyle.qss")
         self.author.setPlaceholderText("Author")
 
         # Project Folder Widget
         self.projectFolderlayout = QtWidgets.QHBoxLayout()
 
         folderButton = QtWidgets.QPushButton()
-        icon = hou.ui.createQtIcon("BUTTONS_chooser_file")
+        icon = qtIcon("BUTTONS_chooser_file")
         folderButton.setIcon(icon)
-        folderButton.setStyleSheet(folderButtonStyle)
+        applyStyle(folderButton, "folderButtonStyle.qss")
         folderButton.clicked.connect(self.chooseProjectFolder)
 
         self.projectFolder = QtWidgets.QLineEdit()
-        self.projectFolder.setStyleSheet(textStyle)
+        applyStyle(self.projectFolder, "textLineStyle.qss")
         self.projectFolder.setPlaceholderText("Project Folder")
 
         self.projectFolderlayout.addWidget(self.projectFolder)
         self.projectFolderlayout.addWidget(folderButton)
 
+        # Other project roots, one "Name = path" per line, listed first scans first and
+        # wins when two roots hold a project of the same name
+        self.roots = QtWidgets.QPlainTextEdit()
+        self.roots.setPlaceholderText("Other Roots (optional)\nArchive = //nas/archive")
+        self.roots.setToolTip("One root per line as Name = path, higher lines have priority")
+        self.roots.setFixedHeight(70)
+
+        # Mirror Folder Widget, every saved version is also copied here in the background
+        self.mirrorFolderlayout = QtWidgets.QHBoxLayout()
+
+        mirrorButton = QtWidgets.QPushButton()
+        mirrorButton.setIcon(icon)
+        applyStyle(mirrorButton, "folderButtonStyle.qss")
+        mirrorButton.clicked.connect(self.chooseMirrorFolder)
+
+        self.mirrorFolder = QtWidgets.QLineEdit()
+        applyStyle(self.mirrorFolder, "textLineStyle.qss")
+        self.mirrorFolder.setPlaceholderText("Mirror Folder (optional)")
+
+        self.mirrorFolderlayout.addWidget(self.mirrorFolder)
+        self.mirrorFolderlayout.addWidget(mirrorButton)
+
+        # Local hip cache, versions on slow storage are opened from a local copy
+        self.hipCacheFolderlayout = QtWidgets.QHBoxLayout()
+
+        hipCacheButton = QtWidgets.QPushButton()
+        hipCacheButton.setIcon(icon)
+        applyStyle(hipCacheButton, "folderButtonStyle.qss")
+        hipCacheButton.clicked.connect(self.chooseHipCacheFolder)
+
+        self.hipCacheFolder = QtWidgets.QLineEdit()
+        applyStyle(self.hipCacheFolder, "textLineStyle.qss")
+        self.hipCacheFolder.setPlaceholderText("Local Hip Cache (optional)")
+
+        self.hipCacheFolderlayout.addWidget(self.hipCacheFolder)
+        self.hipCacheFolderlayout.addWidget(hipCacheButton)
+
+        # Theme, switching restyles every open ALTools widget straight away
+        self.theme = QtWidgets.QComboBox()
+        self.theme.addItems(themes())
+        self.theme.setCurrentText(currentTheme())
+        self.theme.currentTextChanged.connect(setTheme)
+
         # buttons 
         self.saveButton = QtWidgets.QPushButton("Save")
-        self.saveButton.setStyleSheet(buttonStyle)
+        applyStyle(self.saveButton, "buttonStyle.qss")
         self.saveButton.clicked.connect(self.saveClicked)
 
         self.cancelButton = QtWidgets.QPushButton("Cancel")
-        self.cancelButton.setStyleSheet(buttonStyle)
+        applyStyle(self.cancelButton, "buttonStyle.qss")
         self.cancelButton.clicked.connect(self.cancelClicked)
 
     def layout(self):
@@ -65,6 +107,10 @@ class settingsPannel(QtWidgets.QDialog):
 
         textEditLayout.addWidget(self.author)
         textEditLayout.addLayout(self.projectFolderlayout)
+        textEditLayout.addWidget(self.roots)
+        textEditLayout.addLayout(self.mirrorFolderlayout)
+        textEditLayout.addLayout(self.hipCacheFolderlayout)
+        textEditLayout.addWidget(self.theme)
 
         buttonLayout.addWidget(self.saveButton)
         buttonLayout.addWidget(self.cancelButton)
@@ -74,14 +120,61 @@ class settingsPannel(QtWidgets.QDialog):
         self.setLayout(self.mainLayout)
 
 
+    def loadCurrentSettings(self):
+        if self.store is None or not self.store.exists():
+            return
+        self.author.setText(self.store.get("author", ""))
+        self.projectFolder.setText(self.store.get("homeDir", ""))
+        roots = sorted(self.store.get("roots", []), key=lambda root: root.get("priority", 0))
+        self.roots.setPlainText("\n".join(f"{root.get('name', '')} = {root.get('path', '')}" for root in roots))
+        self.mirrorFolder.setText(self.store.get("mirrorDir", ""))
+        self.hipCacheFolder.setText(self.store.get("hipCacheDir", ""))
+        self.savedTheme = self.store.get("Style", "Default")
+        self.theme.setCurrentText(self.savedTheme)
+
+    def parseRoots(self):
+        """
+        [{"name", "path", "priority"}, ...] from the roots box, a line without a name is
+        named after its folder.
+        """
+        roots = []
+        for line in self.roots.toPlainText().splitlines():
+            name, separator, path = line.partition("=")
+            if not separator:
+                name, path = "", name
+            name, path = name.strip(), path.strip()
+            if path:
+                roots.append({"name": name or path.replace("\\", "/").rstrip("/").split("/")[-1],
+                              "path": path, "priority": len(roots) + 1})
+        return roots
+
     def saveClicked(self):
+        changed = False
+        if self.store is not None:
+            # blank fields keep their old value, same as updateJsonSettings
+            values = {"author": self.author.text(), "homeDir": self.projectFolder.text()}
+            values = {key: value for key, value in values.items() if value != ""}
+            values["roots"] = self.parseRoots()
+            values["mirrorDir"] = self.mirrorFolder.text() # blank turns mirroring off
+            values["hipCacheDir"] = self.hipCacheFolder.text() # blank turns the cache off
+            values["Style"] = self.theme.currentText()
+            changed = (values.get("homeDir", self.store.get("homeDir")) != self.store.get("homeDir")
+                       or values["roots"] != self.store.get("roots", []))
+            self.store.update(values)
+
         self.authorChanged.emit(self.author.text())
         self.filePathChanged.emit(self.projectFolder.text())
+        if changed:
+            self.rootsChanged.emit()
         self.accept()
 
     def cancelClicked(self):
         self.close()
 
+    def reject(self):
+        setTheme(self.savedTheme) # cancel / esc / closing the window undoes the live preview
+        super().reject()
+
     def chooseProjectFolder(self):
         folder_path = hou.ui.selectFile(
             title="Select Project Folder",
@@ -91,3 +184,23 @@ class settingsPannel(QtWidgets.QDialog):
         
         if folder_path:
             self.projectFolder.setText(folder_path)
+
+    def chooseMirrorFolder(self):
+        folder_path = hou.ui.selectFile(
+            title="Select Mirror Folder",
+            file_type=hou.fileType.Directory,
+            chooser_mode=hou.fileChooserMode.Read
+        )
+
+        if folder_path:
+            self.mirrorFolder.setText(folder_path)
+
+    def chooseHipCacheFolder(self):
+        folder_path = hou.ui.selectFile(
+            title="Select Local Hip Cache Folder",
+            file_type=hou.fileType.Directory,
+            chooser_mode=hou.fileChooserMode.Read
+        )
+
+        if folder_path:
+            self.hipCacheFolder.setText(folder_path)
@@ -0,0 +1,132 @@
+import copy
+import os
+import threading
+from pathlib import Path
+
+from .jsonUtils import readJson, atomicWriteJson
+
+
+DEFAULT_SETTINGS = {
+    "settings": {
+        "author": "",
+        "homeDir": "",
+        "roots": [], # more project folders [{"name", "path", "priority"}], homeDir is the "Home" root
+        "Style": "Default",
+        "indexBackend": "json", # "json" or "sqlite" (ALTools/ProjectIndex.db)
+        "watchMode": "auto", # "auto", "poll" or "off"
+        "storageMode": "json", # "json" or "journal" (append-only saves for shared folders)
+        "mirrorDir": "", # secondary root every saved version is copied to, blank to disable
+        "mirrorWorkers": 2,
+        "versionPageSize": 10, # versions listed under a file before "load older…"
+        "thumbnails": False, # capture a viewport thumbnail with every save
+        "thumbnailCacheMB": 200,
+        "hipCacheDir": "", # local folder hips from slow storage are read through, blank to disable
+        "hipCacheMB": 4096,
+        "retention": {} # eg {"keepLast": 10, "dailyAfterDays": 7, "keepTagged": true}, projects can override it
+    }
+}
+
+
+class settingsStore:
+    """
+    In memory copy of Projects.json shared by everything in quickProject.
+
+    The file is parsed once and then only re-read when its mtime or size changes,
+    so repeated reads during a save cost a single stat instead of an open + parse.
+    Writes go straight through to disk with one atomic replace. Until the file exists
+    (eg on a render node) reads see DEFAULT_SETTINGS and nothing is written.
+    """
+
+    def __init__(self, jsonPath):
+        self.jsonPath = Path(jsonPath)
+        self._data = None
+        self._stamp = None
+        self._lock = threading.RLock()
+
+    def _statStamp(self):
+        try:
+            stat = os.stat(self.jsonPath)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def exists(self):
+        return self._statStamp() is not None
+
+    def ensureExists(self, structure=DEFAULT_SETTINGS):
+        """
+        Creates the settings file with the default structure if it is missing.
+        Returns True if a new file was written.
+        """
+        with self._lock:
+            if self.exists():
+                return False
+            self.write(copy.deepcopy(structure))
+            return True
+
+    def data(self):
+        """
+        Returns the whole settings document, reloading it only if the file changed on disk.
+        Treat the result as read only, use set() / update() to change values.
+        """
+        with self._lock:
+            stamp = self._statStamp()
+            if self._data is None or stamp != self._stamp:
+                self._data = readJson(self.jsonPath) if stamp is not None else copy.deepcopy(DEFAULT_SETTINGS)
+                self._stamp = stamp
+            return self._data
+
+    def get(self, setting, default=None):
+        """
+        Returns a setting, falling back to default and then to DEFAULT_SETTINGS for
+        settings older files don't have yet.
+        """
+        settings = self.data().get("settings", {})
+        setting = str(setting)
+        if setting in settings:
+            return settings[setting]
+        return default if default is not None else copy.deepcopy(DEFAULT_SETTINGS["settings"].get(setting))
+
+    def __getitem__(self, setting):
+        settings = self.data().get("settings", {})
+        setting = str(setting)
+        if setting not in settings and setting in DEFAULT_SETTINGS["settings"]:
+            return copy.deepcopy(DEFAULT_SETTINGS["settings"][setting])
+        return settings[setting]
+
+    def set(self, setting, value):
+        self.update({setting: value})
+
+    def update(self, values):
+        """
+        Writes several settings at once with a single atomic replace of Projects.json.
+        """
+        with self._lock:
+            data = copy.deepcopy(self.data())
+            for setting, value in values.items():
+                data.setdefault("settings", {})[str(setting)] = value
+            self.write(data)
+
+    def write(self, data):
+        with self._lock:
+            atomicWriteJson(self.jsonPath, data)
+            self._data = data
+            self._stamp = self._statStamp()
+
+
+_stores = {}
+_storesLock = threading.Lock()
+
+
+def getStore(jsonPath):
+    """
+    Returns the shared settingsStore for jsonPath so every dialog and logic object
+    reads from the same cache.
+    """
+    key = os.path.normcase(os.path.abspath(jsonPath))
+    with _storesLock:
+        store = _stores.get(key)
+        if store is None:
+            store = settingsStore(jsonPath)
+            _stores[key] = store
+        return store
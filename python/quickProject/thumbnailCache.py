@@ -0,0 +1,192 @@
+import os
+import queue
+import threading
+from collections import OrderedDict
+
+
+class thumbnailCache:
+    """
+    Size capped LRU folder of version thumbnails, one small JPEG per saved version:
+
+        <cacheDir>/<project>/<project>_<file>_v004.jpg
+
+    put() hands a captured image to a background thread which scales, encodes and writes
+    it and then drops the least recently used thumbnails until the folder is back under
+    maxBytes. get() only looks at the in memory index, so the tree can ask for every row
+    it paints. Recency survives restarts through the files' mtimes.
+    """
+
+    def __init__(self, cacheDir, maxBytes=200 * 1024 ** 2, size=256, quality=85):
+        self.cacheDir = os.fspath(cacheDir)
+        self.maxBytes = int(maxBytes)
+        self.size = int(size)
+        self.quality = quality
+        self._entries = None # key -> (path, bytes), least recently used first
+        self._total = 0
+        self._lock = threading.Lock()
+        self._jobs = queue.Queue()
+        self._thread = None
+
+    def key(self, project, file, version):
+        if isinstance(version, int):
+            version = f"v{version:03}"
+        return f"{project}/{project}_{file}_{version}"
+
+    def path(self, key):
+        return os.path.join(self.cacheDir, *f"{key}.jpg".split("/"))
+
+    def _index(self):
+        """
+        Lists the cache folder the first time it is needed. Call with _lock held.
+        """
+        if self._entries is not None:
+            return self._entries
+        found = []
+        try:
+            projects = list(os.scandir(self.cacheDir))
+        except FileNotFoundError:
+            projects = []
+        for project in projects:
+            if not project.is_dir():
+                continue
+            with os.scandir(project.path) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".jpg"):
+                        stat = entry.stat()
+                        found.append((stat.st_mtime, f"{project.name}/{entry.name[:-len('.jpg')]}", stat.st_size))
+        self._entries = OrderedDict()
+        for mtime, key, size in sorted(found):
+            self._entries[key] = (self.path(key), size)
+            self._total += size
+        return self._entries
+
+    def get(self, key, touch=True):
+        """
+        Returns the thumbnail path for key, or None if there isn't one.
+        """
+        with self._lock:
+            entries = self._index()
+            entry = entries.get(key)
+            if entry is None:
+                return None
+            if touch:
+                entries.move_to_end(key)
+        if touch:
+            try:
+                os.utime(entry[0]) # keeps the LRU order for the next session
+            except OSError:
+                with self._lock:
+                    self._drop(key)
+                return None
+        return entry[0]
+
+    def put(self, key, sourcePath, deleteSource=True):
+        """
+        Queues sourcePath (any image Qt reads) to be scaled and stored as key's thumbnail.
+        Returns straight away, the work happens on the cache's thread.
+        """
+        self._jobs.put((key, os.fspath(sourcePath), deleteSource))
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._work, name="thumbnails", daemon=True)
+                self._thread.start()
+
+    def wait(self):
+        self._jobs.join()
+
+    def _work(self):
+        while True:
+            key, sourcePath, deleteSource = self._jobs.get()
+            try:
+                self._store(key, sourcePath)
+            except Exception as e:
+                print(f"Failed to store thumbnail {key}: {e}")
+            finally:
+                if deleteSource:
+                    try:
+                        os.remove(sourcePath)
+                    except OSError:
+                        pass
+                self._jobs.task_done()
+
+    def _store(self, key, sourcePath):
+        target = self.path(key)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        temp = f"{target}.{os.getpid()}.tmp"
+        if not self.encode(sourcePath, temp):
+            return
+        os.replace(temp, target)
+        size = os.path.getsize(target)
+
+        with self._lock:
+            entries = self._index()
+            self._drop(key, remove=False)
+            entries[key] = (target, size)
+            self._total += size
+            self.trim()
+
+    def encode(self, sourcePath, targetPath):
+        """
+        Scales the image to fit size x size and writes it as a JPEG. QImage is safe to use
+        off the GUI thread, without Qt the capture is stored as it is.
+        """
+        try:
+            try:
+                from PySide2 import QtGui, QtCore
+            except Exception:
+                from PySide6 import QtGui, QtCore
+        except Exception:
+            import shutil
+            shutil.copyfile(sourcePath, targetPath)
+            return True
+
+        image = QtGui.QImage(sourcePath)
+        if image.isNull():
+            print(f"Couldn't read thumbnail capture {sourcePath}")
+            return False
+        if image.width() > self.size or image.height() > self.size:
+            image = image.scaled(self.size, self.size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+        return image.save(targetPath, "JPG", self.quality)
+
+    def trim(self):
+        """
+        Removes least recently used thumbnails until the cache fits maxBytes. Call with _lock held.
+        """
+        entries = self._index()
+        while self._total > self.maxBytes and len(entries) > 1:
+            key = next(iter(entries))
+            self._drop(key)
+
+    def _drop(self, key, remove=True):
+        entry = self._entries.pop(key, None) if self._entries is not None else None
+        if entry is None:
+            return
+        self._total -= entry[1]
+        if remove:
+            try:
+                os.remove(entry[0])
+            except OSError:
+                pass
+
+    def totalBytes(self):
+        with self._lock:
+            self._index()
+            return self._total
+
+
+_caches = {}
+_cachesLock = threading.Lock()
+
+
+def getThumbnails(cacheDir, maxBytes=200 * 1024 ** 2):
+    """
+    Returns the shared thumbnailCache for cacheDir, so saves and the browser see the same index.
+    """
+    key = os.path.normcase(os.path.abspath(cacheDir))
+    with _cachesLock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = thumbnailCache(cacheDir, maxBytes)
+            _caches[key] = cache
+        cache.maxBytes = int(maxBytes)
+        return cache
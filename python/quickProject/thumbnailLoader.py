@@ -0,0 +1,24 @@
+try:
+    from PySide2 import QtCore, QtGui
+except Exception:
+    from PySide6 import QtCore, QtGui
+
+
+class thumbnailSignals(QtCore.QObject):
+    loaded = QtCore.Signal(str, object) # key, QImage (null if it couldn't be read)
+
+
+class thumbnailLoader(QtCore.QRunnable):
+    """
+    Reads a cached thumbnail on a QThreadPool thread. QImage is safe off the GUI thread,
+    the panel turns it into a pixmap when loaded arrives.
+    """
+
+    def __init__(self, key, path):
+        super().__init__()
+        self.key = key
+        self.path = path
+        self.signals = thumbnailSignals()
+
+    def run(self):
+        self.signals.loaded.emit(self.key, QtGui.QImage(self.path))
@@ -0,0 +1,90 @@
+import os
+import re
+
+
+# <project>_<file>_v<NNN>.hip, the project prefix is split off afterwards so one
+# compiled pattern serves every project folder
+HIP_PATTERN = re.compile(r"^(?P<stem>.+)_v(?P<version>\d+)\.hip$")
+
+
+def parseHipName(project, name):
+    """
+    Splits a hip file name into (fileName, version) or returns None if it isn't a
+    quick project version of this project.
+
+        parseHipName("shot", "shot_fx_v004.hip") -> ("fx", 4)
+    """
+    match = HIP_PATTERN.match(name)
+    if match is None:
+        return None
+    prefix = f"{project}_"
+    stem = match["stem"]
+    if not stem.startswith(prefix) or len(stem) == len(prefix):
+        return None
+    return stem[len(prefix):], int(match["version"])
+
+
+def scanProjectFolder(projectFolder, project=None):
+    """
+    Lists a project folder once and returns every hip version found in it.
+
+    Returns:
+        dict: {fileName: {version: {"version": int, "mtime": float, "size": int, "name": str}}}
+    """
+    projectFolder = os.fspath(projectFolder)
+    if project is None:
+        project = os.path.basename(os.path.normpath(projectFolder))
+
+    versionMap = {}
+    try:
+        entries = os.scandir(projectFolder)
+    except FileNotFoundError:
+        return versionMap
+
+    with entries:
+        for entry in entries:
+            parsed = parseHipName(project, entry.name)
+            if parsed is None:
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat() # free on Windows, one lstat elsewhere
+            except OSError:
+                continue
+            fileName, version = parsed
+            versionMap.setdefault(fileName, {})[version] = {
+                "version": version,
+                "mtime": stat.st_mtime,
+                "size": stat.st_size,
+                "name": entry.name,
+            }
+    return versionMap
+
+
+def mergeFiles(filesDict, versionMap):
+    """
+    Adds hip files found on disk that the project JSON doesn't know about, so they can
+    be browsed too. They are marked "untracked" and get the highest version on disk.
+    """
+    merged = dict(filesDict)
+    for fileName, versions in versionMap.items():
+        if fileName not in merged and versions:
+            merged[fileName] = {"version": f"v{max(versions):03}", "untracked": True}
+    return merged
+
+
+def addSizes(filesDict, versionMap):
+    """
+    Returns a copy of filesDict where every file also carries "size" (bytes used by all of
+    its versions on disk), "versions" (how many there are) and "latest" / "latestMtime"
+    (the newest version on disk), taken from a versionMap so the tree can show disk usage
+    and the latest version on the file row without listing the folder again.
+    """
+    sized = {}
+    for fileName, fileData in filesDict.items():
+        versions = versionMap.get(fileName, {})
+        latest = max(versions) if versions else None
+        sized[fileName] = dict(fileData, size=sum(v["size"] for v in versions.values()), versions=len(versions),
+                               latest=latest, latestMtime=versions[latest]["mtime"] if versions else None)
+    return sized
@@ -1,3 +1,10 @@
-from . import sync_Fields
+import importlib
 
-__all__ = ["sync_Fields"]
\ No newline at end of file
+
+__all__ = ["sync_Fields"]
+
+
+def __getattr__(name):
+    if name == "sync_Fields":
+        return importlib.import_module(f"{__name__}.sync_Fields")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
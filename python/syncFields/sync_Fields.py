@@ -1,5 +1,7 @@
 import hou
+from ALToolsProfiler import traced
 
+@traced("syncFields.sync", entry=True)
 def sync(kwargs):
     """
     Creates relative references to all sibling fields    